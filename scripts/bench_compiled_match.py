@@ -0,0 +1,56 @@
+import sys
+import os
+import time
+
+# Fix Unicode encoding for Windows console
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from syntax import Implies
+from storage import SentenceStorage
+from matcher import Matcher
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'mathai.db')
+
+def bench(antecedent_count: int = 300):
+    """The forward step's antecedent x fact double loop, interpreted and compiled."""
+    storage = SentenceStorage.load(DB_PATH)  # Never saved back
+    facts = list(storage.proven)
+    antecedents = [imp.left for imp in storage.facts_by_head(Implies)][:antecedent_count]
+    print(f"{len(antecedents)} antecedents x {len(facts)} facts = {len(antecedents) * len(facts)} pairs")
+
+    matcher = Matcher()
+    start = time.perf_counter()
+    interpreted = []
+    for a in antecedents:
+        for f in facts:
+            bindings = {}
+            interpreted.append(bindings if matcher._match_into(a, f, bindings) else None)
+    interpreter_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    closures = [matcher.compile(a) for a in antecedents]
+    compile_time = time.perf_counter() - start
+
+    # The closures Matcher.match would cache, called directly in the same loop
+    start = time.perf_counter()
+    compiled = []
+    for closure in closures:
+        for f in facts:
+            bindings = {}
+            compiled.append(bindings if closure(f, bindings) else None)
+    compiled_time = time.perf_counter() - start
+
+    assert compiled == interpreted
+    matches = sum(b is not None for b in compiled)
+    print(f"  matches      {matches}")
+    print(f"  interpreted  {interpreter_time:8.3f}s")
+    print(f"  compiled     {compiled_time:8.3f}s  (compiling {compile_time:.4f}s)")
+    print(f"  speedup      {interpreter_time / compiled_time:8.1f}x")
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
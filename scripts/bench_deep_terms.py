@@ -0,0 +1,83 @@
+import sys
+import os
+import time
+import tempfile
+
+# Fix Unicode encoding for Windows console
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+from syntax import NumericVariable, Zero, Add, Equals, Implies
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from matcher import Matcher
+from explain import topological_sort
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<28} {time.perf_counter() - start:8.3f}s")
+    return result
+
+def bench(depth: int = 100000):
+    """
+    Runs terms of the given depth through every structural walk. The walks
+    use a sum (((x+0)+0)...)+0 nested depth deep: numerals are no test of
+    depth, since a run of successors is a single Successor node.
+    """
+    print(f"Depth {depth} (recursion limit {sys.getrecursionlimit()})")
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    
+    sum_text = "x" + "+0" * depth + "=0"
+    chain_text = "->".join(f"P{i % 26}" for i in range(depth))
+    sum_eq = timed("parse nested sum", lambda: parser.parse(sum_text))
+    assert sum_eq.depth > depth
+    chain = timed("parse implication chain", lambda: parser.parse(chain_text))
+    
+    def build_uninterned():
+        n = NumericVariable("x")
+        for _ in range(depth):
+            n = Add(n, Zero())
+        return Equals(n, Zero())
+    plain = timed("build with constructors", build_uninterned)
+    timed("intern", lambda: storage.intern(plain))
+    timed("structural equality", lambda: plain == sum_eq)
+    
+    ground = timed("substitute x/0", lambda: sum_eq.substitute("x", Zero.make()))
+    bindings = timed("match", lambda: Matcher().match(sum_eq, ground))
+    assert bindings is not None and str(bindings["x"]) == "0"
+    timed("str", lambda: str(chain))
+    
+    # The numeral S^depth(x) is one node, whatever depth is
+    numeral_eq = timed("parse numeral", lambda: parser.parse("S(" * depth + "x" + ")" * depth + "=0"))
+    assert numeral_eq.left.offset == depth
+    bindings = timed("match numeral", lambda: Matcher().match(numeral_eq, numeral_eq.substitute("x", Zero.make())))
+    assert bindings is not None and str(bindings["x"]) == "0"
+    
+    # A proof chain as long as the terms are deep: each step depends on the last
+    def mark_chain():
+        previous = None
+        node = chain
+        while isinstance(node, Implies):
+            deps = [previous] if previous is not None else []
+            storage.mark_proven(node, Provenance("Bench Step", dependencies=deps))
+            previous = node
+            node = node.right
+        return previous
+    last = timed("mark proof chain", mark_chain)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "deep.db")
+        timed("save", lambda: storage.save(path))
+        loaded = timed("load", lambda: SentenceStorage.load(path))
+    steps = timed("explain (topological sort)", lambda: topological_sort(loaded.intern(last), loaded))
+    assert len(steps) == depth - 1
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,72 @@
+import sys
+import os
+import time
+
+# Fix Unicode encoding for Windows console
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import indexing
+from syntax import Zero, Successor, Add, Multiply, Equals, Implies, Not
+from storage import SentenceStorage, Provenance
+from matcher import Matcher
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'mathai.db')
+
+def add_ground_facts(storage: SentenceStorage, count: int):
+    """Ground facts of mixed shapes, like those forward chaining produces."""
+    zero = Zero.make()
+    for i in range(count):
+        a = Successor.make(zero).with_offset(i % 97)
+        b = Successor.make(zero).with_offset(i // 97 % 89)
+        shape = i % 4
+        if shape == 0:
+            fact = Equals.make(Add.make(a, b), Add.make(b, a))
+        elif shape == 1:
+            fact = Equals.make(Multiply.make(a, zero), zero)
+        elif shape == 2:
+            fact = Not.make(Equals.make(zero, Successor.make(a)))
+        else:
+            fact = Implies.make(Equals.make(a, b), Equals.make(b, a))
+        storage.mark_proven(fact, Provenance("Bench Fact"))
+
+def bench(count: int = 2000):
+    """Antecedent x fact pairs of forward step C, before and after the feature filter."""
+    storage = SentenceStorage.load(DB_PATH)  # Never saved back
+    add_ground_facts(storage, count)
+    facts = list(storage.proven)
+    antecedents = [imp.left for imp in storage.facts_by_head(Implies)]
+    print(f"{len(facts)} facts, {len(antecedents)} implication antecedents, "
+          f"NumPy {'in use' if indexing.numpy is not None else 'not installed (bytearray scan)'}")
+
+    start = time.perf_counter()
+    storage.instances_of(antecedents[0])  # Builds the indexes
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    survivors = [storage.instances_of(a) for a in antecedents]
+    filtered = time.perf_counter() - start
+
+    matcher = Matcher()
+    start = time.perf_counter()
+    matches = sum(matcher.match(a, f) is not None for a in antecedents for f in facts)
+    unfiltered = time.perf_counter() - start
+    start = time.perf_counter()
+    kept = sum(matcher.match(a, f) is not None for a, fs in zip(antecedents, survivors) for f in fs)
+    matched = time.perf_counter() - start
+    assert kept == matches
+
+    pairs = len(antecedents) * len(facts)
+    remaining = sum(len(fs) for fs in survivors)
+    print(f"  index build        {built:8.3f}s")
+    print(f"  pairs              {pairs:10d}  match all  {unfiltered:8.3f}s")
+    print(f"  after filter       {remaining:10d}  filter {filtered:8.3f}s + match {matched:8.3f}s")
+    print(f"  actual matches     {matches:10d}")
+    print(f"  reduction          {pairs / max(remaining, 1):10.1f}x")
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
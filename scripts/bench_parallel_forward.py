@@ -0,0 +1,67 @@
+import sys
+import os
+import time
+
+# Fix Unicode encoding for Windows console
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage import SentenceStorage
+from parallel import ParallelForwardChainer
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'mathai.db')
+DELTA_ROUNDS = 20
+DELTA_SIZE = 1  # Facts added per round after the first: small, so the fixed cost of a round shows
+MIN_FIRST_ROUND = 100  # Fewest facts worth joining in full before the delta rounds
+
+def replay(source: SentenceStorage, target: SentenceStorage, start: int, stop: int):
+    for node, provenance in list(source.proven.items())[start:stop]:
+        target.mark_proven(target.intern(node), provenance.map_nodes(target.intern))
+
+def bench(max_workers: int):
+    """
+    A full forward join over most of the knowledge base, then DELTA_ROUNDS
+    semi-naive rounds that each add DELTA_SIZE facts, in 1, 2, 4, ...
+    worker processes. Later rounds should cost in proportion to the delta.
+    """
+    source = SentenceStorage.load(DB_PATH)  # Never saved back
+    total = len(source.proven)
+    base = total - DELTA_ROUNDS * DELTA_SIZE
+    if base < MIN_FIRST_ROUND:
+        print(f"{total} facts: too few for a first round of {MIN_FIRST_ROUND} and {DELTA_ROUNDS} rounds "
+              f"of {DELTA_SIZE}; prove some goals with forward reasoning to grow the database first")
+        return
+    print(f"{total} facts, {os.cpu_count()} CPUs; first round {base} facts, then {DELTA_ROUNDS} x {DELTA_SIZE}")
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        storage = SentenceStorage()
+        replay(source, storage, 0, base)
+        chainer = ParallelForwardChainer(storage, workers)
+        found = set()
+        times = []
+        start = 0
+        try:
+            for stop in range(base, total + 1, DELTA_SIZE):
+                replay(source, storage, start, stop)
+                began = time.perf_counter()
+                found |= {(imp, fact) for imp, fact, _ in chainer.matches(start, stop)}
+                times.append(time.perf_counter() - began)
+                start = stop
+        finally:
+            chainer.close()
+        delta = sum(times[1:]) / len(times[1:])
+        if baseline is None:
+            baseline = (found, times[0], delta)
+        # Worker chunks dedupe consequents separately, so they may keep a few more matches
+        assert {(str(i), str(f)) for i, f in baseline[0]} <= {(str(i), str(f)) for i, f in found} or workers == 1
+        print(f"  {workers} workers  first {times[0]:8.3f}s  speedup {baseline[1] / times[0]:5.2f}x"
+              f"  delta rounds {delta:7.3f}s  speedup {baseline[2] / delta:5.2f}x  {len(found)} matches")
+        workers *= 2
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1)
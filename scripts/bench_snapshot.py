@@ -0,0 +1,65 @@
+import sys
+import os
+import time
+import tempfile
+
+# Fix Unicode encoding for Windows console
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+from syntax import NumericVariable, Zero, Successor, Add, Equals
+from storage import SentenceStorage, SqliteSentenceStorage, Provenance, write_snapshot
+from explain import topological_sort
+
+def build_storage(count: int) -> SentenceStorage:
+    """A chain of facts x+k=k+x, each depending on the one before."""
+    storage = SentenceStorage()
+    x = NumericVariable.make("x")
+    numeral = Zero.make()
+    previous = None
+    for _ in range(count):
+        numeral = Successor.make(numeral)
+        fact = Equals.make(Add.make(x, numeral), Add.make(numeral, x))
+        deps = [previous] if previous is not None else []
+        storage.mark_proven(fact, Provenance("Bench Step", dependencies=deps, metadata={"k": numeral}))
+        previous = fact
+    return storage, previous
+
+def bench(count: int = 50000):
+    """Start-up, and one explain-style lookup, for each on-disk format."""
+    storage, last = build_storage(count)
+    text = str(last)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {name: os.path.join(tmp, name) for name in ("pickle", "sqlite", "snapshot")}
+        storage.save(paths["pickle"])
+        SqliteSentenceStorage(paths["sqlite"]).update(storage)
+        write_snapshot(paths["snapshot"], storage)
+        
+        print(f"{count} facts")
+        for name, path in paths.items():
+            start = time.perf_counter()
+            loaded = SentenceStorage.load(path)
+            opened = time.perf_counter() - start
+            fact = next(f for f in [loaded.intern(last)] if str(f) == text)
+            start = time.perf_counter()
+            provenance = loaded.get_provenance(fact)
+            looked_up = time.perf_counter() - start
+            assert provenance.method == "Bench Step"
+            start = time.perf_counter()
+            steps = len(topological_sort(fact, loaded))
+            explained = time.perf_counter() - start
+            size = os.path.getsize(path) / 1e6
+            print(f"  {name:<9} {size:6.1f} MB  open {opened:8.4f}s  provenance {looked_up:8.4f}s  "
+                  f"explain ({steps} steps) {explained:7.3f}s")
+            if hasattr(loaded, "close"):
+                loaded.close()
+            elif hasattr(loaded, "connection"):
+                loaded.connection.close()
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
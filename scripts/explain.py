@@ -18,23 +18,28 @@ def topological_sort(target: Node, storage: SentenceStorage) -> List[Node]:
     visited: Set[Node] = set()
     sorted_nodes: List[Node] = []
 
-    def visit(node: Node):
+    if not storage.is_proven(target):
+        return []
+
+    # Iterative post-order: provenance dependencies must be emitted first.
+    # Long proof chains would exceed the recursion limit otherwise.
+    stack = [(target, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            sorted_nodes.append(node)
+            continue
         if node in visited:
-            return
+            continue
         visited.add(node)
+        stack.append((node, True))
         
-        # Provenance dependencies must be visited first
         prov = storage.get_provenance(node)
         if prov:
-            for dep in prov.dependencies:
-                visit(dep)
-        
-        sorted_nodes.append(node)
-
-    if not storage.is_proven(target):
-        return []
+            for dep in reversed(prov.dependencies):
+                if dep not in visited:
+                    stack.append((dep, False))
 
-    visit(target)
     return sorted_nodes
 
 def explain(target_str: str):
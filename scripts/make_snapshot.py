@@ -0,0 +1,35 @@
+import sys
+import os
+import shutil
+
+# Fix Unicode encoding for Windows console
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage import SentenceStorage, SnapshotStorage, write_snapshot
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'mathai.db')
+
+def make_snapshot(source: str, target: str):
+    """
+    Writes a memory-mapped snapshot of a knowledge base in any format.
+    Converting in place keeps the original next to it as <source>.bak.
+    """
+    if SnapshotStorage.is_snapshot(source):
+        print(f"{source} is already a snapshot.")
+        return
+    storage = SentenceStorage.load(source)
+    write_snapshot(target + ".tmp", storage)
+    if os.path.abspath(source) == os.path.abspath(target):
+        shutil.copyfile(source, source + ".bak")
+    os.replace(target + ".tmp", target)
+    SentenceStorage.load(target)
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    target = sys.argv[2] if len(sys.argv) > 2 else source
+    make_snapshot(source, target)
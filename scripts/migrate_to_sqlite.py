@@ -0,0 +1,40 @@
+import sys
+import os
+import shutil
+
+# Fix Unicode encoding for Windows console
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage import SentenceStorage, SqliteSentenceStorage
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'mathai.db')
+
+def migrate(source: str, target: str):
+    """
+    Converts a pickled knowledge base into an SQLite one. Migrating in place
+    keeps the pickle next to it as <source>.pickle.
+    """
+    if SqliteSentenceStorage.is_database(source):
+        print(f"{source} is already an SQLite database.")
+        return
+    legacy = SentenceStorage.load(source)
+    building = target + ".tmp"
+    if os.path.exists(building):
+        os.remove(building)
+    store = SqliteSentenceStorage(building)
+    store.update(legacy)
+    store.connection.close()
+    if os.path.abspath(source) == os.path.abspath(target):
+        shutil.copyfile(source, source + ".pickle")
+    os.replace(building, target)
+    SqliteSentenceStorage.load(target)
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    target = sys.argv[2] if len(sys.argv) > 2 else source
+    migrate(source, target)
@@ -11,6 +11,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from storage import SentenceStorage
 from prover import AutoProver
+from portfolio import Portfolio
 
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'mathai.db')
 
@@ -19,6 +20,9 @@ if __name__ == "__main__":
         goal = sys.argv[1]
         steps = 20
         enable_forward = True
+        forward_strategy = "naive"
+        bidirectional = False
+        portfolio = False
         verbose = False
         
         if len(sys.argv) > 2:
@@ -28,19 +32,54 @@ if __name__ == "__main__":
                 pass
         
         if len(sys.argv) > 3:
-            # Third argument controls forward reasoning: "false", "0", "no" disable it
+            # Third argument controls forward reasoning: "false", "0", "no" disable it,
+            # "saturation" uses the given-clause loop instead of the naive join,
+            # "bidirectional" checks derived facts against the open backward goals,
+            # "parallel" spreads the join over one worker process per CPU,
+            # "portfolio" races several prover configurations in separate processes
             enable_forward = sys.argv[3].lower() not in ['false', '0', 'no', 'backward']
+            if sys.argv[3].lower() in ['saturation', 'given']:
+                forward_strategy = "saturation"
+            if sys.argv[3].lower() == 'parallel':
+                forward_strategy = "parallel"
+            bidirectional = sys.argv[3].lower() in ['bidirectional', 'meet']
+            portfolio = sys.argv[3].lower() == 'portfolio'
         
         if len(sys.argv) > 4:
             # Fourth argument controls verbose output
             verbose = sys.argv[4].lower() in ['true', '1', 'yes', 'verbose']
         
         storage = SentenceStorage.load(DB_PATH)
+        if portfolio:
+            racer = Portfolio(storage)
+            if racer.prove(goal, max_rounds=steps):
+                print(racer.output, end="")
+                print(f"Proven by the {racer.winner} strategy; {racer.merged} facts merged")
+            else:
+                print(f"No strategy proved {goal}")
+            storage.save(DB_PATH)
+            sys.exit(0)
         prover = AutoProver(storage)
-        prover.prove(goal, max_rounds=steps, enable_forward=enable_forward, verbose=verbose)
+        try:
+            with storage.transaction():
+                prover.prove(goal, max_rounds=steps, enable_forward=enable_forward, verbose=verbose,
+                             forward_strategy=forward_strategy, bidirectional=bidirectional)
+        finally:
+            # Stops the worker processes and removes the snapshot, also on errors and interrupts
+            if prover.parallel is not None:
+                prover.parallel.close()
+        if prover.saturation is not None:
+            stats = prover.saturation.stats()
+            print(f"Saturation: {stats['given']} given, {stats['generated']} generated, "
+                  f"{stats['retained']} retained, {stats['subsumed']} subsumed, "
+                  f"{stats['duplicates']} duplicates")
+        if verbose:
+            for name, stats in prover.cache_stats().items():
+                print(f"{name} cache: {stats['size']}/{stats['capacity']} entries, "
+                      f"hit rate {stats['hit_rate']:.1%}, {stats['evictions']} evictions")
         
         storage.save(DB_PATH)
     else:
         print("Usage: python scripts/prove.py '<goal>' [steps] [enable_forward] [verbose]")
-        print("  enable_forward: 'true' (default) or 'false' for backward-only mode")
+        print("  enable_forward: 'true' (default), 'false' for backward-only mode, 'saturation', 'bidirectional', 'parallel' or 'portfolio'")
         print("  verbose: 'false' (default) or 'true' to print all guesses and derivations")
@@ -0,0 +1,62 @@
+import heapq
+from typing import Dict, Hashable, List, Optional, Tuple
+
+class Agenda:
+    """
+    Priority queue of open goals for best-first search: pop() returns the
+    goal with the lowest priority, ties going to the one pushed first.
+
+    Removal is lazy. discard() only flags the goal's heap entry, and pop()
+    skips flagged entries, so pruning costs O(1) instead of a re-sort. The
+    heap is rebuilt once flagged entries outnumber live ones. Pushing a goal
+    that is already queued keeps whichever priority is lower.
+    """
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[Hashable, list] = {}  # goal -> [priority, order, goal, depth, live]
+        self._order = 0
+        self._dead = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, goal: Hashable):
+        return goal in self._entries
+
+    def push(self, goal: Hashable, priority: float, depth: int = 0):
+        old = self._entries.get(goal)
+        if old is not None:
+            if old[0] <= priority:
+                return
+            self._kill(old)
+        self._order += 1
+        entry = [priority, self._order, goal, depth, True]
+        self._entries[goal] = entry
+        heapq.heappush(self._heap, entry)
+
+    def pop(self) -> Optional[Tuple[Hashable, int]]:
+        """The best live goal and its depth, removed from the agenda, or None."""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if entry[4]:
+                del self._entries[entry[2]]
+                return entry[2], entry[3]
+            self._dead -= 1
+        return None
+
+    def discard(self, goal: Hashable):
+        entry = self._entries.pop(goal, None)
+        if entry is not None:
+            self._kill(entry)
+
+    def best(self, count: int) -> List[Hashable]:
+        """The count best live goals, in order, without removing them."""
+        return [entry[2] for entry in heapq.nsmallest(count, self._entries.values())]
+
+    def _kill(self, entry: list):
+        entry[4] = False
+        self._dead += 1
+        if self._dead > len(self._entries):
+            self._heap = [e for e in self._heap if e[4]]
+            heapq.heapify(self._heap)
+            self._dead = 0
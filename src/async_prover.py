@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from concurrent.futures import Executor
+from typing import Callable, Generator, List, Optional, Tuple
+from syntax import Node
+from storage import SentenceStorage
+from prover import AutoProver
+
+class AsyncProver:
+    """
+    Proves goals concurrently on an asyncio event loop, all over one shared
+    storage: a fact one proof derives is there for the others, and wakes any
+    of their goals waiting on it. Each proof runs AutoProver.search on an
+    AutoProver of its own, STEPS_PER_SLICE steps at a time, and hands the
+    loop back between slices, so a small goal finishes in a few slices
+    however large the searches it shares the loop with.
+
+    Proofs are cancelled the asyncio way, by cancelling their task or with
+    asyncio.wait_for; the search stops at the end of its slice and drops its
+    watches. With an executor (threads: a search cannot be pickled), slices
+    run off the loop, one at a time as they share the storage, which keeps
+    the loop free for I/O during expensive steps.
+    """
+    STEPS_PER_SLICE = 20  # Steps of AutoProver.search (candidates, given facts, hundreds of matches) per slice
+
+    def __init__(self, storage: SentenceStorage, executor: Optional[Executor] = None,
+                 heuristic: Optional[Callable[[Node], float]] = None):
+        self.storage = storage
+        self.executor = executor
+        self.heuristic = heuristic
+        self._idle: List[AutoProver] = []  # Provers between proofs, their caches kept warm
+        self._lock = threading.Lock()  # One slice at a time touches the storage
+
+    async def prove(self, goal_str: str, max_rounds: int = 20, timeout: Optional[float] = None, **options) -> bool:
+        """
+        Proves goal_str like AutoProver.prove, which takes the same options,
+        without blocking the loop. timeout counts wall-clock seconds,
+        including those spent on other proofs' slices; None for no limit.
+        """
+        prover = self._idle.pop() if self._idle else AutoProver(self.storage, self.heuristic)
+        search = prover.search(goal_str, max_rounds=max_rounds,
+                               timeout=float("inf") if timeout is None else timeout, **options)
+        loop = asyncio.get_running_loop()
+        running = None
+        try:
+            while True:
+                if self.executor is None:
+                    finished, result = self._advance(search)
+                else:
+                    # Shielded: cancelling the proof must not orphan a slice still running in its thread
+                    running = loop.run_in_executor(self.executor, self._advance, search)
+                    finished, result = await asyncio.shield(running)
+                    running = None
+                if finished:
+                    return result
+                await asyncio.sleep(0)
+        finally:
+            if running is not None:
+                # The search cannot be closed while a thread is running it
+                await asyncio.wait([running])
+            # Closing drops watches and subscriptions on the shared storage
+            with self._lock:
+                search.close()
+            self._idle.append(prover)
+
+    def _advance(self, search: Generator[None, None, bool]) -> Tuple[bool, Optional[bool]]:
+        """Runs one slice of search: (True, result) once it has finished, else (False, None)."""
+        with self._lock:
+            try:
+                for _ in range(self.STEPS_PER_SLICE):
+                    next(search)
+            except StopIteration as stop:
+                return True, stop.value
+        return False, None
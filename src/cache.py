@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+# Returned by LRUCache.get on a miss, since None is a valid cached result
+MISSING = object()
+
+class LRUCache:
+    """
+    Size-bounded memo table that evicts the least recently used entry.
+    Keys are usually tuples of interned nodes, which hash in O(1) and
+    compare by identity first. Counts hits, misses and evictions so the
+    bound can be tuned against the hit rate.
+    """
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("LRUCache capacity must be at least 1.")
+        self.capacity = capacity
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """The cached value for key, or MISSING."""
+        value = self._entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,152 @@
+from typing import Dict, List, Optional, Sequence
+from syntax import Node, Implies
+
+class Goal:
+    """
+    An OR node: a formula to prove, by any one of its alternatives.
+    budget is the most backward steps it has been expanded with, and
+    failed_budget the most under which it is known to fail (-1 if none).
+    """
+    __slots__ = ("formula", "depth", "alternatives", "parents", "proven", "budget", "failed_budget")
+
+    def __init__(self, formula: Node, depth: int):
+        self.formula = formula
+        self.depth = depth
+        self.alternatives: List["Alternative"] = []
+        self.parents: List["Alternative"] = []
+        self.proven = False
+        self.budget = -1
+        self.failed_budget = -1
+
+class Alternative:
+    """
+    An AND node: a proven implication P1→(...→(Pn→goal)) whose premises
+    all have to be proven, after which modus ponens proves the goal.
+    """
+    __slots__ = ("goal", "implication", "premises")
+
+    def __init__(self, goal: Goal, implication: Implies, premises: Sequence[Goal]):
+        self.goal = goal
+        self.implication = implication
+        self.premises = tuple(premises)
+
+class GoalGraph:
+    """
+    Tabled AND/OR graph of the subgoals of one backward search. Each formula
+    has a single Goal however many implications need it, so it is solved
+    once and close() propagates the result to every goal waiting on it.
+
+    Failures are memoized with the budget of backward steps they were tried
+    under: a goal that fails with n steps left is not retried with n or
+    fewer, only once iterative deepening offers it more.
+    """
+    def __init__(self, root: Node):
+        self.nodes: Dict[Node, Goal] = {}
+        self.root = self.add(root, 0)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, formula: Node):
+        return formula in self.nodes
+
+    def get(self, formula: Node) -> Optional[Goal]:
+        return self.nodes.get(formula)
+
+    def add(self, formula: Node, depth: int) -> Goal:
+        """The tabled goal for formula, created if new, at its shallowest depth seen."""
+        goal = self.nodes.get(formula)
+        if goal is None:
+            goal = self.nodes[formula] = Goal(formula, depth)
+        elif depth < goal.depth:
+            goal.depth = depth
+        return goal
+
+    def add_alternative(self, goal: Goal, implication: Implies, premises: Sequence[Node]) -> Optional[Alternative]:
+        """Records that goal follows from the premises by implication; None if already known."""
+        for alternative in goal.alternatives:
+            if alternative.implication is implication:
+                return None
+        alternative = Alternative(goal, implication, [self.add(p, goal.depth + 1) for p in premises])
+        goal.alternatives.append(alternative)
+        for premise in set(alternative.premises):
+            premise.parents.append(alternative)
+        return alternative
+
+    def is_failed(self, formula: Node, budget: int) -> bool:
+        goal = self.nodes.get(formula)
+        return goal is not None and goal.failed_budget >= budget
+
+    def needed(self, formula: Node) -> bool:
+        """False once every path from formula up to the root passes through a proven goal."""
+        start = self.nodes[formula]
+        stack = [start]
+        seen = {start}
+        while stack:
+            goal = stack.pop()
+            if goal.proven:
+                continue
+            if goal is self.root:
+                return True
+            for alternative in goal.parents:
+                if alternative.goal not in seen:
+                    seen.add(alternative.goal)
+                    stack.append(alternative.goal)
+        return False
+
+    def close(self, formula: Node) -> List[Alternative]:
+        """
+        Marks formula proven and returns the alternatives this completes, each
+        after those proving its premises, so replaying them in order proves
+        every goal that now follows.
+        """
+        goal = self.nodes.get(formula)
+        if goal is None or goal.proven:
+            return []
+        goal.proven = True
+        closed = []
+        stack = [goal]
+        while stack:
+            for alternative in stack.pop().parents:
+                parent = alternative.goal
+                if not parent.proven and all(p.proven for p in alternative.premises):
+                    parent.proven = True
+                    closed.append(alternative)
+                    stack.append(parent)
+        return closed
+
+    def expanded(self, formula: Node, budget: int):
+        """
+        Records that formula was expanded with budget more backward steps and
+        that no direct step proved it, so it fails with no steps left. With
+        no alternative it fails under budget; otherwise under one step more
+        than the weakest of its alternatives, each of which fails with the
+        most any of its premises fails. Failures propagate to parents.
+        """
+        goal = self.nodes[formula]
+        goal.budget = max(goal.budget, budget)
+        self._fail(goal, self._failed_budget(goal))
+
+    def _failed_budget(self, goal: Goal) -> int:
+        # Capped by what the goal was tried with, so cycles cannot inflate it
+        if not goal.alternatives:
+            return goal.budget
+        worst = goal.budget - 1
+        for alternative in goal.alternatives:
+            worst = min(worst, max(p.failed_budget for p in alternative.premises))
+        return max(0, worst + 1)
+
+    def _fail(self, goal: Goal, budget: int):
+        if goal.proven or budget <= goal.failed_budget:
+            return
+        goal.failed_budget = budget
+        stack = [goal]
+        while stack:
+            for alternative in stack.pop().parents:
+                parent = alternative.goal
+                if parent.proven or parent.budget < 0:
+                    continue
+                failed = self._failed_budget(parent)
+                if failed > parent.failed_budget:
+                    parent.failed_budget = failed
+                    stack.append(parent)
@@ -0,0 +1,259 @@
+from operator import add
+from typing import Any, List, Optional
+from syntax import (
+    Node, NumericExpression, NumericVariable, LogicVariable, Variable,
+    Implies, Not, Forall, Equals, Successor, Add, Multiply, Zero, BoundVariable,
+    TAG_CLASSES
+)
+
+try:
+    import numpy
+except ImportError:  # Optional: FeatureIndex falls back to scanning a flat array
+    numpy = None
+
+# Pattern variables are indexed as wildcards of their sort
+NUMERIC_WILDCARD = "*numeric"
+LOGIC_WILDCARD = "*logic"
+
+def _symbol(node: Node):
+    """Preorder symbol of a node: its tag, plus the raw argument where it matters."""
+    # Dispatch on the integer tag: this runs once per symbol of every indexed fact.
+    tag = node.tag
+    if tag == NumericVariable.tag:
+        return NUMERIC_WILDCARD
+    if tag == LogicVariable.tag:
+        return LOGIC_WILDCARD
+    if tag == Successor.tag:
+        return (tag, node.offset)
+    if tag == BoundVariable.tag:
+        return (tag, node.index)
+    return tag
+
+# Tag sets for the retrieval loop, where isinstance against the ABCs is slow
+_NUMERIC_TAGS = frozenset(cls.tag for cls in TAG_CLASSES if issubclass(cls, NumericExpression))
+_VARIABLE_TAGS = frozenset((NumericVariable.tag, LogicVariable.tag))
+
+def _arity(symbol) -> int:
+    """How many subterms follow a symbol in a preorder symbol string."""
+    if symbol.__class__ is str:
+        return 0
+    if symbol.__class__ is tuple:
+        return TAG_CLASSES[symbol[0]]._node_arity
+    return TAG_CLASSES[symbol]._node_arity
+
+class _Branch:
+    __slots__ = ('children', 'offsets', 'values', 'truncated')
+
+    def __init__(self):
+        self.children: dict = {}
+        self.offsets: List[int] = []  # Offsets of the Successor symbols among children
+        self.values: list = []        # Patterns whose whole symbol string ends here
+        self.truncated: list = []     # Patterns cut off here at max_depth symbols
+
+class DiscriminationTree:
+    """
+    Discrimination tree over the preorder symbol strings of patterns. Pattern
+    variables are wildcards of their sort, so candidates(target) returns the
+    values of every pattern that may match the target, and no others except
+    for non-linear patterns (x=x), which Matcher.match then rules out.
+
+    A Successor symbol carries its offset: the pattern S^k(p) is reachable
+    from S^n(t) for every k <= n, continuing with S^(n-k)(t) against p.
+
+    Variables of the target named in flexible may be bound too, as in
+    unification: each skips one whole pattern subterm, whatever its symbols,
+    and S^n(y) with y flexible also reaches S^k(p) for k > n.
+
+    Only the first max_depth symbols of a pattern are indexed. Deeper
+    symbols rarely narrow the candidates further, but a branch for each
+    would make inserting large facts expensive.
+    """
+    def __init__(self, max_depth: int = 12):
+        self._root = _Branch()
+        self._count = 0
+        self.max_depth = max_depth
+
+    def __len__(self):
+        return self._count
+
+    def insert(self, pattern: Node, value: Any):
+        branch = self._root
+        stack = [pattern]
+        depth = 0
+        while stack:
+            if depth == self.max_depth:
+                branch.truncated.append((self._count, value))
+                self._count += 1
+                return
+            depth += 1
+            n = stack.pop()
+            symbol = _symbol(n)
+            child = branch.children.get(symbol)
+            if child is None:
+                child = branch.children[symbol] = _Branch()
+                if symbol.__class__ is tuple and symbol[0] == Successor.tag:
+                    branch.offsets.append(n.offset)
+            branch = child
+            if symbol.__class__ is not str:
+                stack.extend(reversed(n._children()))
+        branch.values.append((self._count, value))
+        self._count += 1
+
+    def candidates(self, target: Node, flexible: frozenset = frozenset()) -> list:
+        """Values of the patterns that can match (or, given flexible, unify with) target, in insertion order."""
+        found = []
+        # Each frame is a branch and the target subterms still to consume, as a cons list
+        stack = [(self._root, (target, None), 0)]
+        while stack:
+            branch, rest, depth = stack.pop()
+            if rest is None:
+                found.extend(branch.values)
+                continue
+            if depth == self.max_depth:
+                found.extend(branch.truncated)
+                continue
+            depth += 1
+            t, rest = rest
+            tag = t.tag
+            wildcard = branch.children.get(NUMERIC_WILDCARD if tag in _NUMERIC_TAGS else LOGIC_WILDCARD)
+            if wildcard is not None:
+                stack.append((wildcard, rest, depth))
+            if tag in _VARIABLE_TAGS:
+                if t.name in flexible:
+                    # Skip one pattern subterm: a branch owes n more subterms
+                    skips = [(branch, 1, depth - 1)]
+                    while skips:
+                        b, owed, d = skips.pop()
+                        if owed == 0:
+                            stack.append((b, rest, d))
+                        elif d == self.max_depth:
+                            found.extend(b.truncated)
+                        else:
+                            for symbol, child in b.children.items():
+                                skips.append((child, owed - 1 + _arity(symbol), d + 1))
+                # Otherwise only a pattern variable can match a variable
+                continue
+            if tag == Successor.tag:
+                base = t.base
+                # S^n(y), y flexible, also unifies with S^k(p) for k > n, binding y to S^(k-n)(p)
+                deeper = base.tag in _VARIABLE_TAGS and base.name in flexible
+                for k in branch.offsets:
+                    if k <= t.offset:
+                        stack.append((branch.children[(Successor.tag, k)], (t.with_offset(t.offset - k), rest), depth))
+                    elif deeper:
+                        stack.append((branch.children[(Successor.tag, k)], (base, rest), depth))
+                continue
+            child = branch.children.get(_symbol(t))
+            if child is not None:
+                for c in reversed(t._children()):
+                    rest = (c, rest)
+                stack.append((child, rest, depth))
+        if flexible:
+            # A pattern variable may be reached both as a wildcard and by skipping
+            found = list(dict(found).items())
+        found.sort(key=lambda entry: entry[0])
+        return [value for _, value in found]
+
+# Symbols counted by feature vectors, followed by the depth
+FEATURE_SYMBOLS = (Implies, Not, Forall, Equals, Successor, Add, Multiply, Zero)
+FEATURE_COUNT = len(FEATURE_SYMBOLS) + 1
+_FEATURE_COLUMNS = {cls.tag: i for i, cls in enumerate(FEATURE_SYMBOLS)}
+# _AT_LEAST[v] translates a byte to 1 if it is at least v, else to 0
+_AT_LEAST = [bytes(int(b >= v) for b in range(256)) for v in range(256)]
+
+class FeatureIndex:
+    """
+    Feature vectors of stored formulas: occurrence counts of the non-variable
+    symbols in FEATURE_SYMBOLS (Successor counted in steps) and the depth. A
+    pattern can only match a target whose vector is at least the pattern's in
+    every column, since each pattern symbol maps to a distinct target symbol
+    and a variable maps to a whole subterm. Variable occurrences are not a
+    column: a variable can match a ground term, so they give no such bound.
+
+    instances(pattern) compares one vector against all rows at once, with
+    NumPy when it is installed. Otherwise each column is a bytearray (values
+    capped at 255, which only loosens the filter) and a threshold is applied
+    to a whole column with bytes.translate, so the scan still runs in C.
+    """
+    def __init__(self):
+        self.nodes: List[Node] = []
+        self._features: dict[Node, tuple] = {}
+        if numpy is not None:
+            self._matrix = numpy.zeros((64, FEATURE_COUNT), dtype=numpy.int64)
+        else:
+            self._columns = [bytearray() for _ in range(FEATURE_COUNT)]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def features(self, node: Node) -> tuple:
+        """The feature vector of a node (memoized per sub-node, so shared DAGs count once per call)."""
+        cache = self._features
+        stack = [node]
+        while stack:
+            n = stack[-1]
+            if n in cache:
+                stack.pop()
+                continue
+            children = n._children()
+            pending = [c for c in children if c not in cache]
+            if pending:
+                stack.extend(pending)
+                continue
+            if not children:
+                counts = [0] * FEATURE_COUNT
+            elif len(children) == 1:
+                counts = list(cache[children[0]])
+            else:
+                counts = list(map(add, cache[children[0]], cache[children[1]]))
+            column = _FEATURE_COLUMNS.get(n.tag)
+            if column is not None:
+                counts[column] += n.offset if n.tag == Successor.tag else 1
+            counts[-1] = n.depth
+            cache[n] = tuple(counts)
+            stack.pop()
+        return cache[node]
+
+    def add(self, node: Node):
+        vector = self.features(node)
+        row = len(self.nodes)
+        self.nodes.append(node)
+        if numpy is not None:
+            if row == len(self._matrix):
+                self._matrix = numpy.concatenate([self._matrix, numpy.zeros_like(self._matrix)])
+            self._matrix[row] = vector
+        else:
+            for column, value in zip(self._columns, vector):
+                column.append(min(value, 255))
+
+    def dominates(self, target: Node, pattern: Node) -> bool:
+        """True if target's vector is at least pattern's in every column."""
+        return all(t >= p for t, p in zip(self.features(target), self.features(pattern)))
+
+    def instance_rows(self, pattern: Node, limit: Optional[int] = None, start: int = 0) -> List[int]:
+        """Rows in [start, limit) whose vector is at least pattern's, in order."""
+        vector = self.features(pattern)
+        count = len(self.nodes) if limit is None else min(limit, len(self.nodes))
+        if start >= count:
+            return []
+        if numpy is not None:
+            mask = (self._matrix[start:count] >= numpy.array(vector)).all(axis=1)
+            return (numpy.flatnonzero(mask) + start).tolist()
+        mask = None
+        for column, value in zip(self._columns, vector):
+            if value:
+                passed = int.from_bytes(column[start:count].translate(_AT_LEAST[min(value, 255)]), 'little')
+                mask = passed if mask is None else mask & passed
+        if mask is None:
+            return list(range(start, count))
+        flags = mask.to_bytes(count - start, 'little')
+        rows = []
+        row = flags.find(1)
+        while row != -1:
+            rows.append(start + row)
+            row = flags.find(1, row + 1)
+        return rows
+
+    def instances(self, pattern: Node, limit: Optional[int] = None, start: int = 0) -> List[Node]:
+        """Stored formulas among rows [start, limit) that pattern may match, in the order they were added."""
+        return [self.nodes[row] for row in self.instance_rows(pattern, limit, start)]
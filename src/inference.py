@@ -1,5 +1,5 @@
-from syntax import Implies, Forall, NumericVariable, LogicExpression
-from storage import SentenceStorage, Provenance
+from syntax import Implies, Forall, NumericVariable, LogicExpression, substitute
+from storage import SentenceStorage, Provenance, Bindings
 
 class ModusPonens:
     def __init__(self, storage: SentenceStorage):
@@ -46,7 +46,7 @@ class UniversalGeneralization:
         if not self.storage.is_proven(sentence):
             raise ValueError(f"Sentence {sentence} is not proven.")
             
-        quantified = self.storage.intern(Forall(var, sentence))
+        quantified = self.storage.intern(Forall.make(var, sentence))
         
         provenance = Provenance("Universal Generalization", dependencies=[sentence], metadata={
             "var": var
@@ -62,55 +62,6 @@ class Substitution:
     def __init__(self, storage: SentenceStorage):
         self.storage = storage
     
-    def _substitute(self, node, bindings):
-        """Recursively apply substitutions to a node."""
-        from syntax import (
-            Node, NumericVariable, LogicVariable, Zero, Successor,
-            Add, Multiply, Equals, Not, Implies, Forall
-        )
-        
-        # If node is a variable, replace it if there's a binding
-        if isinstance(node, (NumericVariable, LogicVariable)):
-            if node.name in bindings:
-                return bindings[node.name]
-            return node
-        
-        # Recursively substitute in compound expressions
-        if isinstance(node, Zero):
-            return node
-        elif isinstance(node, Successor):
-            return self.storage.intern(Successor(self._substitute(node.operand, bindings)))
-        elif isinstance(node, Add):
-            return self.storage.intern(Add(
-                self._substitute(node.left, bindings),
-                self._substitute(node.right, bindings)
-            ))
-        elif isinstance(node, Multiply):
-            return self.storage.intern(Multiply(
-                self._substitute(node.left, bindings),
-                self._substitute(node.right, bindings)
-            ))
-        elif isinstance(node, Equals):
-            return self.storage.intern(Equals(
-                self._substitute(node.left, bindings),
-                self._substitute(node.right, bindings)
-            ))
-        elif isinstance(node, Not):
-            return self.storage.intern(Not(self._substitute(node.operand, bindings)))
-        elif isinstance(node, Implies):
-            return self.storage.intern(Implies(
-                self._substitute(node.left, bindings),
-                self._substitute(node.right, bindings)
-            ))
-        elif isinstance(node, Forall):
-            # Don't substitute the bound variable
-            return self.storage.intern(Forall(
-                node.var,
-                self._substitute(node.sentence, bindings)
-            ))
-        else:
-            return node
-    
     def apply(self, expression, bindings):
         """
         If expression is proven, return expression with bindings applied.
@@ -121,12 +72,12 @@ class Substitution:
         if not self.storage.is_proven(expression):
             raise ValueError(f"Expression {expression} is not proven.")
         
-        # Apply substitution
-        substituted = self._substitute(expression, bindings)
+        # Apply substitution (simultaneous, single pass)
+        substituted = self.storage.intern(substitute(expression, bindings))
         
         # Mark as proven
         provenance = Provenance("Substitution", dependencies=[expression], metadata={
-            "bindings": {k: str(v) for k, v in bindings.items()}
+            "bindings": Bindings(bindings)
         })
         self.storage.mark_proven(substituted, provenance)
         return substituted
@@ -1,14 +1,25 @@
-from typing import Dict, Optional, Any
+from typing import Callable, Dict, Optional, Any
 from syntax import (
     Node, NumericVariable, LogicVariable,
     NumericExpression, LogicExpression,
-    Equals, Not, Implies, Forall,
-    Zero, Successor, Add, Multiply
+    Equals, Not, Implies, Forall, BoundVariable,
+    Zero, Successor, Add, Multiply, TAG_CLASSES
 )
+from cache import LRUCache, MISSING
+
+# A compiled pattern: called with the target and the bindings so far
+CompiledMatcher = Callable[[Node, Dict[str, Node]], bool]
+
+_NUMERIC_TAGS = frozenset(cls.tag for cls in TAG_CLASSES if issubclass(cls, NumericExpression))
+_LOGIC_TAGS = frozenset(cls.tag for cls in TAG_CLASSES if issubclass(cls, LogicExpression))
 
 class Matcher:
+    # Compiled matchers nest one call per pattern level; deeper patterns are interpreted
+    MAX_COMPILED_DEPTH = 200
+    COMPILED_CACHE_SIZE = 20000  # Every proven fact is a pattern, so the cache is bounded
+
     def __init__(self):
-        pass
+        self._compiled = LRUCache(self.COMPILED_CACHE_SIZE)
 
     def match(self, pattern: Node, target: Node) -> Optional[Dict[str, Node]]:
         """
@@ -17,58 +28,120 @@ class Matcher:
         Returns a dictionary mapping pattern variable names to target sub-expressions.
         Returns None if match fails.
         """
+        compiled = self._compiled.get(pattern)
+        if compiled is MISSING:
+            compiled = self.compile(pattern)
+            self._compiled.put(pattern, compiled)
         bindings: Dict[str, Node] = {}
-        if self._recursive_match(pattern, target, bindings):
+        if compiled(target, bindings):
             return bindings
         return None
 
-    def _recursive_match(self, p: Node, t: Node, bindings: Dict[str, Node]) -> bool:
-        # print(f"DEBUG Match: {p} ({type(p).__name__}) vs {t} ({type(t).__name__})")
-        # If pattern is a variable, check binding consistency
+    def compile(self, pattern: Node) -> CompiledMatcher:
+        """
+        Specializes matching against one pattern into a tree of closures, one
+        per pattern node, that compare integer tags instead of classes. Ground
+        subterms become a single identity check, and each variable is known in
+        advance to be either bound here (its first occurrence, left to right)
+        or checked against an earlier binding.
+        """
+        if pattern.depth > self.MAX_COMPILED_DEPTH:
+            return lambda t, b: self._match_into(pattern, t, b)
+        return self._compile(pattern, set())
+
+    def _compile(self, p: Node, seen: set) -> CompiledMatcher:
+        if p.is_ground:
+            # Interned targets are identical when equal; == covers other tables
+            return lambda t, b: t is p or t == p
+        tag = p.tag
         if isinstance(p, (NumericVariable, LogicVariable)):
             name = p.name
-            if name in bindings:
-                # Must match previous binding
-                if bindings[name] != t:
-                    # print(f"  Fail: Binding mismatch {name} -> {bindings[name]} vs {t}")
+            if name in seen:
+                return lambda t, b: b[name] == t
+            seen.add(name)
+            sort = _NUMERIC_TAGS if isinstance(p, NumericVariable) else _LOGIC_TAGS
+
+            def bind(t, b):
+                # A quantified variable of the target cannot escape its Forall
+                if t.tag not in sort or t.loose:
                     return False
+                b[name] = t
                 return True
-            else:
+            return bind
+        if isinstance(p, Successor):
+            offset = p.offset
+            base = self._compile(p.base, seen)
+            return lambda t, b: t.tag == tag and t.offset >= offset and base(t.with_offset(t.offset - offset), b)
+        if isinstance(p, Not):
+            operand = self._compile(p.operand, seen)
+            return lambda t, b: t.tag == tag and operand(t.operand, b)
+        if isinstance(p, Forall):
+            body = self._compile(p.body, seen)
+            return lambda t, b: t.tag == tag and body(t.body, b)
+        # Binary nodes: the left side is compiled, and so matched, first
+        left = self._compile(p.left, seen)
+        right = self._compile(p.right, seen)
+        return lambda t, b: t.tag == tag and left(t.left, b) and right(t.right, b)
+
+    def _match_into(self, p: Node, t: Node, bindings: Dict[str, Node]) -> bool:
+        # Explicit stack of (pattern, target) pairs, so deep terms don't recurse.
+        stack = [(p, t)]
+        while stack:
+            p, t = stack.pop()
+            # If pattern is a variable, check binding consistency
+            if isinstance(p, (NumericVariable, LogicVariable)):
+                name = p.name
+                if name in bindings:
+                    # Must match previous binding
+                    if bindings[name] != t:
+                        return False
+                    continue
                 # New binding
                 # Constraint: NumericVariable pattern can only match NumericExpression target
                 if isinstance(p, NumericVariable) and not isinstance(t, NumericExpression):
-                    # print(f"  Fail: Type mismatch NumVar vs {type(t)}")
                     return False
                 # LogicVariable can match ANY LogicExpression (including compound formulas)
                 # This enables axiom schema instantiation: A, B, C can be replaced with any formula
                 if isinstance(p, LogicVariable) and not isinstance(t, LogicExpression):
-                    # print(f"  Fail: Type mismatch LogicVar vs {type(t)}")
                     return False
-                
+                # A quantified variable of the target cannot escape its Forall
+                if t.loose:
+                    return False
                 bindings[name] = t
-                return True
+                continue
 
-        # If types differ (and not a variable pattern), fail
-        if type(p) != type(t):
-            # print(f"  Fail: Type mismatch {type(p)} != {type(t)}")
-            return False
+            # If types differ (and not a variable pattern), fail
+            if type(p) != type(t):
+                return False
 
-        # Structural recursion
-        if isinstance(p, Zero):
-            return True # t is Zero (checked by type)
-
-        if isinstance(p, Successor):
-            return self._recursive_match(p.operand, t.operand, bindings)
+            # A ground pattern only matches itself
+            if p is t and p.is_ground:
+                continue
 
-        if isinstance(p, (Add, Multiply, Equals, Implies)):
-            if not self._recursive_match(p.left, t.left, bindings): return False
-            return self._recursive_match(p.right, t.right, bindings)
+            # Structural recursion: pairs are pushed right-to-left so the left side is matched first
+            if isinstance(p, Zero):
+                continue # t is Zero (checked by type)
 
-        if isinstance(p, Not):
-            return self._recursive_match(p.operand, t.operand, bindings)
+            if isinstance(p, BoundVariable):
+                # Both sides are at the same binder depth, so indices compare directly
+                if p.index != t.index:
+                    return False
+                continue
 
-        if isinstance(p, Forall):
-            if not self._recursive_match(p.var, t.var, bindings): return False
-            return self._recursive_match(p.sentence, t.sentence, bindings)
-            
-        return False
+            if isinstance(p, Successor):
+                # S^k(p') against S^n(t'): p' must match S^(n-k)(t'), which is
+                # one node, so S(x) matches the numeral 1000 in one step.
+                if t.offset < p.offset:
+                    return False
+                stack.append((p.base, t.with_offset(t.offset - p.offset)))
+            elif isinstance(p, Not):
+                stack.append((p.operand, t.operand))
+            elif isinstance(p, (Add, Multiply, Equals, Implies)):
+                stack.append((p.right, t.right))
+                stack.append((p.left, t.left))
+            elif isinstance(p, Forall):
+                # Bodies are in de Bruijn form: alpha-variants match without binding the quantifier
+                stack.append((p.body, t.body))
+            else:
+                return False
+        return True
@@ -0,0 +1,157 @@
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from syntax import Node, Implies, substitute
+from storage import SentenceStorage, SnapshotStorage, write_snapshot
+from matcher import Matcher
+from indexing import FeatureIndex
+
+# (implication position, fact position, bindings) for one successful match
+Match = Tuple[int, int, Dict[str, Node]]
+
+def _match_chunk(facts: List[Node], positions_of: Callable, is_proven: Callable, matcher: Matcher,
+                 implications: List[int], start: int, stop: int) -> Iterator[Match]:
+    """
+    The semi-naive join of AutoProver._forward_pairs for the implications
+    at the given positions: one proven before start meets the facts in
+    [start, stop), a newer one every fact before stop. Consequents already
+    proven, or already produced in this chunk, are left out.
+    """
+    seen = set()
+    for i in implications:
+        imp = facts[i]
+        for j in positions_of(imp.left, stop, start if i < start else 0):
+            bindings = matcher.match(imp.left, facts[j])
+            if bindings is None:
+                continue
+            consequent = substitute(imp.right, bindings)
+            if consequent in seen or is_proven(consequent):
+                continue
+            seen.add(consequent)
+            yield i, j, bindings
+
+class _WorkerFacts:
+    """
+    A worker process's copy of the facts: the snapshot it was started with,
+    then each round's new facts, read once from the delta file and added to
+    the same feature index, so a round costs the worker only its delta.
+    """
+    def __init__(self, path: str):
+        self.storage = SnapshotStorage(path)
+        self.facts = list(self.storage.proven)
+        self.features = FeatureIndex()
+        for fact in self.facts:
+            self.features.add(fact)
+        self.added = set()  # Facts read from deltas, which the snapshot does not know
+        self.matcher = Matcher()
+        self._offset = 0  # Where the next unread delta starts in the delta file
+
+    def read_deltas(self, path: str, stop: int):
+        if len(self.facts) >= stop:
+            return
+        with open(path, 'rb') as f:
+            f.seek(self._offset)
+            while len(self.facts) < stop:
+                for fact in pickle.load(f):
+                    self.facts.append(fact)
+                    self.features.add(fact)
+                    self.added.add(fact)
+            self._offset = f.tell()
+
+    def is_proven(self, node: Node) -> bool:
+        return node in self.added or self.storage.is_proven(node)
+
+# Per worker process, created by the pool initializer
+_worker: Optional[_WorkerFacts] = None
+
+def _start_worker(path: str):
+    global _worker
+    _worker = _WorkerFacts(path)
+
+def _match_delta(delta_path: str, implications: List[int], start: int, stop: int) -> List[Match]:
+    _worker.read_deltas(delta_path, stop)
+    return list(_match_chunk(_worker.facts, _worker.features.instance_rows, _worker.is_proven, _worker.matcher,
+                             implications, start, stop))
+
+class ParallelForwardChainer:
+    """
+    Forward chaining with the implications partitioned across worker
+    processes. The first round writes the facts to a snapshot file that
+    every worker maps read-only (the OS shares its pages) and indexes once;
+    later rounds only append their new facts to a delta file, which each
+    worker reads and indexes incrementally. Each round deals the
+    implications round-robin into CHUNKS_PER_WORKER chunks per worker and
+    yields the matches as chunks complete. Committing them, with the usual
+    provenance, stays with the caller, which owns the storage.
+
+    With one worker the join runs in this process on the storage itself.
+    """
+    CHUNKS_PER_WORKER = 4  # More chunks than workers, so a slow chunk does not hold up the round
+
+    def __init__(self, storage: SentenceStorage, workers: Optional[int] = None):
+        self.storage = storage
+        self.workers = workers or os.cpu_count() or 1
+        self.matcher = Matcher()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._directory: Optional[str] = None
+        self._written = 0  # Facts in the snapshot and delta file so far
+
+    def matches(self, start: int, stop: int) -> Iterator[Tuple[Implies, Node, Dict[str, Node]]]:
+        """
+        Yields (implication, fact, bindings) for each match of the semi-naive
+        join of the facts proven before stop, with [start, stop) new.
+        Closing the iterator early cancels the chunks not yet started.
+        """
+        facts = self.storage.facts_since(0, stop)
+        positions = [i for i, node in enumerate(facts) if isinstance(node, Implies)]
+        if self.workers == 1:
+            # Lazily, so the caller's commits and timeout checks interleave with the matching
+            found = _match_chunk(facts, self.storage.instance_positions, self.storage.is_proven,
+                                 self.matcher, positions, start, stop)
+            for i, j, bindings in found:
+                yield facts[i], facts[j], bindings
+            return
+        path = self._write_delta(stop)
+        chunks = self.workers * self.CHUNKS_PER_WORKER
+        futures = [self._pool().submit(_match_delta, path, positions[k::chunks], start, stop)
+                   for k in range(chunks) if positions[k::chunks]]
+        try:
+            for future in as_completed(futures):
+                for i, j, bindings in future.result():
+                    # Nodes unpickle into the active table, which may not be this storage's
+                    yield facts[i], facts[j], {name: self.storage.intern(value) for name, value in bindings.items()}
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        """Stops the worker processes and removes the snapshot and delta files."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_start_worker,
+                                                 initargs=(os.path.join(self._directory, "facts.snap"),))
+        return self._executor
+
+    def _write_delta(self, stop: int) -> str:
+        """Writes the snapshot on the first round, then appends the facts in [written, stop) to the delta file."""
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="mathai-facts-")
+            write_snapshot(os.path.join(self._directory, "facts.snap"), self.storage)
+            self._written = len(self.storage.proven)
+            open(os.path.join(self._directory, "delta.pickle"), 'wb').close()
+        path = os.path.join(self._directory, "delta.pickle")
+        if stop > self._written:
+            with open(path, 'ab') as f:
+                pickle.dump(self.storage.facts_since(self._written, stop), f, pickle.HIGHEST_PROTOCOL)
+            self._written = stop
+        return path
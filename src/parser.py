@@ -54,17 +54,22 @@ class Parser:
     
     def parse_logic(self) -> Node:
         # Handles Implication
-        left = self.parse_or()
+        # Right associative: A->B->C is A->(B->C). Operands are collected in a
+        # loop and folded from the right, so long chains don't recurse.
+        operands = [self.parse_or()]
         
         self.tokenizer.skip_whitespace()
         # Check for ->
-        if self.tokenizer.current_char == '-' and self.tokenizer.peek() == '>':
+        while self.tokenizer.current_char == '-' and self.tokenizer.peek() == '>':
             self.tokenizer.advance() # -
             self.tokenizer.advance() # >
-            right = self.parse_logic() # Right associative? A->B->C is A->(B->C)
-            return Implies(left, right)
+            operands.append(self.parse_or())
+            self.tokenizer.skip_whitespace()
             
-        return left
+        result = operands.pop()
+        while operands:
+            result = Implies.make(operands.pop(), result)
+        return result
 
     def parse_or(self) -> Node:
         left = self.parse_and()
@@ -73,7 +78,7 @@ class Parser:
             self.tokenizer.advance()
             right = self.parse_and()
             # P|Q is (~P)->Q
-            left = Implies(Not(left), right)
+            left = Implies.make(Not.make(left), right)
             
         return left
 
@@ -84,51 +89,54 @@ class Parser:
             self.tokenizer.advance()
             right = self.parse_unary_logic()
             # P&Q is ~(P->~Q)
-            left = Not(Implies(left, Not(right)))
+            left = Not.make(Implies.make(left, Not.make(right)))
             
         return left
 
     def parse_unary_logic(self) -> Node:
-        self.tokenizer.skip_whitespace()
-        char = self.tokenizer.current_char
-        
-        if char == '~':
-            self.tokenizer.advance()
-            # No parens required after ~, so recurse immediately
-            operand = self.parse_unary_logic()
-            return Not(operand)
-            
-        if char == '!': # Forall
-            self.tokenizer.advance()
-            var_name = self.parse_var_name()
-            # Expect ( maybe? Or just logic expr?
-            # User said !x(P). usually parens surround P
-            if self.tokenizer.current_char == '(':
-                # We usually expect parens for the body or just a body
-                # Let's try to parse logic
-                pass
-            
-            # The body follows.
-            body = self.parse_unary_logic() # Tighter binding? or parse_logic?
-            # !x(P) -> P is usually in parens.
-            # If user writes !x~P -> P, it's (!x(~P)) -> P.
-            # Let's assume ! binds tight to the immediate next unit.
-            
-            var = NumericVariable(var_name) # Assuming numeric quantification mostly
-            return Forall(var, body)
-            
-        if char == '?': # Exists
-            self.tokenizer.advance()
-            var_name = self.parse_var_name()
-            # ?x(P) is ~!x(~P)
-            body = self.parse_unary_logic()
+        # Prefix operators are collected in a loop and applied innermost-first,
+        # so long runs like ~~~~P or !x!y!z... don't recurse.
+        prefixes = []
+        while True:
+            self.tokenizer.skip_whitespace()
+            char = self.tokenizer.current_char
             
-            var = NumericVariable(var_name)
-            # ~!x(~body)
-            return Not(Forall(var, Not(body)))
+            if char == '~':
+                self.tokenizer.advance()
+                # No parens required after ~
+                prefixes.append(('~', None))
+                continue
+                
+            if char == '!': # Forall
+                self.tokenizer.advance()
+                var_name = self.parse_var_name()
+                # The body follows. ! binds tight to the immediate next unit:
+                # !x(P) -> P is usually in parens, and !x~P -> P is (!x(~P)) -> P.
+                prefixes.append(('!', var_name))
+                continue
+                
+            if char == '?': # Exists
+                self.tokenizer.advance()
+                var_name = self.parse_var_name()
+                # ?x(P) is ~!x(~P)
+                prefixes.append(('?', var_name))
+                continue
+            break
             
         # Try numeric equality or parens logic
-        return self.parse_equality()
+        node = self.parse_equality()
+        
+        for op, var_name in reversed(prefixes):
+            if op == '~':
+                node = Not.make(node)
+            elif op == '!':
+                var = NumericVariable.make(var_name) # Assuming numeric quantification mostly
+                node = Forall.make(var, node)
+            else:
+                var = NumericVariable.make(var_name)
+                # ~!x(~body)
+                node = Not.make(Forall.make(var, Not.make(node)))
+        return node
 
     def parse_equality(self) -> Node:
         left = self.parse_numeric()
@@ -137,7 +145,7 @@ class Parser:
         if self.tokenizer.current_char == '=':
             self.tokenizer.advance()
             right = self.parse_numeric()
-            return Equals(left, right)
+            return Equals.make(left, right)
             
         # If no =, then 'left' must have been a Logic Expression disguised?
         # Or maybe it's a Logic Variable?
@@ -157,7 +165,7 @@ class Parser:
             # Treat Uppercase vars as Logic Variables for now?
             # User example P, Q.
             # Convert
-            return LogicVariable(left.name)
+            return LogicVariable.make(left.name)
             
         if isinstance(left, NumericExpression) and not isinstance(left, (NumericVariable, Zero, Successor, Add, Multiply)):
              pass
@@ -173,7 +181,7 @@ class Parser:
         if isinstance(left, NumericVariable):
              # Heuristic: if it's acting as logic sentence, upgrade it.
              # User examples: P, Q.
-             return LogicVariable(left.name)
+             return LogicVariable.make(left.name)
 
         return left 
 
@@ -181,42 +189,60 @@ class Parser:
         left = self.parse_add()
         return left
 
-    def parse_add(self) -> NumericExpression:
-        left = self.parse_mul()
+    def parse_add(self, first: Optional[NumericExpression] = None) -> NumericExpression:
+        # first: a leading term already parsed by the caller
+        left = self.parse_mul(first)
         
         while self.tokenizer.current_char == '+':
             self.tokenizer.advance()
             right = self.parse_mul()
-            left = Add(left, right)
+            left = Add.make(left, right)
         return left
         
-    def parse_mul(self) -> NumericExpression:
-        left = self.parse_term()
+    def parse_mul(self, first: Optional[NumericExpression] = None) -> NumericExpression:
+        left = self.parse_term() if first is None else first
         
         while self.tokenizer.current_char == '*':
             self.tokenizer.advance()
             right = self.parse_term()
-            left = Multiply(left, right)
+            left = Multiply.make(left, right)
         return left
 
     def parse_term(self) -> NumericExpression:
         self.tokenizer.skip_whitespace()
         c = self.tokenizer.current_char
         
-        if c == '0':
-            self.tokenizer.advance()
-            return Zero()
+        if c is not None and c.isdigit():
+            # Decimal literal: 0, or S^n(0) as a single numeral node
+            digits = []
+            while self.tokenizer.current_char is not None and self.tokenizer.current_char.isdigit():
+                digits.append(self.tokenizer.current_char)
+                self.tokenizer.advance()
+            value = int("".join(digits))
+            if value == 0:
+                return Zero.make()
+            return Successor.make(Zero.make(), value)
             
         if c == 'S':
-            # S(x)
-            self.tokenizer.advance()
-            if self.tokenizer.current_char == '(':
+            # S(x), or a run S(S(...(x)...)) counted in a loop
+            if self.tokenizer.peek() != '(':
+                raise ValueError("Expected ( after S")
+            depth = 0
+            while self.tokenizer.current_char == 'S' and self.tokenizer.peek() == '(':
+                self.tokenizer.advance()
+                self.tokenizer.advance()
+                depth += 1
+                self.tokenizer.skip_whitespace()
+            inner = self.parse_numeric()
+            for level in range(depth):
+                if level > 0:
+                    # The enclosing argument may go on past S(...), as in S(S(x)+y)
+                    inner = self.parse_add(inner)
+                if self.tokenizer.current_char != ')':
+                    raise ValueError("Expected ) after S(")
                 self.tokenizer.advance()
-                inner = self.parse_numeric()
-                if self.tokenizer.current_char == ')':
-                    self.tokenizer.advance()
-                    return Successor(inner)
-            raise ValueError("Expected ( after S")
+                inner = Successor.make(inner)
+            return inner
             
         if c == '(':
             self.tokenizer.advance()
@@ -236,7 +262,7 @@ class Parser:
             
         if c is not None and c.isalnum():
             name = self.parse_var_name()
-            return NumericVariable(name)
+            return NumericVariable.make(name)
             
         raise ValueError(f"Unexpected char in numeric: {c}")
 
@@ -0,0 +1,151 @@
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+import multiprocessing
+from contextlib import redirect_stdout
+from queue import Empty
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from syntax import Node
+from storage import SentenceStorage, SnapshotStorage, Provenance, write_snapshot
+from prover import AutoProver
+
+class Strategy:
+    """
+    One configuration of a portfolio: keyword arguments for AutoProver.prove,
+    AutoProver constants to override, and an optional seed. A seeded prover
+    breaks ties between equally good agenda goals at random, so copies of
+    one strategy with different seeds explore in different orders.
+    """
+    def __init__(self, name: str, seed: Optional[int] = None, overrides: Optional[Dict[str, Any]] = None, **options):
+        self.name = name
+        self.seed = seed
+        self.overrides = overrides or {}
+        self.options = options
+
+    def __repr__(self):
+        return f"Strategy({self.name!r})"
+
+DEFAULT_STRATEGIES = (
+    # Propositional goals like P->P: deep backward search, many guesses per axiom
+    Strategy("backward", enable_forward=False, overrides={"MAX_GUESSES_PER_IMPLICATION": 10}),
+    Strategy("backward-seed-1", seed=1, enable_forward=False,
+             overrides={"MAX_GUESSES_PER_IMPLICATION": 10, "EXPANSIONS_PER_ROUND": 200}),
+    # Equational Peano facts: forward chaining
+    Strategy("forward"),
+    Strategy("saturation", forward_strategy="saturation"),
+    Strategy("bidirectional", bidirectional=True),
+    # Tighter caps on backward steps leave more time for the forward join
+    Strategy("forward-narrow", seed=2, overrides={
+        "MAX_CHAINED_IMPLICATIONS": 5, "MAX_CLOSING_ATTEMPTS": 10, "EXPANSIONS_PER_ROUND": 10,
+    }),
+)
+
+def proof_cone(storage: SentenceStorage, goal: Node, known) -> List[Tuple[Node, Provenance]]:
+    """
+    The facts the proof of goal depends on, through provenance dependencies,
+    that are not in known, each after its own dependencies.
+    """
+    cone = []
+    done = set()
+    stack = [(goal, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node in done or node in known:
+            continue
+        provenance = storage.get_provenance(node)
+        if expanded:
+            done.add(node)
+            cone.append((node, provenance))
+            continue
+        stack.append((node, True))
+        for dependency in reversed(provenance.dependencies):
+            if dependency not in done and dependency not in known:
+                stack.append((dependency, False))
+    return cone
+
+def _run_strategy(strategy: Strategy, path: str, goal: str, max_rounds: int, timeout: float, results):
+    """Worker process: proves goal over the snapshot with one strategy and reports the proof's cone."""
+    output = io.StringIO()
+    cone = []
+    proven = False
+    try:
+        with redirect_stdout(output):
+            storage = SnapshotStorage(path)
+            known = set(storage.facts_since(0))
+            heuristic = None
+            if strategy.seed is not None:
+                # Below 1, so it only reorders goals of equal priority
+                rng = random.Random(strategy.seed)
+                heuristic = lambda node: rng.random()
+            prover = AutoProver(storage, heuristic=heuristic)
+            for name, value in strategy.overrides.items():
+                setattr(prover, name, value)
+            proven = prover.prove(goal, max_rounds=max_rounds, timeout=timeout, **strategy.options)
+            if proven:
+                cone = proof_cone(storage, prover.parser.parse(goal), known)
+    except Exception as e:
+        output.write(f"{strategy.name} failed: {e}\n")
+    finally:
+        results.put((strategy.name, proven, cone, output.getvalue()))
+
+class Portfolio:
+    """
+    Races differently configured AutoProvers on one goal, each in its own
+    process over a read-only snapshot of the storage. The first to prove
+    the goal wins and the others are terminated; only the facts its proof
+    depends on are merged back into the storage.
+    """
+    GRACE = 5.0  # Seconds past the provers' timeout to wait for their reports
+
+    def __init__(self, storage: SentenceStorage, strategies: Sequence[Strategy] = DEFAULT_STRATEGIES):
+        self.storage = storage
+        self.strategies = list(strategies)
+        self.winner: Optional[str] = None
+        self.output = ""  # What the winning prover printed
+        self.merged = 0  # Facts merged from the winning proof
+
+    def prove(self, goal_str: str, max_rounds: int = 20, timeout: float = 10.0) -> bool:
+        self.winner, self.output, self.merged = None, "", 0
+        directory = tempfile.mkdtemp(prefix="mathai-portfolio-")
+        path = os.path.join(directory, "facts.snap")
+        write_snapshot(path, self.storage)
+        context = multiprocessing.get_context()
+        results = context.Queue()
+        processes = [
+            context.Process(target=_run_strategy, args=(s, path, goal_str, max_rounds, timeout, results), daemon=True)
+            for s in self.strategies
+        ]
+        try:
+            for process in processes:
+                process.start()
+            deadline = time.time() + timeout + self.GRACE
+            for _ in processes:
+                try:
+                    name, proven, cone, output = results.get(timeout=max(0.0, deadline - time.time()))
+                except Empty:
+                    break
+                if proven:
+                    self.winner, self.output = name, output
+                    self._merge(cone)
+                    return True
+            return False
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+            results.close()
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _merge(self, cone: List[Tuple[Node, Provenance]]):
+        # Nodes unpickle into the active table, which may not be this storage's
+        with self.storage.transaction():
+            for node, provenance in cone:
+                node = self.storage.intern(node)
+                if not self.storage.is_proven(node):
+                    self.storage.mark_proven(node, provenance.map_nodes(self.storage.intern))
+                    self.merged += 1
@@ -1,33 +1,64 @@
 import random
 import traceback
 import time
-from typing import List, Set, Dict, Optional
+from itertools import islice
+from typing import Callable, Generator, List, Set, Dict, Optional
 from syntax import (
-    Node, Implies, Forall, NumericVariable, LogicVariable
+    Node, Implies, Forall, LogicVariable, substitute
 )
 from storage import SentenceStorage, Provenance
 from matcher import Matcher
+from unifier import Unifier, rename_apart
+from cache import LRUCache, MISSING
+from agenda import Agenda
+from goal_graph import GoalGraph
+from indexing import DiscriminationTree
+from saturation import GivenClauseSaturation
+from parallel import ParallelForwardChainer
 from inference import ModusPonens, UniversalGeneralization, Substitution
 from parser import Parser
 
 class AutoProver:
     # Limits to prevent infinite loops - VERY STRICT for P->P proof
-    MAX_NEW_GUESSES_PER_ROUND = 20  # Down from 100
-    MAX_TOTAL_GUESSES = 50  # Down from 500
+    EXPANSIONS_PER_ROUND = 50  # Agenda pops per round, before the forward step
+    DEPTH_WEIGHT = 2  # Priority added per backward step from the initial goal
+    INITIAL_DEPTH = 2  # Backward steps allowed in the first round, one more each round after
+    PARALLEL_WORKERS = None  # Processes for the parallel forward strategy; None for one per CPU
+    MEET_BONUS = 3  # Priority taken off an open goal that a new fact nearly reaches (bidirectional mode)
     MAX_GUESSES_PER_IMPLICATION = 3  # Down from 10 - limit guesses per proven implication
+    MAX_CLOSING_CANDIDATES = 20  # Facts tried per premise when closing a backward step
+    MAX_CLOSING_ATTEMPTS = 50  # Unifications tried in all when closing one backward step
+    MAX_CHAINED_IMPLICATIONS = 25  # Smallest implications tried per guess for a one-step proof
+    MATCH_CACHE_SIZE = 200000  # (pattern, target) -> bindings or None
+    INSTANCE_CACHE_SIZE = 50000  # (node, bindings) -> instance
+    GIVEN_PER_ROUND = 200  # Given facts selected per round by the saturation strategy
     
-    def __init__(self, storage: SentenceStorage):
+    def __init__(self, storage: SentenceStorage, heuristic: Optional[Callable[[Node], float]] = None):
         self.storage = storage
+        # Extra agenda priority for a goal on top of its size and depth (lower is better)
+        self.heuristic = heuristic or (lambda goal: 0)
         self.matcher = Matcher()
+        self.unifier = Unifier()
+        self.match_cache = LRUCache(self.MATCH_CACHE_SIZE)
+        self.instance_cache = LRUCache(self.INSTANCE_CACHE_SIZE)
+        # Facts in positions before this mark have been joined with each other by step C
+        self._forward_mark = 0
+        self.saturation: Optional[GivenClauseSaturation] = None  # Created on first use
+        self.parallel: Optional[ParallelForwardChainer] = None  # Created on first use; its close() stops the workers
         self.mp = ModusPonens(storage)
         self.ug = UniversalGeneralization(storage)
         self.subst = Substitution(storage)
         self.parser = Parser(storage)
-        self.guesses: List[Node] = []
-        self.history: Set[Node] = set()
+        self.agenda = Agenda()  # Open goals of the current proof, best first
+        self.graph: Optional[GoalGraph] = None  # Tabled subgoals of the current proof
+        # Bidirectional mode: the open goals by pattern, and how many new facts closed one
+        self.frontier: Optional[DiscriminationTree] = None
+        self._frontier_goals: Set[Node] = set()
+        self.meetings = 0
 
 
-    def prove(self, goal_str: str, max_rounds: int = 20, timeout: float = 10.0, enable_forward: bool = True, verbose: bool = False):
+    def prove(self, goal_str: str, max_rounds: int = 20, timeout: float = 10.0, enable_forward: bool = True, verbose: bool = False,
+              forward_strategy: str = "naive", bidirectional: bool = False):
         """
         Attempt to prove the goal with a timeout failsafe.
         
@@ -37,6 +68,28 @@ class AutoProver:
             timeout: Maximum time in seconds before stopping (default 10)
             enable_forward: Enable forward reasoning (default True). Set to False for backward-only mode.
             verbose: Print detailed progress information (default False)
+            forward_strategy: "naive" joins implications with new facts each round;
+                "saturation" runs GIVEN_PER_ROUND steps of the given-clause loop instead;
+                "parallel" runs the join in PARALLEL_WORKERS processes
+            bidirectional: Check every newly proven fact against the open backward goals,
+                closing those it generalizes and favouring those it nearly reaches
+        """
+        search = self.search(goal_str, max_rounds, timeout, enable_forward, verbose, forward_strategy, bidirectional)
+        while True:
+            try:
+                next(search)
+            except StopIteration as stop:
+                return stop.value
+
+    def search(self, goal_str: str, max_rounds: int = 20, timeout: float = 10.0, enable_forward: bool = True,
+               verbose: bool = False, forward_strategy: str = "naive",
+               bidirectional: bool = False) -> Generator[None, None, bool]:
+        """
+        prove() as a generator: it yields between steps of the search, before
+        each candidate a backward expansion tries, each given fact of the
+        saturation loop and every 100 forward matches, and returns prove()'s
+        result. Closing it early stops the search and drops its
+        watches, so the caller can interleave proofs or abandon one.
         """
         start_time = time.time()
         
@@ -49,23 +102,46 @@ class AutoProver:
         print(f"Goal: {initial_goal}")
         if verbose:
             print(f"Timeout: {timeout} seconds")
-            print(f"Forward reasoning: {'enabled' if enable_forward else 'disabled (backward-only mode)'}")
-        self.guesses = [initial_goal]
-        self.history.add(initial_goal)
-        
+            print(f"Forward reasoning: {forward_strategy if enable_forward else 'disabled (backward-only mode)'}")
+        self.agenda = Agenda()
+        self.graph = GoalGraph(initial_goal)
+        self.agenda.push(initial_goal, self._priority(initial_goal, 0), 0)
+        self.frontier = DiscriminationTree() if bidirectional else None
+        self._frontier_goals = set()
+        self.meetings = 0
+        self._open(initial_goal)
+        unsubscribe = self.storage.subscribe(self._meet) if bidirectional else None
+        try:
+            return (yield from self._search(initial_goal, start_time, max_rounds, timeout, enable_forward, verbose,
+                                            forward_strategy))
+        finally:
+            # A finished proof must not react to facts proven later
+            for formula in self.graph.nodes:
+                self.storage.unwatch(formula, self._close)
+            if unsubscribe is not None:
+                unsubscribe()
+            if verbose and bidirectional:
+                print(f"Bidirectional: {self.meetings} goals closed by new facts")
+
+    def _search(self, initial_goal: Node, start_time: float, max_rounds: int, timeout: float,
+                enable_forward: bool, verbose: bool, forward_strategy: str) -> Generator[None, None, bool]:
         for round_num in range(max_rounds):
+            yield
             # Check timeout
             elapsed = time.time() - start_time
             if elapsed > timeout:
                 print(f"\n⏱️  TIMEOUT after {elapsed:.2f} seconds!")
                 if verbose:
-                    print(f"Stopped at round {round_num + 1} with {len(self.guesses)} guesses")
+                    print(f"Stopped at round {round_num + 1} with {len(self.agenda)} open goals")
                 return False
+
+            # Iterative deepening: each round allows goals one backward step deeper
+            depth_limit = self.INITIAL_DEPTH + round_num
                 
             if verbose:
-                print(f"\n--- Round {round_num + 1} ({len(self.guesses)} guesses) ---")
+                print(f"\n--- Round {round_num + 1} ({len(self.agenda)} open goals, {len(self.graph)} tabled, depth {depth_limit}) ---")
                 print(f"Elapsed: {elapsed:.2f}s")
-                print(f"Guesses: {[str(g) for g in self.guesses]}")
+                print(f"Best goals: {[str(g) for g in self.agenda.best(10)]}")
 
             # 1. Check if GOAL is proven
             if self.storage.is_proven(initial_goal):
@@ -74,204 +150,397 @@ class AutoProver:
                     print(f"Provenance: {self.storage.get_provenance(initial_goal)}")
                 return True
 
-            guesses_to_process = list(self.guesses)
-            self.guesses = [] 
-            
-            next_guesses: List[Node] = []
-            
-            for g in guesses_to_process:
-                if self.storage.is_proven(g):
-                    continue 
-
-                self.guesses.append(g) # Keep unproven guess
-                
-                # A. Direct Inference Check for g
-                if self._check_inference_rules(g):
-                    if verbose:
-                        print(f"  Proven (Inference): {g}")
-                    if g == initial_goal:
-                         print(f"Success! Goal Proven: {initial_goal}")
-                         return True
-                    continue 
-
-                # A2. Match against Proven Facts (Atomic or Implications) directly
-                # If we have proven 'x=x', and goal is '0=0'.
-                candidates = list(self.storage.proven.keys())
-                # print(f" DEBUG: Checking {len(candidates)} proven facts against {g}")
-                for proven in candidates:
-                    # print(f"  matching vs {proven}")
-                    bindings = self.matcher.match(proven, g)
-                    if bindings is not None:
-                        # Proven fact matches Goal!
-                        # Instantiate it.
-                        try:
-                            instantiated = self._instantiate(proven, bindings)
-                            # Mark proven
-                            # Provenance?
-                            parent_prov = self.storage.get_provenance(proven)
-                            new_prov = Provenance(f"Instance of {parent_prov.method}", dependencies=[proven])
-                            self.storage.mark_proven(instantiated, new_prov)
-                            if verbose:
-                                print(f"  Proven (Match): {instantiated}")
-                            if instantiated == initial_goal:
-                                print(f"Success! Goal Proven: {initial_goal}")
-                                return True
-                        except Exception as e:
-                            print(f"Error in atom match: {e}")
-                            traceback.print_exc()
-                            pass
-
-                # B. Backward Strategy: Goal matching Consequent
-                candidates = list(self.storage.proven.keys())
-                guesses_per_implication: Dict[Node, int] = {}
+            # Best-first: expand the cheapest open goals, one at a time
+            retry = []
+            expansions = 0
+            while expansions < self.EXPANSIONS_PER_ROUND:
+                popped = self.agenda.pop()
+                if popped is None:
+                    break
+                g = popped[0]
+                node = self.graph.get(g)
+                budget = depth_limit - node.depth
+                if node.proven or not self.graph.needed(g):
+                    # Pruned: every goal it was guessed for is proven
+                    continue
+                if budget < 0 or self.graph.is_failed(g, budget):
+                    # Past the depth limit, or tabled as failing: wait for a deeper round
+                    retry.append(g)
+                    continue
                 
-                for proven in candidates:
-                    if isinstance(proven, Implies):
-                        # Limit guesses per implication to prevent explosion
-                        if proven not in guesses_per_implication:
-                            guesses_per_implication[proven] = 0
-                        if guesses_per_implication[proven] >= self.MAX_GUESSES_PER_IMPLICATION:
-                            continue
-                            
-                        consequent = proven.right
-                        bindings = self.matcher.match(consequent, g)
-                        if bindings:
-                            try:
-                                instantiated_imp = self._instantiate(proven, bindings)
-                                self.storage.intern(instantiated_imp)
-                                # Mark as proven (Schema instance)
-                                parent_prov = self.storage.get_provenance(proven)
-                                if "Axiom" in parent_prov.method or "Schema" in parent_prov.method:
-                                    # Create new provenance
-                                    # Note: If proven is L1, prov is "Logic Axiom".
-                                    new_prov = Provenance(f"Instance of {parent_prov.method}", dependencies=[proven])
-                                    self.storage.mark_proven(instantiated_imp, new_prov)
-                                    
-                                    antecedent = instantiated_imp.left
-                                    if antecedent not in self.history:
-                                        if verbose:
-                                            print(f"  Guessing {antecedent} (Backward fromImplies {proven})")
-                                        next_guesses.append(antecedent)
-                                        self.history.add(antecedent)
-                                        guesses_per_implication[proven] += 1
-                                        
-                                elif self.storage.is_proven(proven): 
-                                    if not bindings: # This condition seems incorrect, bindings should be used for instantiation
-                                        antecedent = proven.left
-                                        if antecedent not in self.history:
-                                            if verbose:
-                                                print(f"  Guessing {antecedent} (Backward fromImplies {proven})")
-                                            next_guesses.append(antecedent)
-                                            self.history.add(antecedent)
-                                            guesses_per_implication[proven] += 1
-                            except Exception as e:
-                                pass
-
+                # Backward steps can be expensive, so check the timeout per goal too
+                yield
+                elapsed = time.time() - start_time
+                if elapsed > timeout:
+                    print(f"\n⏱️  TIMEOUT after {elapsed:.2f} seconds!")
+                    return False
 
+                expansions += 1
+                if (yield from self._expand(g, budget, verbose)):
+                    # Its watch has closed it, and whatever waited on it
+                    if self.storage.is_proven(initial_goal):
+                        print(f"Success! Goal Proven: {initial_goal}")
+                        return True
+                else:
+                    self.graph.expanded(g, budget)
+                    # Facts derived later may still prove it directly
+                    retry.append(g)
 
             # C. Forward Strategy: Pattern matching and substitution (skip if backward-only mode)
-            if enable_forward:
-                proven_facts = list(self.storage.proven.keys())
-                proven_implications = [p for p in proven_facts if isinstance(p, Implies)]
+            if enable_forward and forward_strategy == "saturation":
+                if self.saturation is None:
+                    self.saturation = GivenClauseSaturation(self.storage)
+                if (yield from self.saturation.steps(initial_goal, max_given=self.GIVEN_PER_ROUND,
+                                                     deadline=start_time + timeout)):
+                    print(f"Success! Goal Proven: {initial_goal}")
+                    return True
+                if verbose:
+                    print(f"Saturation: {self.saturation.stats()}")
+            elif enable_forward:
+                fact_count = len(self.storage.proven)
+                
+                if forward_strategy == "parallel":
+                    # Worker processes match; only the successful matches come back
+                    if self.parallel is None:
+                        self.parallel = ParallelForwardChainer(self.storage, self.PARALLEL_WORKERS)
+                    matches = self.parallel.matches(self._forward_mark, fact_count)
+                else:
+                    # Try to match the implication's antecedent against the fact
+                    # If imp is P->Q and fact is R, check if there's a substitution S such that P[S] = R
+                    matches = ((imp, fact, self._match(imp.left, fact))
+                               for imp, fact in self._forward_pairs(self._forward_mark, fact_count))
                 
                 iteration_count = 0
-                for imp in proven_implications:
-                    for fact in proven_facts:
+                try:
+                    for imp, fact, bindings in matches:
                         # Periodic timeout check (every 100 iterations to reduce overhead)
                         iteration_count += 1
                         if iteration_count % 100 == 0:
+                            yield
                             elapsed = time.time() - start_time
                             if elapsed > timeout:
                                 print(f"\n⏱️  TIMEOUT after {elapsed:.2f} seconds during forward reasoning!")
                                 print(f"Stopped after {iteration_count} forward reasoning iterations")
                                 return False
-                        
-                        # Try to match the implication's antecedent against the fact
-                        # If imp is P->Q and fact is R, check if there's a substitution S such that P[S] = R
-                        bindings = self.matcher.match(imp.left, fact)
+
                         if bindings is not None:
                             try:
                                 # Apply substitution to the entire implication to get P[S]->Q[S]
-                                substituted_imp = self.subst.apply(imp, bindings)
-                                
+                                key = (imp, tuple(bindings.items()))
+                                substituted_imp = self.instance_cache.get(key)
+                                if substituted_imp is MISSING or not self.storage.is_proven(substituted_imp):
+                                    substituted_imp = self.subst.apply(imp, bindings)
+                                    self.instance_cache.put(key, substituted_imp)
+                                elif self.storage.is_proven(substituted_imp.right):
+                                    # Already derived from another fact
+                                    continue
+
                                 # Now apply modus ponens: we have P[S]->Q[S] and P[S] (which is fact)
                                 # The antecedent should match exactly
                                 if substituted_imp.left == fact:
                                     consequent = self.mp.apply(substituted_imp, fact)
                                     if verbose:
                                         print(f"  Forward Derived: {consequent} (from {imp} + {fact})")
-                                    if consequent == initial_goal:
+                                    # Directly, or through the goals whose watches it woke
+                                    if self.storage.is_proven(initial_goal):
                                         print(f"Success! Goal Proven: {initial_goal}")
                                         return True
-                                
+
                             except Exception as e:
                                 # Substitution or MP might fail, just continue
                                 pass
+                finally:
+                    # Also when the caller closes the search mid-join
+                    matches.close()
+                # Every pair among the facts proven so far has been tried
+                self._forward_mark = fact_count
 
-            # Sample next_guesses with bias towards simpler expressions
-            if len(next_guesses) > self.MAX_NEW_GUESSES_PER_ROUND:
-                next_guesses = self._sample_by_complexity(next_guesses, self.MAX_NEW_GUESSES_PER_ROUND)
-            self.guesses.extend(next_guesses)
-            
-            # Limit total guesses with bias towards simpler expressions
-            if len(self.guesses) > self.MAX_TOTAL_GUESSES:
-                self.guesses = self._sample_by_complexity(self.guesses, self.MAX_TOTAL_GUESSES)
+            for g in retry:
+                node = self.graph.get(g)
+                self.agenda.push(g, self._priority(g, node.depth), node.depth)
 
         print("Max rounds reached. Failed to prove.")
         return False
 
     def _expression_complexity(self, node: Node) -> int:
         """Calculate complexity score for an expression (lower is better)"""
-        if isinstance(node, (NumericVariable, LogicVariable)):
-            return 1
-        elif isinstance(node, Implies):
-            return 1 + self._expression_complexity(node.left) + self._expression_complexity(node.right)
-        elif isinstance(node, Forall):
-            return 1 + self._expression_complexity(node.sentence)
-        else:
-            # For other node types, count recursively if possible
-            complexity = 1
-            # Try to get children if the node has them
-            if hasattr(node, 'left') and hasattr(node, 'right'):
-                complexity += self._expression_complexity(node.left)
-                complexity += self._expression_complexity(node.right)
-            elif hasattr(node, 'sentence'):
-                complexity += self._expression_complexity(node.sentence)
-            return complexity
-    
-    def _sample_by_complexity(self, guesses: List[Node], max_count: int) -> List[Node]:
-        """Sample guesses, biasing towards simpler expressions"""
-        if len(guesses) <= max_count:
-            return guesses
-        
-        # Score all guesses
-        scored = [(g, self._expression_complexity(g)) for g in guesses]
-        # Sort by complexity (lower is better)
-        scored.sort(key=lambda x: x[1])
-        
-        # Take the simplest ones
-        return [g for g, _ in scored[:max_count]]
-    
+        # Node size is computed once at construction, so scoring is O(1).
+        return node.size
+
+    def _priority(self, goal: Node, depth: int) -> float:
+        """Agenda priority of a goal guessed depth steps below the initial goal (lower is better)."""
+        return self._expression_complexity(goal) + self.DEPTH_WEIGHT * depth + self.heuristic(goal)
+
+    def _expand(self, g: Node, budget: int, verbose: bool = False) -> Generator[None, None, bool]:
+        """
+        One best-first step: tries to prove g directly (steps A, A2 and a
+        one-step backward chain), and otherwise, with budget steps left,
+        records the implications concluding g as alternatives in the goal
+        graph and pushes their open premises. Returns True if g is proven;
+        yields before each candidate fact or implication, like search().
+        """
+        # A. Direct Inference Check for g
+        if self._check_inference_rules(g):
+            if verbose:
+                print(f"  Proven (Inference): {g}")
+            return True
+
+        # A2. Match against Proven Facts (Atomic or Implications) directly
+        # If we have proven 'x=x', and goal is '0=0'.
+        # The discrimination tree only returns facts that can match g.
+        candidates = self.storage.generalizations(g)
+        # print(f" DEBUG: Checking {len(candidates)} proven facts against {g}")
+        for proven in candidates:
+            yield
+            # print(f"  matching vs {proven}")
+            bindings = self._match(proven, g)
+            if bindings is not None:
+                # Proven fact matches Goal!
+                # Instantiate it.
+                try:
+                    instantiated = self._instantiate(proven, bindings)
+                    # Mark proven
+                    # Provenance?
+                    parent_prov = self.storage.get_provenance(proven)
+                    new_prov = Provenance.instance_of(parent_prov, [proven])
+                    self.storage.mark_proven(instantiated, new_prov)
+                    if verbose:
+                        print(f"  Proven (Match): {instantiated}")
+                except Exception as e:
+                    print(f"Error in atom match: {e}")
+                    traceback.print_exc()
+                    pass
+
+        if self.storage.is_proven(g):
+            return True
+
+        # B. Backward Strategy: unify the goal with a consequent of a proven implication
+        # The goal's own variables are rigid: it must be proven as stated.
+        candidates = self.storage.implications_concluding(g)
+        # Closing premises is costly, so only the smallest implications try it
+        closed_by = None
+        for proven in sorted(candidates, key=lambda imp: imp.size)[:self.MAX_CHAINED_IMPLICATIONS]:
+            yield
+            try:
+                # Standardize apart, so the implication's leftover variables stay its own
+                if self._backward_chain(rename_apart(proven, g.free_variables), proven, g):
+                    closed_by = proven
+                    break
+            except Exception as e:
+                pass
+        if closed_by is not None:
+            if verbose:
+                print(f"  Proven (Backward from {closed_by}): {g}")
+            return True
+
+        if budget == 0:
+            return False
+        node = self.graph.get(g)
+        guesses_per_implication: Dict[Node, int] = {}
+        for proven in candidates:
+            yield
+            # Limit guesses per implication to prevent explosion
+            if guesses_per_implication.get(proven, 0) >= self.MAX_GUESSES_PER_IMPLICATION:
+                continue
+            parent_prov = self.storage.get_provenance(proven)
+            if "Axiom" not in parent_prov.method and "Schema" not in parent_prov.method:
+                continue
+            try:
+                renamed = rename_apart(proven, g.free_variables)
+                # Any consequent of a curried implication may conclude g; all premises before it are needed
+                consequent = renamed
+                arity = 0
+                while isinstance(consequent, Implies):
+                    consequent = consequent.right
+                    arity += 1
+                    bindings = self.unifier.unify(consequent, g, g.free_variables)
+                    if bindings is None:
+                        continue
+                    # Most general instance concluding g: guess its premises
+                    instantiated_imp = self._instantiate(renamed, bindings)
+                    premises = []
+                    rest = instantiated_imp
+                    for _ in range(arity):
+                        premises.append(rest.left)
+                        rest = rest.right
+                    # A premise that is g itself, or any sentence at all, is no progress
+                    if any(p is g or p.tag == LogicVariable.tag and p.name not in g.free_variables for p in premises):
+                        continue
+                    self.storage.mark_proven(instantiated_imp, Provenance.instance_of(parent_prov, [proven]))
+                    alternative = self.graph.add_alternative(node, instantiated_imp, premises)
+                    if alternative is None:
+                        continue
+                    guesses_per_implication[proven] = guesses_per_implication.get(proven, 0) + 1
+                    if verbose:
+                        print(f"  Guessing {', '.join(str(p) for p in premises)} (Backward from Implies {proven})")
+                    for premise in alternative.premises:
+                        self._open(premise.formula)
+                        if not premise.proven and not self.graph.is_failed(premise.formula, budget - 1):
+                            self.agenda.push(premise.formula, self._priority(premise.formula, premise.depth), premise.depth)
+                    if node.proven:
+                        return True
+            except Exception as e:
+                pass
+
+        return False
+
+    def _open(self, goal: Node):
+        # Open goals are closed the moment their fact is proven, by any step (right away if it is)
+        self.storage.watch(goal, self._close)
+        if self.frontier is not None and goal not in self._frontier_goals and not self.graph.get(goal).proven:
+            self._frontier_goals.add(goal)
+            self.frontier.insert(goal, goal)
+
+    def _meet(self, fact: Node):
+        """
+        Storage subscriber in bidirectional mode: a new fact that generalizes
+        an open goal proves it as an instance, so forward and backward search
+        meet without either reaching the other's end. Open goals the fact
+        may only unify with are moved up the agenda by MEET_BONUS.
+        """
+        # Goal variables are wildcards in the tree, so this also finds the near misses
+        for goal in self.frontier.candidates(fact, fact.free_variables):
+            node = self.graph.get(goal)
+            # Proven already, possibly by an earlier fact whose event is still queued
+            if goal is fact or self.storage.is_proven(goal):
+                continue
+            if self._match(fact, goal) is not None:
+                self.meetings += 1
+                self.storage.mark_proven(goal, Provenance.instance_of(self.storage.get_provenance(fact), [fact]))
+            elif goal in self.agenda:
+                self.agenda.push(goal, self._priority(goal, node.depth) - self.MEET_BONUS, node.depth)
+
+    def _close(self, goal: Node):
+        """
+        Watch callback for a goal of the graph, called once it is proven:
+        proves, by modus ponens, every goal that now has an alternative with
+        all premises proven. Those facts wake their own watches in turn.
+        """
+        for alternative in self.graph.close(goal):
+            instance = alternative.implication
+            for premise in alternative.premises:
+                instance = self.mp.apply(instance, premise.formula)
+            self.agenda.discard(alternative.goal.formula)
+        self.agenda.discard(goal)
+
+    def _forward_pairs(self, start: int, stop: int):
+        """
+        Semi-naive join for step C: every implication proven before stop
+        against the facts proven in [start, stop), then each of those new
+        implications against the older facts. With start at the previous
+        round's stop, each (implication, fact) pair is tried exactly once
+        across rounds, and only pairs the feature filter admits are yielded.
+        """
+        for imp in self.storage.facts_by_head(Implies):
+            for fact in self.storage.instances_of(imp.left, limit=stop, start=start):
+                yield imp, fact
+        for imp in self.storage.facts_since(start, stop):
+            if isinstance(imp, Implies):
+                for fact in self.storage.instances_of(imp.left, limit=start):
+                    yield imp, fact
+
+    def cache_stats(self) -> Dict[str, dict]:
+        """Size, hit, miss and eviction counts of the prover's memo caches."""
+        return {
+            "match": self.match_cache.stats(),
+            "instance": self.instance_cache.stats(),
+            "compiled": self.matcher._compiled.stats(),
+        }
+
+    def _match(self, pattern: Node, target: Node) -> Optional[Dict[str, Node]]:
+        # Memoized Matcher.match; the bindings are shared, so callers must not mutate them.
+        key = (pattern, target)
+        bindings = self.match_cache.get(key)
+        if bindings is MISSING:
+            bindings = self.matcher.match(pattern, target)
+            self.match_cache.put(key, bindings)
+        return bindings
+
     def _instantiate(self, node: Node, bindings: Dict[str, Node]) -> Node:
-        # Helper to perform potentially multiple substitutions
-        # This is simple sequential substitution.
-        # Ideally simultaneous?
-        # For our L1-L3 schemas, vars are distinct.
-        current = node
-        for name, repl in bindings.items():
-            current = current.substitute(name, repl)
-        return self.storage.intern(current)
+        # Simultaneous substitution: one pass, no capture between bindings.
+        # Bindings for one pattern come out in one order, so a tuple is a cheap key;
+        # a different order only costs a miss.
+        key = (node, tuple(bindings.items()))
+        instance = self.instance_cache.get(key)
+        if instance is MISSING:
+            instance = self.storage.intern(substitute(node, bindings))
+            self.instance_cache.put(key, instance)
+        return instance
             
+    def _backward_chain(self, implication: Implies, proven: Implies, goal: Node) -> bool:
+        """
+        Proves goal in one step from a curried implication A1→(...→(An→C)),
+        renamed apart from goal, if C unifies with goal and every premise
+        Ai then unifies with some proven fact. The unifier threads through
+        the premises, so a variable left open by C (like B in L2) is bound
+        by whichever fact closes its premise first.
+        """
+        rigid = goal.free_variables
+        self._closing_budget = self.MAX_CLOSING_ATTEMPTS
+        premises = []
+        consequent = implication
+        while isinstance(consequent, Implies):
+            premises.append(consequent.left)
+            consequent = consequent.right
+            bindings = self.unifier.unify(consequent, goal, rigid)
+            if bindings is None:
+                continue
+            closed = self._close_premises(premises, bindings, rigid, set(implication.free_variables) | rigid)
+            if closed is None:
+                continue
+            bindings, used = closed
+            # Replay the step: instances of the implication and the facts, then modus ponens
+            instance = self._instantiate(implication, bindings)
+            self.storage.mark_proven(instance, Provenance.instance_of(self.storage.get_provenance(proven), [proven]))
+            for fact, renamed in used:
+                self.storage.mark_proven(
+                    self._instantiate(renamed, bindings),
+                    Provenance.instance_of(self.storage.get_provenance(fact), [fact])
+                )
+            for premise in premises:
+                instance = self.mp.apply(instance, self._instantiate(premise, bindings))
+            return True
+        return False
+
+    def _close_premises(self, premises: List[Node], bindings: Dict[str, Node], rigid, taken: Set[str]):
+        """
+        Depth-first search for proven facts unifying with every premise under
+        one substitution, within the step's budget of unifications. Returns
+        the substitution and the (fact, renamed fact) pairs used, or None.
+        """
+        if not premises:
+            return bindings, []
+        premise = substitute(premises[0], bindings)
+        flexible = premise.free_variables - rigid
+        if isinstance(premise, LogicVariable) and premise.name in flexible:
+            # Any proven fact will do; skip walking the whole tree
+            candidates = list(islice(self.storage.proven, self.MAX_CLOSING_CANDIDATES))
+        else:
+            candidates = self.storage.unifiable_facts(premise, flexible)[:self.MAX_CLOSING_CANDIDATES]
+        for fact in candidates:
+            if self._closing_budget <= 0:
+                return None
+            self._closing_budget -= 1
+            renamed = rename_apart(fact, taken)
+            extended = self.unifier.unify(renamed, premise, rigid, bindings)
+            if extended is None:
+                continue
+            rest = self._close_premises(
+                premises[1:], extended, rigid,
+                taken.union(renamed.free_variables, *(t.free_variables for t in extended.values()))
+            )
+            if rest is not None:
+                return rest[0], [(fact, renamed)] + rest[1]
+        return None
+
     def _check_inference_rules(self, goal: Node) -> bool:
         # Modus Ponens Check:
         # Do we have P->Goal proven?
-        for proven in self.storage.proven.keys():
-            if isinstance(proven, Implies):
-                if proven.right == goal:
-                    antecedent = proven.left
-                    if self.storage.is_proven(antecedent):
-                        self.mp.apply(proven, antecedent)
-                        return True
+        for proven in self.storage.implications_by_consequent(goal):
+            antecedent = proven.left
+            if self.storage.is_proven(antecedent):
+                self.mp.apply(proven, antecedent)
+                return True
         
         # Universal Gen Check:
         if isinstance(goal, Forall):
@@ -0,0 +1,165 @@
+import heapq
+import time
+from collections import deque
+from typing import Callable, Dict, Generator, List, Optional
+from syntax import Node, Implies, substitute
+from storage import SentenceStorage
+from matcher import Matcher
+from indexing import DiscriminationTree, FeatureIndex
+from inference import ModusPonens, Substitution
+
+class GivenClauseSaturation:
+    """
+    Otter-style given-clause loop over the proven facts of a storage.
+
+    Facts wait in the passive set until selected as the "given" fact. Most
+    picks take the lightest passive fact (by weight, then age); every
+    (pick_given_ratio + 1)-th pick takes the oldest instead, so heavy facts
+    are not starved. The given fact joins the active set and is combined
+    with every active fact, itself included, by instantiation and modus
+    ponens: as an implication against the active facts its antecedent
+    matches, and as a fact against the active implications whose antecedent
+    matches it.
+
+    A derived fact is retained (proven and made passive) only if it is new
+    and no proven fact generalizes it (forward subsumption). Facts proven by
+    others, such as the backward steps of AutoProver, are picked up by sync().
+    """
+    def __init__(self, storage: SentenceStorage, pick_given_ratio: int = 4,
+                 weight: Optional[Callable[[Node], int]] = None):
+        self.storage = storage
+        self.pick_given_ratio = pick_given_ratio
+        self.weight = weight or (lambda node: node.size)
+        self.matcher = Matcher()
+        self.mp = ModusPonens(storage)
+        self.subst = Substitution(storage)
+        # Passive set: a heap by (weight, age) and a queue by age, with lazy deletion
+        self._by_weight: list = []
+        self._by_age: deque = deque()
+        self._age = 0
+        self._passive = 0
+        self._picks = 0
+        # Active set: its facts by feature vector, its implications by antecedent
+        self.active: List[Node] = []
+        self._active_facts = FeatureIndex()
+        self._active_antecedents = DiscriminationTree()
+        self._active_set: set = set()
+        self._seen: set = set()  # Every fact queued, subsumed or produced as an instance
+        self._synced = 0  # Storage position up to which proven facts have been considered
+        self.counters: Dict[str, int] = {
+            "given": 0, "generated": 0, "retained": 0, "subsumed": 0, "duplicates": 0,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Counters plus the current sizes of the active and passive sets."""
+        return {**self.counters, "active": len(self.active), "passive": self._passive}
+
+    def sync(self):
+        """Queues the facts proven in storage since the last sync, unless subsumed."""
+        stop = len(self.storage.proven)
+        for node in self.storage.facts_since(self._synced, stop):
+            if node in self._seen:
+                continue
+            self._seen.add(node)
+            if self._subsumed(node):
+                self.counters["subsumed"] += 1
+            else:
+                self._push(node)
+        self._synced = stop
+
+    def run(self, goal: Optional[Node] = None, max_given: Optional[int] = None,
+            deadline: Optional[float] = None) -> bool:
+        """
+        Selects given facts until goal is proven (returns True), the passive
+        set is empty, max_given facts were selected, or time passes deadline.
+        """
+        steps = self.steps(goal, max_given, deadline)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+    def steps(self, goal: Optional[Node] = None, max_given: Optional[int] = None,
+              deadline: Optional[float] = None) -> Generator[None, None, bool]:
+        """run() as a generator that yields before each given fact, and returns run()'s result."""
+        self.sync()
+        selected = 0
+        while max_given is None or selected < max_given:
+            if goal is not None and self.storage.is_proven(goal):
+                return True
+            yield
+            if deadline is not None and time.time() > deadline:
+                break
+            given = self._select()
+            if given is None:
+                break
+            selected += 1
+            self._activate(given)
+            self.sync()
+        return goal is not None and self.storage.is_proven(goal)
+
+    def _push(self, node: Node):
+        self._age += 1
+        self._passive += 1
+        heapq.heappush(self._by_weight, (self.weight(node), self._age, node))
+        self._by_age.append(node)
+
+    def _select(self) -> Optional[Node]:
+        self._picks += 1
+        by_age = self._picks % (self.pick_given_ratio + 1) == 0
+        while True:
+            if by_age:
+                if not self._by_age:
+                    return None
+                node = self._by_age.popleft()
+            else:
+                if not self._by_weight:
+                    return None
+                node = heapq.heappop(self._by_weight)[2]
+            # Each fact sits in both queues; skip the copy of one already selected
+            if node not in self._active_set:
+                self._passive -= 1
+                return node
+
+    def _activate(self, given: Node):
+        self.counters["given"] += 1
+        self.active.append(given)
+        self._active_set.add(given)
+        self._active_facts.add(given)
+        if isinstance(given, Implies):
+            self._active_antecedents.insert(given.left, given)
+            for fact in self._active_facts.instances(given.left):
+                self._combine(given, fact)
+        for imp in self._active_antecedents.candidates(given):
+            if imp is not given:
+                self._combine(imp, given)
+
+    def _combine(self, imp: Implies, fact: Node):
+        bindings = self.matcher.match(imp.left, fact)
+        if bindings is None:
+            return
+        self.counters["generated"] += 1
+        # Most consequents are dropped, so the whole instance is only built for the rest
+        consequent = self.storage.intern(substitute(imp.right, bindings))
+        if consequent in self._seen or self.storage.is_proven(consequent):
+            self.counters["duplicates"] += 1
+            return
+        self._seen.add(consequent)
+        if self._subsumed(consequent):
+            self.counters["subsumed"] += 1
+            return
+        # The instance is subsumed by imp, so it is proven but never queued
+        instance = self.subst.apply(imp, bindings)
+        self._seen.add(instance)
+        self.mp.apply(instance, fact)
+        self.counters["retained"] += 1
+        self._push(consequent)
+
+    def _subsumed(self, node: Node) -> bool:
+        """True if another proven fact generalizes node."""
+        # Plain tree candidates: a compiled match rejects faster than the feature check
+        for general in self.storage.unifiable_facts(node, frozenset()):
+            if general is not node and self.matcher.match(general, node) is not None:
+                return True
+        return False
@@ -1,6 +1,6 @@
 from syntax import (
     NumericVariable, LogicExpression, NumericExpression,
-    Implies, Forall, Successor, Zero, Equals,
+    Implies, Forall, Successor, Zero, Equals, substitute,
 )
 from storage import SentenceStorage, Provenance
 import copy
@@ -18,27 +18,27 @@ class InductionSchema:
         # Note: predicate should structurally be a valid LogicExpression
         
         # P[x/0]
-        base_case_expr = predicate.substitute(var.name, Zero())
+        base_case_expr = substitute(predicate, {var.name: Zero.make()})
         base_case = self.storage.intern(base_case_expr)
         
         # P[x/S(x)]
-        succ_x = Successor(var)
-        inductive_step_expr = predicate.substitute(var.name, succ_x)
+        succ_x = Successor.make(var)
+        inductive_step_expr = substitute(predicate, {var.name: succ_x})
         
         # P -> P[x/S(x)]
-        inductive_implication = self.storage.intern(Implies(predicate, inductive_step_expr))
+        inductive_implication = self.storage.intern(Implies.make(predicate, inductive_step_expr))
         
         # forall x (P -> P[x/S(x)])
-        quantified_step = self.storage.intern(Forall(var, inductive_implication))
+        quantified_step = self.storage.intern(Forall.make(var, inductive_implication))
         
         # forall x P
-        conclusion = self.storage.intern(Forall(var, predicate))
+        conclusion = self.storage.intern(Forall.make(var, predicate))
         
         # (forall x (P -> ...)) -> forall x P
-        step_to_conclusion = self.storage.intern(Implies(quantified_step, conclusion))
+        step_to_conclusion = self.storage.intern(Implies.make(quantified_step, conclusion))
         
         # Final Axiom
-        axiom = self.storage.intern(Implies(base_case, step_to_conclusion))
+        axiom = self.storage.intern(Implies.make(base_case, step_to_conclusion))
         
         # Register Provenance
         provenance = Provenance("Induction Schema", dependencies=[], metadata={
@@ -61,14 +61,14 @@ class InstantiationSchema:
              raise TypeError(f"Replacement must be numeric, got {replacement}")
              
         # forall x (P)
-        quantified = self.storage.intern(Forall(var, predicate))
+        quantified = self.storage.intern(Forall.make(var, predicate))
         
         # P[x/e]
-        substituted_expr = predicate.substitute(var.name, replacement)
+        substituted_expr = substitute(predicate, {var.name: replacement})
         substituted = self.storage.intern(substituted_expr)
         
         # Axiom
-        axiom = self.storage.intern(Implies(quantified, substituted))
+        axiom = self.storage.intern(Implies.make(quantified, substituted))
         
         provenance = Provenance("Instantiation Schema", dependencies=[], metadata={
             "var": var,
@@ -90,10 +90,10 @@ class VacuousGeneralizationSchema:
             raise ValueError(f"Variable {var.name} is free in P, cannot apply Vacuous Generalization.")
         
         # forall x (P)
-        quantified = self.storage.intern(Forall(var, predicate))
+        quantified = self.storage.intern(Forall.make(var, predicate))
         
         # P -> forall x (P)
-        axiom = self.storage.intern(Implies(predicate, quantified))
+        axiom = self.storage.intern(Implies.make(predicate, quantified))
         
         provenance = Provenance("Vacuous Generalization Schema", dependencies=[], metadata={
             "var": var,
@@ -111,16 +111,16 @@ class DistributionSchema:
         forall x(P->Q) -> (forall x(P) -> forall x(Q))
         """
         # forall x(P->Q)
-        p_implies_q = self.storage.intern(Implies(P, Q))
-        quantified_implication = self.storage.intern(Forall(var, p_implies_q))
+        p_implies_q = self.storage.intern(Implies.make(P, Q))
+        quantified_implication = self.storage.intern(Forall.make(var, p_implies_q))
         
         # forall x(P) -> forall x(Q)
-        forall_p = self.storage.intern(Forall(var, P))
-        forall_q = self.storage.intern(Forall(var, Q))
-        conclusion = self.storage.intern(Implies(forall_p, forall_q))
+        forall_p = self.storage.intern(Forall.make(var, P))
+        forall_q = self.storage.intern(Forall.make(var, Q))
+        conclusion = self.storage.intern(Implies.make(forall_p, forall_q))
         
         # Axiom
-        axiom = self.storage.intern(Implies(quantified_implication, conclusion))
+        axiom = self.storage.intern(Implies.make(quantified_implication, conclusion))
         
         provenance = Provenance("Distribution Schema", dependencies=[], metadata={
             "var": var,
@@ -139,17 +139,17 @@ class IndiscernabilitySchema:
         x=y -> P -> P[x/y]
         """
         # x=y
-        eq = self.storage.intern(Equals(x, y))
+        eq = self.storage.intern(Equals.make(x, y))
         
         # P[x/y]
-        substituted_expr = P.substitute(x.name, y)
+        substituted_expr = substitute(P, {x.name: y})
         substituted = self.storage.intern(substituted_expr)
         
         # P -> P[x/y]
-        implication = self.storage.intern(Implies(P, substituted))
+        implication = self.storage.intern(Implies.make(P, substituted))
         
         # Axiom
-        axiom = self.storage.intern(Implies(eq, implication))
+        axiom = self.storage.intern(Implies.make(eq, implication))
         
         provenance = Provenance("Indiscernability Schema", dependencies=[], metadata={
             "x": x,
@@ -171,19 +171,19 @@ class InstantiationSchema:
              raise TypeError(f"Replacement must be numeric, got {replacement}")
              
         # forall x (P)
-        quantified = self.storage.intern(Forall(var, predicate))
+        quantified = self.storage.intern(Forall.make(var, predicate))
         
         # P[x/e]
-        substituted_expr = predicate.substitute(var.name, replacement)
+        substituted_expr = substitute(predicate, {var.name: replacement})
         substituted = self.storage.intern(substituted_expr)
         
         # Axiom
-        axiom = self.storage.intern(Implies(quantified, substituted))
+        axiom = self.storage.intern(Implies.make(quantified, substituted))
         
         provenance = Provenance("Instantiation Schema", dependencies=[], metadata={
-            "var": str(var),
-            "predicate": str(predicate),
-            "replacement": str(replacement)
+            "var": var,
+            "predicate": predicate,
+            "replacement": replacement
         })
         self.storage.mark_proven(axiom, provenance)
         return axiom
@@ -200,14 +200,14 @@ class VacuousGeneralizationSchema:
             raise ValueError(f"Variable {var.name} is free in P, cannot apply Vacuous Generalization.")
         
         # forall x (P)
-        quantified = self.storage.intern(Forall(var, predicate))
+        quantified = self.storage.intern(Forall.make(var, predicate))
         
         # P -> forall x (P)
-        axiom = self.storage.intern(Implies(predicate, quantified))
+        axiom = self.storage.intern(Implies.make(predicate, quantified))
         
         provenance = Provenance("Vacuous Generalization Schema", dependencies=[], metadata={
-            "var": str(var),
-            "predicate": str(predicate)
+            "var": var,
+            "predicate": predicate
         })
         self.storage.mark_proven(axiom, provenance)
         return axiom
@@ -221,21 +221,21 @@ class DistributionSchema:
         forall x(P->Q) -> (forall x(P) -> forall x(Q))
         """
         # forall x(P->Q)
-        p_implies_q = self.storage.intern(Implies(P, Q))
-        quantified_implication = self.storage.intern(Forall(var, p_implies_q))
+        p_implies_q = self.storage.intern(Implies.make(P, Q))
+        quantified_implication = self.storage.intern(Forall.make(var, p_implies_q))
         
         # forall x(P) -> forall x(Q)
-        forall_p = self.storage.intern(Forall(var, P))
-        forall_q = self.storage.intern(Forall(var, Q))
-        conclusion = self.storage.intern(Implies(forall_p, forall_q))
+        forall_p = self.storage.intern(Forall.make(var, P))
+        forall_q = self.storage.intern(Forall.make(var, Q))
+        conclusion = self.storage.intern(Implies.make(forall_p, forall_q))
         
         # Axiom
-        axiom = self.storage.intern(Implies(quantified_implication, conclusion))
+        axiom = self.storage.intern(Implies.make(quantified_implication, conclusion))
         
         provenance = Provenance("Distribution Schema", dependencies=[], metadata={
-            "var": str(var),
-            "P": str(P),
-            "Q": str(Q)
+            "var": var,
+            "P": P,
+            "Q": Q
         })
         self.storage.mark_proven(axiom, provenance)
         return axiom
@@ -249,22 +249,22 @@ class IndiscernabilitySchema:
         x=y -> P -> P[x/y]
         """
         # x=y
-        eq = self.storage.intern(Equals(x, y))
+        eq = self.storage.intern(Equals.make(x, y))
         
         # P[x/y]
-        substituted_expr = P.substitute(x.name, y)
+        substituted_expr = substitute(P, {x.name: y})
         substituted = self.storage.intern(substituted_expr)
         
         # P -> P[x/y]
-        implication = self.storage.intern(Implies(P, substituted))
+        implication = self.storage.intern(Implies.make(P, substituted))
         
         # Axiom
-        axiom = self.storage.intern(Implies(eq, implication))
+        axiom = self.storage.intern(Implies.make(eq, implication))
         
         provenance = Provenance("Indiscernability Schema", dependencies=[], metadata={
-            "x": str(x),
-            "y": str(y),
-            "P": str(P)
+            "x": x,
+            "y": y,
+            "P": P
         })
         self.storage.mark_proven(axiom, provenance)
         return axiom
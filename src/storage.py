@@ -1,36 +1,237 @@
 import pickle
 import os
-from typing import Optional
-from syntax import Node
+import io
+import sys
+import mmap
+import struct
+import sqlite3
+from array import array
+from contextlib import contextmanager, nullcontext
+from collections import deque
+from collections.abc import Mapping
+from typing import Optional, Iterable, List, Callable
+from syntax import Node, UniqueTable, Implies, Forall, TAG_CLASSES
+from indexing import DiscriminationTree, FeatureIndex
+
+class Bindings(tuple):
+    """
+    Variable bindings as a tuple of (name, node) pairs. Prints like the
+    {name: 'node'} dict of rendered strings it replaces.
+    """
+    __slots__ = ()
+
+    def __new__(cls, bindings=()):
+        items = bindings.items() if isinstance(bindings, dict) else bindings
+        return super().__new__(cls, ((sys.intern(k), v) for k, v in items))
+
+    def __str__(self):
+        return str({k: str(v) for k, v in self})
+
+    __repr__ = __str__
+
+    def __reduce__(self):
+        return (Bindings, (tuple(self),))
 
 class Provenance:
-    def __init__(self, method: str, dependencies: list[Node] = None, metadata: dict = None):
-        self.method = method
-        self.dependencies = dependencies if dependencies is not None else []
-        self.metadata = metadata if metadata is not None else {}
+    """
+    Why a sentence is proven, as a compact immutable record: an interned
+    method code, a tuple of dependency nodes (interned nodes are their own
+    ids) and a tuple of (key, value) bindings. Records without dependencies
+    or bindings, such as Provenance("Peano Axiom"), are shared flyweights.
+    """
+    __slots__ = ('code', 'deps', 'bindings')
+    _methods: List[str] = []            # code -> method name
+    _codes: dict[str, int] = {}         # method name -> code
+    _instance_codes: dict[int, int] = {}  # code -> code of "Instance of <method>"
+    _flyweights: dict[int, 'Provenance'] = {}
+
+    def __new__(cls, method: str = None, dependencies: Iterable[Node] = None, metadata: dict = None):
+        if method is None:
+            # Unpickling: __setstate__ fills the slots in
+            return super().__new__(cls)
+        return cls._from_code(cls.method_code(method), dependencies, metadata)
+
+    @classmethod
+    def _from_code(cls, code: int, dependencies: Iterable[Node] = None, metadata: dict = None) -> 'Provenance':
+        deps = tuple(dependencies) if dependencies else ()
+        bindings = tuple((sys.intern(k), v) for k, v in metadata.items()) if metadata else ()
+        if not deps and not bindings:
+            shared = cls._flyweights.get(code)
+            if shared is not None:
+                return shared
+        record = super().__new__(cls)
+        record.code = code
+        record.deps = deps
+        record.bindings = bindings
+        if not deps and not bindings:
+            cls._flyweights[code] = record
+        return record
+
+    @classmethod
+    def method_code(cls, method: str) -> int:
+        code = cls._codes.get(method)
+        if code is None:
+            code = cls._codes[method] = len(cls._methods)
+            cls._methods.append(method)
+        return code
+
+    @classmethod
+    def instance_of(cls, parent: 'Provenance', dependencies: Iterable[Node]) -> 'Provenance':
+        """An "Instance of <parent method>" record, without building the string each time."""
+        code = cls._instance_codes.get(parent.code)
+        if code is None:
+            code = cls._instance_codes[parent.code] = cls.method_code(f"Instance of {parent.method}")
+        return cls._from_code(code, dependencies)
+
+    @property
+    def method(self) -> str:
+        return self._methods[self.code]
+
+    @property
+    def dependencies(self) -> tuple:
+        return self.deps
+
+    @property
+    def metadata(self) -> dict:
+        return dict(self.bindings)
+
+    def binding_nodes(self) -> Iterable[Node]:
+        """Every node among the binding values, including inside Bindings."""
+        for _, value in self.bindings:
+            if isinstance(value, Node):
+                yield value
+            elif isinstance(value, Bindings):
+                yield from (v for _, v in value if isinstance(v, Node))
+
+    def map_nodes(self, fn) -> 'Provenance':
+        """Returns the record with fn applied to its dependencies and binding nodes."""
+        def value(v):
+            if isinstance(v, Node):
+                return fn(v)
+            if isinstance(v, Bindings):
+                return Bindings((k, fn(n) if isinstance(n, Node) else n) for k, n in v)
+            return v
+        return Provenance._from_code(
+            self.code, [fn(d) for d in self.deps], {k: value(v) for k, v in self.bindings}
+        )
+
+    def __reduce__(self):
+        return (Provenance, (self.method, self.deps, self.metadata))
+
+    def __setstate__(self, state):
+        # Legacy pickles carry the attribute dict of the old mutable class.
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **state[1]}
+        self.code = self.method_code(state['method'])
+        self.deps = tuple(state.get('dependencies') or ())
+        self.bindings = tuple((sys.intern(k), v) for k, v in (state.get('metadata') or {}).items())
     
     def __str__(self):
-        deps = ", ".join(str(d) for d in self.dependencies)
-        meta = ", ".join(f"{k}={v}" for k, v in self.metadata.items())
+        deps = ", ".join(str(d) for d in self.deps)
+        meta = ", ".join(f"{k}={v}" for k, v in self.bindings)
         parts = []
         if deps: parts.append(deps)
         if meta: parts.append(meta)
         content = ", ".join(parts)
         return f"{self.method}({content})" if content else self.method
 
+def head_key(node: Node):
+    """
+    Key of the head index: the top-level constructor, and for a Forall the
+    number of leading quantifiers and the constructor of the matrix under them.
+    """
+    if not isinstance(node, Forall):
+        return node.__class__
+    depth = 0
+    while isinstance(node, Forall):
+        node = node.body
+        depth += 1
+    return (Forall, depth, node.__class__)
+
+def encode_node_table(nodes: Iterable[Node]) -> tuple[list, dict]:
+    """
+    Flattens nodes and all their sub-nodes into rows, children before parents:
+    the tag followed by the constructor arguments, with node arguments
+    replaced by their row index, e.g. (tag, name) or (tag, left, right).
+    Returns the rows and the node -> row index map.
+    """
+    rows: list = []
+    index: dict[Node, int] = {}
+    for root in nodes:
+        stack = [root]
+        while stack:
+            n = stack[-1]
+            if n in index:
+                stack.pop()
+                continue
+            pending = [c for c in n._children() if c not in index]
+            if pending:
+                stack.extend(pending)
+                continue
+            rows.append((n.tag,) + tuple(index[a] if isinstance(a, Node) else a for a in n._args()))
+            index[n] = len(rows) - 1
+            stack.pop()
+    return rows, index
+
+def decode_node_table(rows: list) -> List[Node]:
+    """Rebuilds (and interns) the nodes of an encode_node_table row list."""
+    nodes: List[Node] = []
+    for row in rows:
+        cls = TAG_CLASSES[row[0]]
+        arity = cls._node_arity
+        if cls is Forall and isinstance(row[2], int):
+            # Tables saved before locally nameless Foralls hold (var, sentence).
+            arity = 2
+        nodes.append(cls.make(*(nodes[i] for i in row[1:1 + arity]), *row[1 + arity:]))
+    return nodes
+
+class _NodePickler(pickle.Pickler):
+    """Pickles Node references as row indices, so deep DAGs never recurse."""
+    def __init__(self, file, index: dict):
+        super().__init__(file)
+        self.index = index
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Node):
+            return self.index[obj]
+        return None
+
+class _NodeUnpickler(pickle.Unpickler):
+    def __init__(self, file, nodes: List[Node]):
+        super().__init__(file)
+        self.nodes = nodes
+
+    def persistent_load(self, pid):
+        return self.nodes[pid]
+
 class SentenceStorage:
+    # On-disk layout: a header pickle with the flat node table, then the
+    # proven dict pickled with nodes as table indices.
+    FORMAT = 2
+    # Consequents of a curried implication indexed for backward chaining; two reach C in L2
+    INDEXED_CONSEQUENTS = 2
+
     def __init__(self):
-        self.nodes: dict[Node, Node] = {} # Map object to canonical object (hash consing)
+        self.nodes = UniqueTable() # Hash consing table, used by Node.make while this storage is active
+        self.nodes.activate()
         self.proven: dict[Node, Provenance] = {}
+        # Secondary indexes over proven facts, kept up to date by mark_proven
+        self._by_consequent: dict[Node, List[Node]] = {}
+        self._by_antecedent: dict[Node, List[Node]] = {}
+        self._by_head: dict = {}
+        # Discrimination trees over facts and implication consequents, and
+        # feature vectors of the facts, built on first use
+        self._patterns: Optional[tuple[DiscriminationTree, DiscriminationTree, FeatureIndex]] = None
+        # Listeners told of each newly proven fact, and one-shot watches on single facts
+        self._subscribers: List[Callable[[Node], None]] = []
+        self._watches: dict[Node, List[Callable[[Node], None]]] = {}
+        self._events: Optional[deque] = None  # Facts waiting to be published while listeners run
 
     def intern(self, node: Node) -> Node:
         """
         Returns the canonical version of the node. 
         """
-        if node in self.nodes:
-            return self.nodes[node]
-        self.nodes[node] = node
-        return node
+        return self.nodes.intern(node)
     
     def mark_proven(self, node: Node, provenance: Provenance):
         """Marks a node as proven with a specific reason. Ensure node is canonical first."""
@@ -40,23 +241,173 @@ class SentenceStorage:
             # For now, first proof wins or we ignore.
             return
         self.proven[canonical] = provenance
+        self._index(canonical)
+        self._publish(canonical)
+
+    def subscribe(self, callback: Callable[[Node], None]) -> Callable[[], None]:
+        """Calls callback(fact) for every fact proven from now on; returns a function that unsubscribes."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def watch(self, node: Node, callback: Callable[[Node], None]):
+        """Calls callback(node) once, when node is proven: right away if it already is."""
+        canonical = self.intern(node)
+        if self.is_proven(canonical):
+            callback(canonical)
+            return
+        callbacks = self._watches.setdefault(canonical, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def unwatch(self, node: Node, callback: Callable[[Node], None]):
+        callbacks = self._watches.get(node)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+            if not callbacks:
+                del self._watches[node]
+
+    def _publish(self, node: Node):
+        # Listeners may prove more facts; those queue up and are delivered in
+        # proof order once the current listeners return, without recursion.
+        # A listener that raises does not stop delivery to the others: the
+        # first error is raised once every queued event has been delivered.
+        if not self._subscribers and not self._watches:
+            return
+        if self._events is not None:
+            self._events.append(node)
+            return
+        self._events = deque([node])
+        error = None
+        try:
+            while self._events:
+                fact = self._events.popleft()
+                for callbacks in (self._watches.pop(fact, ()), list(self._subscribers)):
+                    for callback in callbacks:
+                        try:
+                            callback(fact)
+                        except Exception as e:
+                            if error is None:
+                                error = e
+        finally:
+            self._events = None
+        if error is not None:
+            raise error
+
+    def _index(self, node: Node):
+        if isinstance(node, Implies):
+            self._by_consequent.setdefault(node.right, []).append(node)
+            self._by_antecedent.setdefault(node.left, []).append(node)
+        self._by_head.setdefault(head_key(node), []).append(node)
+        self._index_patterns(node)
+
+    def _index_patterns(self, node: Node):
+        if self._patterns is not None:
+            facts, consequents, features = self._patterns
+            facts.insert(node, node)
+            # The first consequents of a curried chain A→(B→C): both B→C and C
+            consequent = node
+            for _ in range(self.INDEXED_CONSEQUENTS):
+                if not isinstance(consequent, Implies):
+                    break
+                consequent = consequent.right
+                consequents.insert(consequent, node)
+            features.add(node)
+
+    def _pattern_trees(self) -> tuple:
+        # Built from every proven fact, so on a lazily loaded backend the
+        # first pattern lookup reads the whole knowledge base.
+        if self._patterns is None:
+            self._patterns = (DiscriminationTree(), DiscriminationTree(), FeatureIndex())
+            for node in self.proven:
+                self._index_patterns(node)
+        return self._patterns
+
+    def _reindex(self):
+        self._by_consequent, self._by_antecedent, self._by_head = {}, {}, {}
+        self._patterns = None
+        for node in self.proven:
+            self._index(node)
+
+    def generalizations(self, goal: Node) -> List[Node]:
+        """Proven facts that may match goal as patterns, in the order they were proven."""
+        facts, _, features = self._pattern_trees()
+        return [f for f in facts.candidates(goal) if features.dominates(goal, f)]
+
+    def unifiable_facts(self, goal: Node, flexible: frozenset) -> List[Node]:
+        """
+        Proven facts that may unify with goal when the goal variables named in
+        flexible can be bound as well, in the order they were proven.
+        """
+        return self._pattern_trees()[0].candidates(goal, flexible)
+
+    def instances_of(self, pattern: Node, limit: Optional[int] = None, start: int = 0) -> List[Node]:
+        """
+        Proven facts, among those proven in positions [start, limit), that
+        pattern may match: those whose feature vector is at least the pattern's.
+        """
+        return self._pattern_trees()[2].instances(pattern, limit, start)
+
+    def instance_positions(self, pattern: Node, limit: Optional[int] = None, start: int = 0) -> List[int]:
+        """Like instances_of, but the facts' positions in proven order."""
+        return self._pattern_trees()[2].instance_rows(pattern, limit, start)
+
+    def facts_since(self, start: int, stop: Optional[int] = None) -> List[Node]:
+        """
+        Facts proven in positions [start, stop), in order. Positions only
+        grow, so len(proven) taken now marks where the next delta starts.
+        """
+        return self._pattern_trees()[2].nodes[start:stop]
+
+    def implications_concluding(self, goal: Node, flexible: frozenset = frozenset()) -> List[Node]:
+        """
+        Proven implications with a consequent, directly or nested as C in
+        A→(B→C) (up to INDEXED_CONSEQUENTS deep), that may match goal as a pattern (or unify with it, binding
+        the goal variables named in flexible).
+        """
+        # A chain whose consequents both match is found once
+        return list(dict.fromkeys(self._pattern_trees()[1].candidates(goal, flexible)))
+
+    def implications_by_consequent(self, node: Node) -> List[Node]:
+        """Proven implications A→node, in the order they were proven."""
+        return list(self._by_consequent.get(node, ()))
+
+    def implications_by_antecedent(self, node: Node) -> List[Node]:
+        """Proven implications node→B, in the order they were proven."""
+        return list(self._by_antecedent.get(node, ()))
+
+    def facts_by_head(self, key) -> List[Node]:
+        """Proven facts with the given head_key, e.g. Implies or (Forall, 1, Equals)."""
+        return list(self._by_head.get(key, ()))
     
     def get_provenance(self, node: Node) -> Optional[Provenance]:
         return self.proven.get(node)
 
+    def transaction(self):
+        """Groups several mark_proven calls into one commit; a no-op in memory."""
+        return nullcontext()
+
     def is_proven(self, node: Node) -> bool:
         return node in self.proven
 
+    def _intern_provenance(self, provenance: Provenance) -> Provenance:
+        return provenance.map_nodes(self.intern)
+
     def save(self, filepath: str):
         """Saves the entire storage to a file."""
         # Ensure directory exists
         os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        rows, index = encode_node_table(self._reachable())
         with open(filepath, 'wb') as f:
-            pickle.dump({
-                'nodes': self.nodes,
-                'proven': self.proven
-            }, f)
-        print(f"Storage saved to {filepath} with {len(self.nodes)} expressions ({len(self.proven)} proven).")
+            pickle.dump({'format': self.FORMAT, 'table': rows}, f)
+            _NodePickler(f, index).dump(self.proven)
+        print(f"Storage saved to {filepath} with {len(rows)} expressions ({len(self.proven)} proven).")
+
+    def _reachable(self) -> Iterable[Node]:
+        """Proven facts and the nodes their provenance refers to; only these are saved."""
+        for node, provenance in self.proven.items():
+            yield node
+            yield from provenance.dependencies
+            yield from provenance.binding_nodes()
 
     @classmethod
     def load(cls, filepath: str) -> 'SentenceStorage':
@@ -64,11 +415,25 @@ class SentenceStorage:
         if not os.path.exists(filepath):
             return cls()
         
+        if cls is SentenceStorage and SqliteSentenceStorage.is_database(filepath):
+            return SqliteSentenceStorage.load(filepath)
+        if cls is SentenceStorage and SnapshotStorage.is_snapshot(filepath):
+            return SnapshotStorage.load(filepath)
+
+        # Create the storage first so its table is active: nodes re-intern as they unpickle.
+        storage = cls()
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
+            if data.get('format') == cls.FORMAT:
+                nodes = decode_node_table(data['table'])
+                storage.proven = _NodeUnpickler(f, nodes).load()
+                storage._reindex()
+                print(f"Storage loaded from {filepath} with {len(storage.nodes)} expressions ({len(storage.proven)} proven).")
+                return storage
         
-        storage = cls()
-        storage.nodes = data.get('nodes', {})
+        # Legacy files pickled a node->node dict of un-interned objects.
+        for node in data.get('nodes', []):
+            storage.intern(node)
         
         # Backward compatibility or migrate if structure changed drastically
         # Assuming we just wiped DB or compatible since we control it.
@@ -76,9 +441,709 @@ class SentenceStorage:
         loaded_proven = data.get('proven', {})
         if isinstance(loaded_proven, set):
             print("Migrating legacy 'proven' set to dict...")
-            storage.proven = {node: Provenance("Legacy Axiom") for node in loaded_proven}
+            storage.proven = {storage.intern(node): Provenance("Legacy Axiom") for node in loaded_proven}
         else:
-            storage.proven = loaded_proven
+            storage.proven = {storage.intern(node): storage._intern_provenance(prov) for node, prov in loaded_proven.items()}
+        storage._reindex()
             
         print(f"Storage loaded from {filepath} with {len(storage.nodes)} expressions ({len(storage.proven)} proven).")
         return storage
+
+
+class _RowUnpickler(pickle.Unpickler):
+    """Unpickles Node references saved as SQLite node row ids."""
+    def __init__(self, file, storage: 'SqliteSentenceStorage'):
+        super().__init__(file)
+        self.storage = storage
+
+    def persistent_load(self, pid):
+        return self.storage.node(pid)
+
+class _SqliteProven(Mapping):
+    """
+    Read-through view of the proven table with the same interface as the
+    in-memory node -> Provenance dict. Facts are fetched when asked for.
+    """
+    def __init__(self, storage: 'SqliteSentenceStorage'):
+        self.storage = storage
+        self._cache: dict[Node, Provenance] = {}
+
+    def __getitem__(self, node: Node) -> Provenance:
+        provenance = self._cache.get(node)
+        if provenance is None:
+            provenance = self.storage._fetch_provenance(node)
+            if provenance is None:
+                raise KeyError(node)
+            self._cache[node] = provenance
+        return provenance
+
+    def __contains__(self, node) -> bool:
+        if node in self._cache:
+            return True
+        node_id = self.storage._lookup(node) if isinstance(node, Node) else None
+        if node_id is None:
+            return False
+        return self.storage.connection.execute(
+            "SELECT 1 FROM proven WHERE node = ?", (node_id,)
+        ).fetchone() is not None
+
+    def __iter__(self):
+        # Insertion order, like the dict it replaces
+        for (node_id,) in self.storage.connection.execute("SELECT node FROM proven ORDER BY id"):
+            yield self.storage.node(node_id)
+
+    def __len__(self) -> int:
+        return self.storage.connection.execute("SELECT COUNT(*) FROM proven").fetchone()[0]
+
+class SqliteSentenceStorage(SentenceStorage):
+    """
+    SentenceStorage kept in an SQLite database. Nodes, proven facts and
+    provenance edges live in indexed tables: mark_proven inserts just the
+    new rows in one transaction, and proven facts are read back on demand
+    instead of unpickling the whole knowledge base up front. The pattern
+    indexes are the exception: the first lookup through them reads every fact.
+
+    Node rows hold the tag and the node's key, with children as row ids,
+    plus the Forall name hint, which is not part of the key.
+    """
+    MAGIC = b"SQLite format 3\x00"
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS nodes (
+            id INTEGER PRIMARY KEY,
+            tag INTEGER NOT NULL,
+            first,
+            second,
+            hint TEXT
+        );
+        CREATE INDEX IF NOT EXISTS nodes_by_key ON nodes (tag, first, second);
+        CREATE INDEX IF NOT EXISTS nodes_by_second ON nodes (tag, second);
+        CREATE TABLE IF NOT EXISTS proven (
+            id INTEGER PRIMARY KEY,
+            node INTEGER NOT NULL UNIQUE REFERENCES nodes (id),
+            method TEXT NOT NULL,
+            metadata BLOB
+        );
+        CREATE TABLE IF NOT EXISTS dependencies (
+            node INTEGER NOT NULL REFERENCES nodes (id),
+            position INTEGER NOT NULL,
+            dependency INTEGER NOT NULL REFERENCES nodes (id),
+            PRIMARY KEY (node, position)
+        );
+        CREATE INDEX IF NOT EXISTS dependencies_by_dependency ON dependencies (dependency);
+    """
+
+    def __init__(self, filepath: str = ":memory:"):
+        super().__init__()
+        self.filepath = filepath
+        if filepath != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        self.connection = sqlite3.connect(filepath)
+        # WAL with synchronous=NORMAL commits without an fsync per transaction,
+        # so a mark_proven per derived fact stays cheap.
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self._ids: dict[Node, int] = {}       # interned node -> row id
+        self._by_id: dict[int, Node] = {}     # row id -> interned node
+        self._in_transaction = False
+        self._last_committed_id = 0           # Highest node row id when the transaction began
+        self._uncommitted: List[Node] = []    # Facts proven in the open transaction
+        self.proven = _SqliteProven(self)
+
+    @classmethod
+    def is_database(cls, filepath: str) -> bool:
+        with open(filepath, 'rb') as f:
+            return f.read(len(cls.MAGIC)) == cls.MAGIC
+
+    def _remember(self, node: Node, node_id: int):
+        self._ids[node] = node_id
+        self._by_id[node_id] = node
+
+    def _row(self, node: Node) -> tuple:
+        key = node._key()
+        cols = [self._ids[k] if isinstance(k, Node) else k for k in key] + [None, None]
+        args = node._args()
+        hint = args[len(key)] if len(args) > len(key) else None
+        return (node.tag, cols[0], cols[1], hint)
+
+    def _find(self, row: tuple) -> Optional[int]:
+        found = self.connection.execute(
+            "SELECT id FROM nodes WHERE tag = ? AND first IS ? AND second IS ?", row[:3]
+        ).fetchone()
+        return found[0] if found else None
+
+    def _ids_for(self, node: Node, insert: bool) -> Optional[int]:
+        """Row id of an interned node, inserting missing rows if asked to."""
+        stack = [node]
+        while stack:
+            n = stack[-1]
+            if n in self._ids:
+                stack.pop()
+                continue
+            pending = [c for c in n._children() if c not in self._ids]
+            if pending:
+                stack.extend(pending)
+                continue
+            row = self._row(n)
+            node_id = self._find(row)
+            if node_id is None:
+                if not insert:
+                    return None
+                node_id = self.connection.execute(
+                    "INSERT INTO nodes (tag, first, second, hint) VALUES (?, ?, ?, ?)", row
+                ).lastrowid
+            self._remember(n, node_id)
+            stack.pop()
+        return self._ids[node]
+
+    def _lookup(self, node: Node) -> Optional[int]:
+        return self._ids_for(self.intern(node), insert=False)
+
+    def _store(self, node: Node) -> int:
+        return self._ids_for(self.intern(node), insert=True)
+
+    def node(self, node_id: int) -> Node:
+        """Materializes the node stored under a row id (and any missing sub-nodes)."""
+        stack = [node_id]
+        while stack:
+            i = stack[-1]
+            if i in self._by_id:
+                stack.pop()
+                continue
+            tag, first, second, hint = self.connection.execute(
+                "SELECT tag, first, second, hint FROM nodes WHERE id = ?", (i,)
+            ).fetchone()
+            cls = TAG_CLASSES[tag]
+            key = [c for c in (first, second) if c is not None]
+            pending = [c for c in key[:cls._node_arity] if c not in self._by_id]
+            if pending:
+                stack.extend(pending)
+                continue
+            args = [self._by_id[c] for c in key[:cls._node_arity]] + key[cls._node_arity:]
+            if hint is not None:
+                args.append(hint)
+            self._remember(cls.make(*args), i)
+            stack.pop()
+        return self._by_id[node_id]
+
+    def _insert_proven(self, canonical: Node, provenance: Provenance):
+        provenance = self._intern_provenance(provenance)
+        node_id = self._store(canonical)
+        dependency_ids = [self._store(d) for d in provenance.dependencies]
+        metadata = None
+        if provenance.bindings:
+            for value in provenance.binding_nodes():
+                self._store(value)
+            buffer = io.BytesIO()
+            _NodePickler(buffer, self._ids).dump(provenance.metadata)
+            metadata = buffer.getvalue()
+        self.connection.execute(
+            "INSERT INTO proven (node, method, metadata) VALUES (?, ?, ?)",
+            (node_id, provenance.method, metadata),
+        )
+        self.connection.executemany(
+            "INSERT INTO dependencies (node, position, dependency) VALUES (?, ?, ?)",
+            [(node_id, position, d) for position, d in enumerate(dependency_ids)],
+        )
+        self.proven._cache[canonical] = provenance
+        self._uncommitted.append(canonical)
+        self._index_patterns(canonical)
+        self._publish(canonical)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups several mark_proven calls into one commit. On error the rows
+        are rolled back, and so is what was cached or indexed about them;
+        listeners have already been told of the facts, though.
+        """
+        if self._in_transaction:
+            yield
+            return
+        self._in_transaction = True
+        self._last_committed_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM nodes").fetchone()[0]
+        try:
+            with self.connection:
+                yield
+        except BaseException:
+            self._forget_uncommitted()
+            raise
+        finally:
+            self._in_transaction = False
+            self._uncommitted = []
+
+    def _forget_uncommitted(self):
+        # Rolled back row ids are handed out again, so none may stay mapped
+        for node_id in [i for i in self._by_id if i > self._last_committed_id]:
+            del self._ids[self._by_id.pop(node_id)]
+        for node in self._uncommitted:
+            self.proven._cache.pop(node, None)
+        if self._uncommitted:
+            self._patterns = None  # Rebuilt from the committed facts on next use
+
+    def mark_proven(self, node: Node, provenance: Provenance):
+        """Marks a node as proven, inserting its new rows in one transaction."""
+        canonical = self.intern(node)
+        if canonical in self.proven:
+            return
+        with self.transaction():
+            self._insert_proven(canonical, provenance)
+
+    def update(self, other: SentenceStorage):
+        """Copies every proven fact of another storage, in its order, in one transaction."""
+        with self.transaction():
+            for node, provenance in other.proven.items():
+                canonical = self.intern(node)
+                if canonical not in self.proven:
+                    self._insert_proven(canonical, provenance)
+
+    def _fetch_provenance(self, node: Node) -> Optional[Provenance]:
+        node_id = self._lookup(node)
+        if node_id is None:
+            return None
+        found = self.connection.execute(
+            "SELECT method, metadata FROM proven WHERE node = ?", (node_id,)
+        ).fetchone()
+        if found is None:
+            return None
+        method, metadata = found
+        dependencies = [self.node(d) for (d,) in self.connection.execute(
+            "SELECT dependency FROM dependencies WHERE node = ? ORDER BY position", (node_id,)
+        )]
+        if metadata is not None:
+            metadata = _RowUnpickler(io.BytesIO(metadata), self).load()
+        return Provenance(method, dependencies, metadata)
+
+    def _proven_where(self, condition: str, params: tuple) -> List[Node]:
+        return [self.node(node_id) for (node_id,) in self.connection.execute(
+            "SELECT p.node FROM proven p JOIN nodes n ON n.id = p.node "
+            f"WHERE {condition} ORDER BY p.id", params
+        )]
+
+    def implications_by_consequent(self, node: Node) -> List[Node]:
+        node_id = self._lookup(node)
+        if node_id is None:
+            return []
+        return self._proven_where("n.tag = ? AND n.second = ?", (Implies.tag, node_id))
+
+    def implications_by_antecedent(self, node: Node) -> List[Node]:
+        node_id = self._lookup(node)
+        if node_id is None:
+            return []
+        return self._proven_where("n.tag = ? AND n.first = ?", (Implies.tag, node_id))
+
+    def facts_by_head(self, key) -> List[Node]:
+        if not isinstance(key, tuple):
+            return self._proven_where("n.tag = ?", (key.tag,))
+        return [n for n in self._proven_where("n.tag = ?", (Forall.tag,)) if head_key(n) == key]
+
+    def expression_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def save(self, filepath: str):
+        """Commits, and copies the database if filepath is not the one in use."""
+        self.connection.commit()
+        if self.filepath == ":memory:" or os.path.abspath(filepath) != os.path.abspath(self.filepath):
+            os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+            target = sqlite3.connect(filepath)
+            with target:
+                self.connection.backup(target)
+            target.close()
+        print(f"Storage saved to {filepath} with {self.expression_count()} expressions ({len(self.proven)} proven).")
+
+    @classmethod
+    def load(cls, filepath: str) -> 'SqliteSentenceStorage':
+        """Opens a database file; nothing is read until it is asked for."""
+        storage = cls(filepath)
+        print(f"Storage loaded from {filepath} with {storage.expression_count()} expressions ({len(storage.proven)} proven).")
+        return storage
+
+def _snapshot_slot(tag: int, first: int, second: int, mask: int) -> int:
+    """Hash for the snapshot's node index; fixed, unlike hash(), across runs and versions."""
+    h = (tag * 0x9E3779B97F4A7C15 + first) & 0xFFFFFFFFFFFFFFFF
+    h = ((h ^ (h >> 29)) * 0xBF58476D1CE4E5B9 + second) & 0xFFFFFFFFFFFFFFFF
+    return (h ^ (h >> 32)) & mask
+
+class _SnapshotWriter:
+    """
+    Builds the columns of a snapshot file, optionally on top of an open
+    snapshot whose columns are copied as raw bytes rather than materialized.
+    """
+    NONE = -1
+
+    def __init__(self, base: Optional['SnapshotStorage'] = None):
+        self.base = base
+        self.columns = {name: array(code) for name, code, _ in SnapshotStorage.LAYOUT}
+        self.names: List[str] = []
+        self._name_ids: dict[str, int] = {}
+        self._ids: dict[Node, int] = {}
+        self.meta = bytearray()
+        if base is None:
+            self.columns['edge_start'].append(0)
+            self.columns['meta_start'].append(0)
+        else:
+            for name in ('tags', 'first', 'second', 'hint', 'proven_node', 'proven_method',
+                         'edge_start', 'meta_start', 'edges'):
+                self.columns[name].frombytes(base.columns[name].tobytes())
+            for i in range(base.counts['names']):
+                self.name_id(base.name(i))
+            self.meta += base.columns['meta']
+
+    def name_id(self, name: str) -> int:
+        idx = self._name_ids.get(name)
+        if idx is None:
+            idx = len(self.names)
+            self.names.append(name)
+            self._name_ids[name] = idx
+        return idx
+
+    def add(self, node: Node) -> int:
+        """Returns the node id, appending rows for sub-nodes the snapshot lacks."""
+        tags, first, second, hint = (self.columns[c] for c in ('tags', 'first', 'second', 'hint'))
+        stack = [node]
+        while stack:
+            n = stack[-1]
+            if n in self._ids:
+                stack.pop()
+                continue
+            known = self.base._lookup(n) if self.base is not None else None
+            if known is not None:
+                self._ids[n] = known
+                stack.pop()
+                continue
+            pending = [c for c in n._children() if c not in self._ids]
+            if pending:
+                stack.extend(pending)
+                continue
+            key = n._key()
+            cols = [
+                self._ids[k] if isinstance(k, Node) else self.name_id(k) if isinstance(k, str) else k
+                for k in key
+            ] + [self.NONE, self.NONE]
+            args = n._args()
+            tags.append(n.tag)
+            first.append(cols[0])
+            second.append(cols[1])
+            hint.append(self.name_id(args[len(key)]) if len(args) > len(key) else self.NONE)
+            self._ids[n] = len(tags) - 1
+            stack.pop()
+        return self._ids[node]
+
+    def add_fact(self, node: Node, provenance: Provenance):
+        c = self.columns
+        c['proven_node'].append(self.add(node))
+        c['proven_method'].append(self.name_id(provenance.method))
+        c['edges'].extend(self.add(d) for d in provenance.dependencies)
+        c['edge_start'].append(len(c['edges']))
+        if provenance.bindings:
+            for value in provenance.binding_nodes():
+                self.add(value)
+            buffer = io.BytesIO()
+            _NodePickler(buffer, self._ids).dump(provenance.metadata)
+            self.meta += buffer.getvalue()
+        c['meta_start'].append(len(self.meta))
+
+    def write(self, filepath: str):
+        c = self.columns
+        count = len(c['tags'])
+        c['proven_index'].extend([self.NONE] * count)
+        for p, node_id in enumerate(c['proven_node']):
+            c['proven_index'][node_id] = p
+        size = 8
+        while size < 2 * count:
+            size *= 2
+        slots = c['slots']
+        slots.extend([self.NONE] * size)
+        for node_id in range(count):
+            slot = _snapshot_slot(c['tags'][node_id], c['first'][node_id], c['second'][node_id], size - 1)
+            while slots[slot] != self.NONE:
+                slot = (slot + 1) & (size - 1)
+            slots[slot] = node_id
+        encoded = [name.encode('utf-8') for name in self.names]
+        c['name_start'].append(0)
+        for name in encoded:
+            c['name_start'].append(c['name_start'][-1] + len(name))
+        c['name_bytes'].frombytes(b"".join(encoded))
+        c['meta'].frombytes(bytes(self.meta))
+
+        counts = {
+            'nodes': count, 'slots': size, 'names': len(self.names),
+            'name_bytes': len(c['name_bytes']), 'proven': len(c['proven_node']),
+            'edges': len(c['edges']), 'meta': len(self.meta),
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        with open(filepath, 'wb') as f:
+            f.write(SnapshotStorage.HEADER.pack(
+                SnapshotStorage.MAGIC, SnapshotStorage.VERSION, sys.byteorder == 'little',
+                *(counts[k] for k in SnapshotStorage.COUNTS)
+            ))
+            for name, _, _ in SnapshotStorage.LAYOUT:
+                raw = c[name].tobytes()
+                f.write(raw + b"\0" * (-len(raw) % 8))
+
+def write_snapshot(filepath: str, storage: SentenceStorage):
+    """Writes every proven fact of a storage, in order, as a snapshot file."""
+    writer = _SnapshotWriter()
+    for node, provenance in storage.proven.items():
+        writer.add_fact(node, provenance)
+    writer.write(filepath)
+
+class _SnapshotProven(Mapping):
+    """The snapshot's proven facts followed by the ones added since it was opened."""
+    def __init__(self, storage: 'SnapshotStorage'):
+        self.storage = storage
+        self.added: dict[Node, Provenance] = {}
+
+    def __getitem__(self, node: Node) -> Provenance:
+        provenance = self.added.get(node)
+        if provenance is None:
+            provenance = self.storage._fetch_provenance(node)
+            if provenance is None:
+                raise KeyError(node)
+        return provenance
+
+    def __contains__(self, node) -> bool:
+        return node in self.added or self.storage._proven_record(node) is not None
+
+    def __iter__(self):
+        proven_node = self.storage.columns['proven_node']
+        for p in range(self.storage.counts['proven']):
+            yield self.storage.node(proven_node[p])
+        yield from self.added
+
+    def __len__(self) -> int:
+        return self.storage.counts['proven'] + len(self.added)
+
+class SnapshotStorage(SentenceStorage):
+    """
+    SentenceStorage over a memory-mapped, read-only binary snapshot. Opening
+    one only maps the file: node, name and provenance tables are fixed-width
+    columns read in place, and Node objects are materialized just for the ids
+    actually touched. Processes reading the same snapshot share its pages
+    through the OS page cache. Building the pattern indexes, on the first
+    lookup through them, still materializes every fact.
+
+    Facts proven after opening are kept in memory; save() writes a new
+    snapshot that copies the old columns as raw bytes and appends them.
+    """
+    MAGIC = b"MATHSNAP"
+    VERSION = 1
+    COUNTS = ('nodes', 'slots', 'names', 'name_bytes', 'proven', 'edges', 'meta')
+    HEADER = struct.Struct('<8sqq7q')
+    # Columns in file order: (name, array typecode, length). Node columns hold
+    # the tag and the node's key (child ids, name ids or raw integers, -1 when
+    # absent) plus the Forall name hint; slots is an open-addressing index on
+    # the key; proven records point into the edge and metadata columns.
+    LAYOUT = (
+        ('first', 'q', 'nodes'), ('second', 'q', 'nodes'), ('hint', 'q', 'nodes'),
+        ('proven_index', 'q', 'nodes'), ('slots', 'q', 'slots'),
+        ('proven_node', 'q', 'proven'), ('proven_method', 'q', 'proven'),
+        ('edge_start', 'q', 'proven+1'), ('meta_start', 'q', 'proven+1'),
+        ('edges', 'q', 'edges'), ('name_start', 'q', 'names+1'),
+        ('tags', 'B', 'nodes'), ('name_bytes', 'B', 'name_bytes'), ('meta', 'B', 'meta'),
+    )
+
+    def __init__(self, filepath: str):
+        super().__init__()
+        self.filepath = filepath
+        self._open()
+
+    def _open(self):
+        self._file = open(self.filepath, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, little, *counts = self.HEADER.unpack_from(self._map)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{self.filepath} is not a version {self.VERSION} snapshot.")
+        if bool(little) != (sys.byteorder == 'little'):
+            raise ValueError(f"{self.filepath} was written with a different byte order.")
+        self.counts = dict(zip(self.COUNTS, counts))
+        self.columns = {}
+        self._view = memoryview(self._map)
+        offset = self.HEADER.size
+        for name, code, length in self.LAYOUT:
+            base, _, extra = length.partition('+')
+            size = (self.counts[base] + int(extra or 0)) * array(code).itemsize
+            self.columns[name] = self._view[offset:offset + size].cast(code)
+            offset += size + (-size % 8)
+        self._ids: dict[Node, int] = {}
+        self._by_id: dict[int, Node] = {}
+        self._name_ids: Optional[dict[str, int]] = None
+        self._id_indexes = None
+        self.proven = _SnapshotProven(self)
+        # The in-memory indexes only cover facts added since opening
+        self._by_consequent, self._by_antecedent, self._by_head = {}, {}, {}
+        self._patterns = None
+
+    def close(self):
+        """Releases the mapping; materialized nodes stay valid."""
+        for column in self.columns.values():
+            column.release()
+        self.columns = {}
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    @classmethod
+    def is_snapshot(cls, filepath: str) -> bool:
+        with open(filepath, 'rb') as f:
+            return f.read(len(cls.MAGIC)) == cls.MAGIC
+
+    def name(self, name_id: int) -> str:
+        start = self.columns['name_start']
+        return self.columns['name_bytes'][start[name_id]:start[name_id + 1]].tobytes().decode('utf-8')
+
+    def _name_id(self, name: str) -> Optional[int]:
+        if self._name_ids is None:
+            self._name_ids = {self.name(i): i for i in range(self.counts['names'])}
+        return self._name_ids.get(name)
+
+    def node(self, node_id: int) -> Node:
+        """Materializes the node with a snapshot id (and any missing sub-nodes)."""
+        tags, first, second, hint = (self.columns[c] for c in ('tags', 'first', 'second', 'hint'))
+        stack = [node_id]
+        while stack:
+            i = stack[-1]
+            if i in self._by_id:
+                stack.pop()
+                continue
+            cls = TAG_CLASSES[tags[i]]
+            key = [c for c in (first[i], second[i]) if c != _SnapshotWriter.NONE]
+            pending = [c for c in key[:cls._node_arity] if c not in self._by_id]
+            if pending:
+                stack.extend(pending)
+                continue
+            args = [self._by_id[c] for c in key[:cls._node_arity]] + key[cls._node_arity:]
+            if hint[i] != _SnapshotWriter.NONE:
+                args.append(hint[i])
+            if cls._name_arg is not None:
+                args[cls._name_arg] = self.name(args[cls._name_arg])
+            node = cls.make(*args)
+            self._ids[node] = i
+            self._by_id[i] = node
+            stack.pop()
+        return self._by_id[node_id]
+
+    def _lookup(self, node: Node) -> Optional[int]:
+        """Snapshot id of a node, found through the slot index without materializing anything."""
+        tags, first, second, slots = (self.columns[c] for c in ('tags', 'first', 'second', 'slots'))
+        mask = self.counts['slots'] - 1
+        stack = [node]
+        while stack:
+            n = stack[-1]
+            if n in self._ids:
+                stack.pop()
+                continue
+            pending = [c for c in n._children() if c not in self._ids]
+            if pending:
+                stack.extend(pending)
+                continue
+            cols = []
+            for k in n._key():
+                if isinstance(k, Node):
+                    k = self._ids[k]
+                elif isinstance(k, str):
+                    k = self._name_id(k)
+                    if k is None:
+                        return None
+                cols.append(k)
+            cols += [_SnapshotWriter.NONE, _SnapshotWriter.NONE]
+            slot = _snapshot_slot(n.tag, cols[0], cols[1], mask)
+            while True:
+                i = slots[slot]
+                if i == _SnapshotWriter.NONE:
+                    return None
+                if tags[i] == n.tag and first[i] == cols[0] and second[i] == cols[1]:
+                    break
+                slot = (slot + 1) & mask
+            self._ids[n] = i
+            stack.pop()
+        return self._ids[node]
+
+    def _snapshot_indexes(self) -> tuple:
+        """The secondary indexes over the snapshot's facts, built from the columns on first use."""
+        if self._id_indexes is None:
+            tags, first, second = (self.columns[c] for c in ('tags', 'first', 'second'))
+            by_consequent, by_antecedent, by_head = {}, {}, {}
+            for node_id in self.columns['proven_node']:
+                cls = TAG_CLASSES[tags[node_id]]
+                key = cls
+                if cls is Implies:
+                    by_consequent.setdefault(second[node_id], []).append(node_id)
+                    by_antecedent.setdefault(first[node_id], []).append(node_id)
+                elif cls is Forall:
+                    depth, i = 0, node_id
+                    while TAG_CLASSES[tags[i]] is Forall:
+                        i = first[i]
+                        depth += 1
+                    key = (Forall, depth, TAG_CLASSES[tags[i]])
+                by_head.setdefault(key, []).append(node_id)
+            self._id_indexes = (by_consequent, by_antecedent, by_head)
+        return self._id_indexes
+
+    def _from_snapshot_index(self, which: int, key) -> List[Node]:
+        return [self.node(i) for i in self._snapshot_indexes()[which].get(key, ())]
+
+    def implications_by_consequent(self, node: Node) -> List[Node]:
+        node_id = self._lookup(node)
+        stored = self._from_snapshot_index(0, node_id) if node_id is not None else []
+        return stored + super().implications_by_consequent(node)
+
+    def implications_by_antecedent(self, node: Node) -> List[Node]:
+        node_id = self._lookup(node)
+        stored = self._from_snapshot_index(1, node_id) if node_id is not None else []
+        return stored + super().implications_by_antecedent(node)
+
+    def facts_by_head(self, key) -> List[Node]:
+        return self._from_snapshot_index(2, key) + super().facts_by_head(key)
+
+    def _proven_record(self, node: Node) -> Optional[int]:
+        node_id = self._lookup(node) if isinstance(node, Node) else None
+        if node_id is None:
+            return None
+        p = self.columns['proven_index'][node_id]
+        return p if p != _SnapshotWriter.NONE else None
+
+    def _fetch_provenance(self, node: Node) -> Optional[Provenance]:
+        p = self._proven_record(node)
+        if p is None:
+            return None
+        c = self.columns
+        dependencies = [self.node(d) for d in c['edges'][c['edge_start'][p]:c['edge_start'][p + 1]]]
+        metadata = None
+        if c['meta_start'][p] != c['meta_start'][p + 1]:
+            raw = c['meta'][c['meta_start'][p]:c['meta_start'][p + 1]].tobytes()
+            metadata = _RowUnpickler(io.BytesIO(raw), self).load()
+        return Provenance(self.name(c['proven_method'][p]), dependencies, metadata)
+
+    def mark_proven(self, node: Node, provenance: Provenance):
+        """Records a new fact in memory; save() adds it to the snapshot."""
+        canonical = self.intern(node)
+        if canonical in self.proven:
+            return
+        self.proven.added[canonical] = self._intern_provenance(provenance)
+        self._index(canonical)
+        self._publish(canonical)
+
+    def save(self, filepath: str):
+        """Writes the snapshot plus any new facts; an unchanged snapshot is left alone."""
+        same = os.path.abspath(filepath) == os.path.abspath(self.filepath)
+        if not (same and not self.proven.added):
+            writer = _SnapshotWriter(self)
+            for node, provenance in self.proven.added.items():
+                writer.add_fact(node, provenance)
+            writer.write(filepath + ".tmp")
+            if same:
+                # Ids change with the rewrite, so reopen with fresh caches
+                self.close()
+                os.replace(filepath + ".tmp", filepath)
+                self._open()
+            else:
+                os.replace(filepath + ".tmp", filepath)
+        print(f"Storage saved to {filepath} with {self.counts['nodes']} expressions ({len(self.proven)} proven).")
+
+    @classmethod
+    def load(cls, filepath: str) -> 'SnapshotStorage':
+        """Maps a snapshot file; nothing is read until it is asked for."""
+        storage = cls(filepath)
+        print(f"Storage loaded from {filepath} with {storage.counts['nodes']} expressions ({len(storage.proven)} proven).")
+        return storage
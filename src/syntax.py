@@ -1,10 +1,179 @@
+import weakref
 from abc import ABC, abstractmethod
-from typing import Union, List, Set
+from typing import Union, List, Set, FrozenSet, Dict, Iterable
+
+class UniqueTable:
+    """
+    Hash-consing table. Maps (class, canonical children/names) to the single
+    canonical node with that structure, so structurally equal nodes built
+    through the same table are the same object.
+
+    The table holds its nodes weakly: a node lives while something refers to
+    it (a proven fact, a goal, a parent node's key), and transient results of
+    substitution and matching are freed once dropped. A node built again
+    after that is a new object, which no one can tell from the old one.
+    """
+    def __init__(self):
+        # key -> weak reference to the node, dropped by the reference's callback
+        # (a plain dict of KeyedRefs: WeakValueDictionary.get is Python code)
+        self._nodes: dict = {}
+        nodes = self._nodes
+        def forget(ref):
+            if nodes.get(ref.key) is ref:
+                del nodes[ref.key]
+        self._forget = forget
+
+    def make(self, cls, args: tuple) -> 'Node':
+        args = cls._canonical_args(tuple(self.intern(a) if isinstance(a, Node) else a for a in args), self)
+        key = cls._table_key(args)
+        ref = self._nodes.get(key)
+        node = ref() if ref is not None else None
+        if node is None:
+            node = cls(*args)
+            node._table = self
+            self._nodes[key] = weakref.KeyedRef(node, self._forget, key)
+        return node
+
+    def intern(self, node: 'Node') -> 'Node':
+        """Returns the canonical version of a node built anywhere."""
+        if node._table is self:
+            return node
+        # Post-order with an explicit stack so deep terms don't hit the recursion limit.
+        canonical = {}
+        stack = [node]
+        while stack:
+            n = stack[-1]
+            if n in canonical:
+                stack.pop()
+                continue
+            pending = [c for c in n._children() if c._table is not self and c not in canonical]
+            if pending:
+                stack.extend(pending)
+                continue
+            args = tuple(canonical.get(a, a) if isinstance(a, Node) else a for a in n._args())
+            canonical[n] = self.make(n.__class__, args)
+            stack.pop()
+        return canonical[node]
+
+    def activate(self):
+        """Makes this the table used by Node.make."""
+        global _active_table
+        _active_table = self
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __iter__(self):
+        for ref in list(self._nodes.values()):
+            node = ref()
+            if node is not None:
+                yield node
+
+    def __contains__(self, node) -> bool:
+        return isinstance(node, Node) and node._table is self
+
+# Default table; a SentenceStorage activates its own table when created.
+# Several live storages may each hold nodes: intern() moves a node into
+# another table, and nodes of a table no storage refers to are freed.
+_active_table: UniqueTable = UniqueTable()
+
+def _make(cls, args: tuple) -> 'Node':
+    """Module-level constructor used by pickle to re-intern nodes on load."""
+    return _active_table.make(cls, args)
+
+def _structurally_equal(a: 'Node', b: 'Node') -> bool:
+    """Iterative structural comparison, short-cut by identity and cached hashes."""
+    stack = [(a, b)]
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        if a.__class__ is not b.__class__ or hash(a) != hash(b):
+            return False
+        if a._table is not None and a._table is b._table:
+            # Both interned in the same table: identity is equality.
+            return False
+        for x, y in zip(a._key(), b._key()):
+            if isinstance(x, Node):
+                stack.append((x, y))
+            elif x != y:
+                return False
+    return True
 
 class Node(ABC):
     """Base class for all sentences in the system."""
-    @abstractmethod
+    __slots__ = ('_hash', '_table', 'free_variables', 'size', 'depth', 'loose', '__weakref__')
+    tag: int  # Small integer identifying the constructor, see TAG_CLASSES
+    _node_arity = 2  # How many leading constructor arguments are nodes
+    _name_arg = None  # Index of the constructor argument holding a name, if any
+
+    @classmethod
+    def _canonical_args(cls, args: tuple, table: UniqueTable) -> tuple:
+        """Normalizes constructor arguments before hash-consing."""
+        return args
+
+    @classmethod
+    def _table_key(cls, args: tuple) -> tuple:
+        """Returns the hash-consing key for canonical constructor arguments."""
+        return (cls,) + args
+
+    @classmethod
+    def make(cls, *args) -> 'Node':
+        """Hash-consing constructor: returns the canonical node from the active table."""
+        return _active_table.make(cls, args)
+
+    def _finalize(self):
+        # Children are already hashed and measured, so this is O(1) per node
+        # (free variables aside, which cost one union at binary nodes).
+        self._hash = hash((self.__class__, self._key()))
+        self._table = None
+        children = self._children()
+        self.free_variables = self._free_variables()
+        self.size = 1 + sum(c.size for c in children)
+        self.depth = 1 + max((c.depth for c in children), default=0)
+        self.loose = self._loose()
+
+    def _children(self) -> tuple:
+        """Returns the direct sub-nodes of this node."""
+        return ()
+
+    def _free_variables(self) -> FrozenSet[str]:
+        children = self._children()
+        if not children:
+            return frozenset()
+        if len(children) == 1:
+            return children[0].free_variables
+        return children[0].free_variables | children[1].free_variables
+
+    def _loose(self) -> int:
+        # How many more Foralls this node needs around it to bind all its indices.
+        return max((c.loose for c in self._children()), default=0)
+
+    @property
+    def is_locally_closed(self) -> bool:
+        """True if every BoundVariable in this node is bound by a Forall inside it."""
+        return self.loose == 0
+
+    @property
+    def is_ground(self) -> bool:
+        """True if no variable occurs free (a closed sentence or ground term)."""
+        return not self.free_variables
+
     def __str__(self):
+        # Expand _parts with an explicit stack; deep terms print without recursion.
+        out = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, Node):
+                stack.extend(reversed(item._parts()))
+            else:
+                out.append(item)
+        return "".join(out)
+
+    @abstractmethod
+    def _parts(self) -> list:
+        """Returns the printed form as a list of strings and child nodes."""
         pass
 
     @property
@@ -17,37 +186,61 @@ class Node(ABC):
     def _key(self):
         """Returns a tuple characterizing the node for equality and hashing."""
         pass
-    
-    @property
-    @abstractmethod
-    def free_variables(self) -> Set[str]:
-        """Returns a set of variable names that are free in this expression."""
-        pass
 
-    @abstractmethod
-    def substitute(self, var_name: str, replacement: 'NumericExpression') -> 'Node':
+    def _args(self) -> tuple:
+        """Returns the constructor arguments of this node."""
+        return self._key()
+    
+    def substitute(self, var_name: str, replacement: 'Node') -> 'Node':
         """
         Returns a new Node with free occurrences of var_name replaced by replacement.
-        Must be implemented by subclasses.
         """
-        pass
+        return substitute(self, {var_name: replacement})
+
+    def substitute_all(self, bindings: Dict[str, 'Node']) -> 'Node':
+        """Returns a new Node with all bindings applied simultaneously."""
+        return substitute(self, bindings)
 
     def __hash__(self):
-        return hash((self.__class__, self._key()))
+        try:
+            return self._hash
+        except AttributeError:
+            # Legacy unpickled nodes with empty state (Zero) never get __setstate__.
+            self._finalize()
+            return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, self.__class__):
             return False
-        return self._key() == other._key()
+        if hash(self) != hash(other):
+            return False
+        return _structurally_equal(self, other)
+
+    def __reduce__(self):
+        return (_make, (self.__class__, self._args()))
+
+    def __setstate__(self, state):
+        # Legacy pickles carry a plain attribute dict from before __slots__.
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **state[1]}
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self._finalize()
 
 # --- Kinds ---
 
 class NumericExpression(Node):
+    __slots__ = ()
+
     @property
     def kind(self):
         return 'numeric'
 
 class LogicExpression(Node):
+    __slots__ = ()
+
     @property
     def kind(self):
         return 'logic'
@@ -55,208 +248,416 @@ class LogicExpression(Node):
 # --- Leaves ---
 
 class Zero(NumericExpression):
+    __slots__ = ()
+    tag = 0
+    _node_arity = 0
+
     def __init__(self):
-        pass
+        self._finalize()
     
-    def __str__(self):
-        return "0"
+    def _parts(self) -> list:
+        return ["0"]
 
     def _key(self):
         return ()
 
-    @property
-    def free_variables(self) -> Set[str]:
-        return set()
-
-    def substitute(self, var_name: str, replacement: NumericExpression) -> Node:
-        return self
-
 class Variable(Node):
+    __slots__ = ('name',)
+    _node_arity = 0
+    _name_arg = 0
+
     def __init__(self, name: str):
         self.name = name
+        self._finalize()
 
-    def __str__(self):
-        return self.name
+    def _parts(self) -> list:
+        return [self.name]
     
     def _key(self):
         return (self.name,)
 
-    @property
-    def free_variables(self) -> Set[str]:
-        return {self.name}
+    def _free_variables(self) -> FrozenSet[str]:
+        return frozenset((self.name,))
 
 class NumericVariable(Variable, NumericExpression):
-    def substitute(self, var_name: str, replacement: NumericExpression) -> Node:
-        if self.name == var_name:
-            return replacement
-        return self
+    __slots__ = ()
+    tag = 1
 
 class LogicVariable(Variable, LogicExpression):
-    def substitute(self, var_name: str, replacement: Node) -> Node:
-        if self.name == var_name:
-            return replacement
-        return self
+    __slots__ = ()
+    tag = 2
+
+class BoundVariable(NumericExpression):
+    """
+    An occurrence of a quantified variable inside a Forall body, as a de Bruijn
+    index: 0 refers to the innermost enclosing Forall, 1 to the next one out.
+    Bound variables carry no name, so alpha-equivalent sentences are the same
+    node; names only reappear when a Forall is opened for printing or proving.
+    """
+    __slots__ = ('index',)
+    tag = 10
+    _node_arity = 0
+
+    def __init__(self, index: int):
+        if index < 0:
+            raise ValueError("BoundVariable index must be non-negative.")
+        self.index = index
+        self._finalize()
+
+    def _loose(self) -> int:
+        return self.index + 1
+
+    def _parts(self) -> list:
+        return [f"#{self.index}"]
+
+    def _key(self):
+        return (self.index,)
 
 # --- Combinations: Numeric -> Logic ---
 
 class Equals(LogicExpression):
+    __slots__ = ('left', 'right')
+    tag = 3
+
     def __init__(self, left: NumericExpression, right: NumericExpression):
         if not isinstance(left, NumericExpression) or not isinstance(right, NumericExpression):
             raise TypeError("Equals takes two numeric expressions.")
         self.left = left
         self.right = right
+        self._finalize()
 
-    def __str__(self):
-        return f"{self.left}={self.right}"
+    def _parts(self) -> list:
+        return [self.left, "=", self.right]
 
     def _key(self):
         return (self.left, self.right)
 
-    @property
-    def free_variables(self) -> Set[str]:
-        return self.left.free_variables.union(self.right.free_variables)
-
-    def substitute(self, var_name: str, replacement: NumericExpression) -> Node:
-        return Equals(
-            self.left.substitute(var_name, replacement), 
-            self.right.substitute(var_name, replacement)
-        )
+    def _children(self) -> tuple:
+        return (self.left, self.right)
 
 # --- Combinations: Logic -> Logic ---
 
 class Not(LogicExpression):
+    __slots__ = ('operand',)
+    tag = 4
+    _node_arity = 1
+
     def __init__(self, operand: LogicExpression):
         if not isinstance(operand, LogicExpression):
             raise TypeError("Not takes a logic expression.")
         self.operand = operand
+        self._finalize()
 
-    def __str__(self):
-        return f"¬{self.operand}"
+    def _parts(self) -> list:
+        return ["¬", self.operand]
 
     def _key(self):
         return (self.operand,)
 
-    @property
-    def free_variables(self) -> Set[str]:
-        return self.operand.free_variables
-
-    def substitute(self, var_name: str, replacement: NumericExpression) -> Node:
-        return Not(self.operand.substitute(var_name, replacement))
+    def _children(self) -> tuple:
+        return (self.operand,)
 
 class Implies(LogicExpression):
+    __slots__ = ('left', 'right')
+    tag = 5
+
     def __init__(self, left: LogicExpression, right: LogicExpression):
         if not isinstance(left, LogicExpression) or not isinstance(right, LogicExpression):
             raise TypeError("Implies takes two logic expressions.")
         self.left = left
         self.right = right
+        self._finalize()
 
-    def __str__(self):
-        return f"({self.left}→{self.right})"
+    def _parts(self) -> list:
+        return ["(", self.left, "→", self.right, ")"]
 
     def _key(self):
         return (self.left, self.right)
     
-    @property
-    def free_variables(self) -> Set[str]:
-        return self.left.free_variables.union(self.right.free_variables)
-
-    def substitute(self, var_name: str, replacement: NumericExpression) -> Node:
-        return Implies(
-            self.left.substitute(var_name, replacement),
-            self.right.substitute(var_name, replacement)
-        )
+    def _children(self) -> tuple:
+        return (self.left, self.right)
 
 class Forall(LogicExpression):
-    def __init__(self, var: NumericVariable, sentence: LogicExpression):
-        if not isinstance(var, NumericVariable):
+    """
+    Universal quantification in locally nameless form: the body refers to the
+    quantified variable through BoundVariable indices and the name is kept
+    only as a printing hint, outside the key. So ∀x(x=x) and ∀y(y=y) are
+    the same node, whichever name it was first built with.
+
+    Forall(var, sentence) abstracts var out of the sentence; Forall(body, hint)
+    takes an already abstracted body. var and sentence open the body again
+    with the hint name, renamed apart from the free variables if needed.
+    """
+    __slots__ = ('body', 'hint', '_opened')
+    tag = 6
+    _node_arity = 1
+    _name_arg = 1
+
+    def __init__(self, var, sentence):
+        if isinstance(var, NumericVariable):
+            if not isinstance(sentence, LogicExpression):
+                raise TypeError("Forall expects a logic sentence body.")
+            var, sentence = _close(sentence, var.name, _active_table), var.name
+        elif not isinstance(var, LogicExpression) or not isinstance(sentence, str):
             raise TypeError("Forall expects a numeric variable.")
-        if not isinstance(sentence, LogicExpression):
-            raise TypeError("Forall expects a logic sentence body.")
-        self.var = var
-        self.sentence = sentence
+        self.body = var
+        self.hint = sentence
+        self._opened = None
+        self._finalize()
+
+    @classmethod
+    def _canonical_args(cls, args: tuple, table: UniqueTable) -> tuple:
+        var, sentence = args
+        if isinstance(var, NumericVariable) and isinstance(sentence, LogicExpression):
+            return (_close(sentence, var.name, table), var.name)
+        return args
+
+    @classmethod
+    def _table_key(cls, args: tuple) -> tuple:
+        # The hint is not part of the key: alpha-variants share one node.
+        return (cls, args[0])
+
+    def _loose(self) -> int:
+        return max(self.body.loose - 1, 0)
 
-    def __str__(self):
-        return f"∀{self.var}({self.sentence})"
+    @property
+    def var(self) -> NumericVariable:
+        """The quantified variable, named after the hint unless that would capture."""
+        return self._open()[0]
+
+    @property
+    def sentence(self) -> LogicExpression:
+        """The body with the quantified variable put back in as var."""
+        return self._open()[1]
+
+    def _open(self) -> tuple:
+        if self._opened is None:
+            table = self._table if self._table is not None else _active_table
+            name = self.hint
+            if name in self.body.free_variables:
+                name = _fresh_name(name, self.body.free_variables)
+            var = table.make(NumericVariable, (name,))
+            self._opened = (var, _open(self.body, var, table))
+        return self._opened
+
+    def _parts(self) -> list:
+        return ["∀", self.var, "(", self.sentence, ")"]
 
     def _key(self):
-        return (self.var, self.sentence)
+        return (self.body,)
+
+    def _args(self) -> tuple:
+        return (self.body, self.hint)
     
-    @property
-    def free_variables(self) -> Set[str]:
-        return self.sentence.free_variables - {self.var.name}
-
-    def substitute(self, var_name: str, replacement: NumericExpression) -> Node:
-        if self.var.name == var_name:
-            # Variable is shadowed/bound here, don't substitute inside
-            return self
-        return Forall(
-            self.var,
-            self.sentence.substitute(var_name, replacement)
-        )
+    def _children(self) -> tuple:
+        return (self.body,)
+
+    def __setstate__(self, state):
+        # Legacy pickles stored a named variable and sentence, as {'var': ..., 'sentence': ...}.
+        if isinstance(state, dict) and 'var' in state:
+            name = state['var'].name
+            state = {'body': _close(state['sentence'], name, _active_table), 'hint': name}
+        self._opened = None
+        super().__setstate__(state)
 
 # --- Combinations: Numeric -> Numeric ---
 
 class Successor(NumericExpression):
-    def __init__(self, operand: NumericExpression):
+    """
+    S^offset(base): a run of successors stored as one node. The base is never
+    itself a Successor, so S(S(0)), Successor(S(0)) and Successor(0, 2) are
+    all the same canonical node, and the numeral 1000 is a single node.
+    """
+    __slots__ = ('base', 'offset')
+    tag = 7
+    _node_arity = 1
+
+    def __init__(self, operand: NumericExpression, offset: int = 1):
         if not isinstance(operand, NumericExpression):
             raise TypeError("Successor takes a numeric expression.")
-        self.operand = operand
+        if offset < 1:
+            raise ValueError("Successor offset must be at least 1.")
+        if isinstance(operand, Successor):
+            offset += operand.offset
+            operand = operand.base
+        self.base = operand
+        self.offset = offset
+        self._finalize()
+
+    @classmethod
+    def _canonical_args(cls, args: tuple, table: UniqueTable) -> tuple:
+        operand, offset = args if len(args) == 2 else (args[0], 1)
+        if isinstance(operand, Successor):
+            return (operand.base, operand.offset + offset)
+        return (operand, offset)
 
-    def __str__(self):
-        return f"S({self.operand})"
+    @property
+    def operand(self) -> NumericExpression:
+        """The predecessor S^(offset-1)(base), as with a single-step successor."""
+        return self.with_offset(self.offset - 1)
+
+    def with_offset(self, offset: int) -> NumericExpression:
+        """Returns S^offset(base), or the base itself for offset 0."""
+        if offset == 0:
+            return self.base
+        if self._table is not None:
+            return self._table.make(Successor, (self.base, offset))
+        return Successor(self.base, offset)
+
+    def _parts(self) -> list:
+        return ["S("] * self.offset + [self.base] + [")"] * self.offset
 
     def _key(self):
-        return (self.operand,)
+        return (self.base, self.offset)
 
-    @property
-    def free_variables(self) -> Set[str]:
-        return self.operand.free_variables
+    def _children(self) -> tuple:
+        return (self.base,)
 
-    def substitute(self, var_name: str, replacement: NumericExpression) -> Node:
-        return Successor(self.operand.substitute(var_name, replacement))
+    def __setstate__(self, state):
+        # Legacy pickles stored one Successor per step, as {'operand': ...}.
+        if isinstance(state, dict) and 'operand' in state:
+            operand = state['operand']
+            if isinstance(operand, Successor):
+                state = {'base': operand.base, 'offset': operand.offset + 1}
+            else:
+                state = {'base': operand, 'offset': 1}
+        super().__setstate__(state)
 
 class Add(NumericExpression):
+    __slots__ = ('left', 'right')
+    tag = 8
+
     def __init__(self, left: NumericExpression, right: NumericExpression):
         if not isinstance(left, NumericExpression) or not isinstance(right, NumericExpression):
             raise TypeError("Add takes two numeric expressions.")
         self.left = left
         self.right = right
+        self._finalize()
 
-    def __str__(self):
-        return f"({self.left}+{self.right})"
+    def _parts(self) -> list:
+        return ["(", self.left, "+", self.right, ")"]
 
     def _key(self):
         return (self.left, self.right)
 
-    @property
-    def free_variables(self) -> Set[str]:
-        return self.left.free_variables.union(self.right.free_variables)
-
-    def substitute(self, var_name: str, replacement: NumericExpression) -> Node:
-        return Add(
-            self.left.substitute(var_name, replacement),
-            self.right.substitute(var_name, replacement)
-        )
+    def _children(self) -> tuple:
+        return (self.left, self.right)
 
 class Multiply(NumericExpression):
+    __slots__ = ('left', 'right')
+    tag = 9
+
     def __init__(self, left: NumericExpression, right: NumericExpression):
         if not isinstance(left, NumericExpression) or not isinstance(right, NumericExpression):
             raise TypeError("Multiply takes two numeric expressions.")
         self.left = left
         self.right = right
+        self._finalize()
 
-    def __str__(self):
-        return f"({self.left}*{self.right})"
+    def _parts(self) -> list:
+        return ["(", self.left, "*", self.right, ")"]
 
     def _key(self):
         return (self.left, self.right)
 
-    @property
-    def free_variables(self) -> Set[str]:
-        return self.left.free_variables.union(self.right.free_variables)
-
-    def substitute(self, var_name: str, replacement: NumericExpression) -> Node:
-        return Multiply(
-            self.left.substitute(var_name, replacement),
-            self.right.substitute(var_name, replacement)
-        )
+    def _children(self) -> tuple:
+        return (self.left, self.right)
+
+# Integer constructor tags, indexed by Node.tag
+TAG_CLASSES = (
+    Zero, NumericVariable, LogicVariable, Equals, Not,
+    Implies, Forall, Successor, Add, Multiply,
+    BoundVariable,
+)
+
+# --- Substitution ---
+
+def _fresh_name(base: str, avoid: Iterable[str]) -> str:
+    avoid = set(avoid)
+    i = 1
+    while f"{base}{i}" in avoid:
+        i += 1
+    return f"{base}{i}"
+
+def substitute(node: Node, bindings: Dict[str, Node]) -> Node:
+    """
+    Applies all bindings (variable name -> replacement) simultaneously in a
+    single traversal and returns the interned result.
+
+    Shared sub-DAGs are rebuilt once per call and subtrees whose free
+    variables miss the bindings are returned as-is. Quantified variables are
+    de Bruijn indices, so no replacement can be captured under a Forall.
+    """
+    if not bindings:
+        return node
+    memo = {}
+    stack = [node]
+    while stack:
+        n = stack[-1]
+        if n in memo:
+            stack.pop()
+            continue
+        if n.free_variables.isdisjoint(bindings):
+            memo[n] = n
+            stack.pop()
+            continue
+        if isinstance(n, Variable):
+            memo[n] = bindings[n.name]
+        else:
+            pending = [c for c in n._children() if c not in memo]
+            if pending:
+                stack.extend(pending)
+                continue
+            memo[n] = n.__class__.make(*(memo[a] if isinstance(a, Node) else a for a in n._args()))
+        stack.pop()
+    return memo[node]
+
+def _rebuild_under_binders(root: Node, table: UniqueTable, leaf) -> Node:
+    """
+    Rebuilds root bottom-up while tracking how many Foralls enclose each node.
+    leaf(n, depth) returns the node to use for n, or None to rebuild n from
+    its children.
+    """
+    memo = {}
+    stack = [(root, 0)]
+    while stack:
+        frame = stack[-1]
+        if frame in memo:
+            stack.pop()
+            continue
+        n, depth = frame
+        done = leaf(n, depth)
+        if done is not None:
+            memo[frame] = done
+            stack.pop()
+            continue
+        inner = depth + 1 if isinstance(n, Forall) else depth
+        pending = [(c, inner) for c in n._children() if (c, inner) not in memo]
+        if pending:
+            stack.extend(pending)
+            continue
+        memo[frame] = table.make(n.__class__, tuple(
+            memo[(a, inner)] if isinstance(a, Node) else a for a in n._args()
+        ))
+        stack.pop()
+    return memo[(root, 0)]
+
+def _close(sentence: Node, name: str, table: UniqueTable) -> Node:
+    """Replaces free occurrences of the numeric variable name by bound indices."""
+    def leaf(n, depth):
+        if name not in n.free_variables:
+            return n
+        if isinstance(n, Variable):
+            return table.make(BoundVariable, (depth,)) if isinstance(n, NumericVariable) else n
+        return None
+    return _rebuild_under_binders(sentence, table, leaf)
+
+def _open(body: Node, term: Node, table: UniqueTable) -> Node:
+    """Replaces the indices bound by the outermost Forall of body with term."""
+    def leaf(n, depth):
+        if n.loose <= depth:
+            return n
+        if isinstance(n, BoundVariable):
+            return term if n.index == depth else n
+        return None
+    return _rebuild_under_binders(body, table, leaf)
@@ -0,0 +1,167 @@
+from typing import Dict, Optional, Iterable, List, FrozenSet
+from syntax import (
+    Node, Variable, NumericVariable, LogicVariable,
+    NumericExpression, Successor,
+    TAG_CLASSES, substitute, _fresh_name
+)
+
+_VARIABLE_TAGS = frozenset((NumericVariable.tag, LogicVariable.tag))
+_NUMERIC_TAGS = frozenset(cls.tag for cls in TAG_CLASSES if issubclass(cls, NumericExpression))
+
+def variables_of(node: Node) -> List[Variable]:
+    """The distinct free variables of a node, in preorder."""
+    found = []
+    seen = set()
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if not n.free_variables or n in seen:
+            continue
+        seen.add(n)
+        if n.tag in _VARIABLE_TAGS:
+            found.append(n)
+        else:
+            stack.extend(reversed(n._children()))
+    return found
+
+def rename_apart(node: Node, avoid: Iterable[str]) -> Node:
+    """Renames the free variables of node that occur in avoid to fresh names."""
+    if node.free_variables.isdisjoint(avoid):
+        return node
+    avoid = set(avoid)
+    clashes = [v for v in variables_of(node) if v.name in avoid]
+    if not clashes:
+        return node
+    taken = avoid | node.free_variables
+    renaming = {}
+    for v in clashes:
+        fresh = _fresh_name(v.name, taken)
+        taken.add(fresh)
+        renaming[v.name] = v.__class__.make(fresh)
+    return substitute(node, renaming)
+
+class Unifier:
+    """
+    Two-sided syntactic unification. Variables on both sides may be bound,
+    except those named in rigid, which behave as constants. Equivalence
+    classes of variables are kept in a union-find forest, and a class is
+    bound to at most one non-variable term, so the work stays near-linear
+    in the size of the inputs until the final substitution is built.
+
+    Variables keep their sorts: a NumericVariable only unifies with numeric
+    terms and a LogicVariable with sentences. As in Matcher, no variable is
+    bound to a term with a loose BoundVariable, and Forall bodies are
+    compared in de Bruijn form. Successor runs unify by cancelling the
+    shorter run, so S(x)=S(S(0)) binds x to 1 in one step.
+    """
+    def unify(self, a: Node, b: Node, rigid: FrozenSet[str] = frozenset(),
+              bindings: Optional[Dict[str, Node]] = None) -> Optional[Dict[str, Node]]:
+        """
+        Returns the most general unifier of a and b as an idempotent
+        substitution (variable name -> term), extending bindings if given,
+        or None if they do not unify.
+        """
+        if bindings:
+            a = substitute(a, bindings)
+            b = substitute(b, bindings)
+        parent: Dict[Variable, Variable] = {}
+        value: Dict[Variable, Node] = {}
+
+        def find(v: Variable) -> Variable:
+            root = v
+            while root in parent:
+                root = parent[root]
+            while v is not root:
+                parent[v], v = root, parent[v]
+            return root
+
+        def resolve(t: Node) -> Node:
+            if t.tag in _VARIABLE_TAGS and t.name not in rigid:
+                root = find(t)
+                return value.get(root, root)
+            return t
+
+        def occurs(root: Variable, t: Node) -> bool:
+            stack = [t]
+            seen = set()
+            while stack:
+                n = stack.pop()
+                if not n.free_variables or n in seen:
+                    continue
+                seen.add(n)
+                if n.tag in _VARIABLE_TAGS:
+                    if n.name in rigid:
+                        continue
+                    r = find(n)
+                    if r is root:
+                        return True
+                    if r in value:
+                        stack.append(value[r])
+                else:
+                    stack.extend(n._children())
+            return False
+
+        def bind(v: Variable, t: Node) -> bool:
+            if (v.tag == NumericVariable.tag) != (t.tag in _NUMERIC_TAGS):
+                return False
+            # A quantified variable cannot escape its Forall
+            if t.loose or occurs(v, t):
+                return False
+            value[v] = t
+            return True
+
+        stack = [(a, b)]
+        while stack:
+            s, t = stack.pop()
+            s, t = resolve(s), resolve(t)
+            if s is t or s == t:
+                continue
+            s_free = s.tag in _VARIABLE_TAGS and s.name not in rigid
+            t_free = t.tag in _VARIABLE_TAGS and t.name not in rigid
+            if s_free and t_free:
+                if s.__class__ is not t.__class__:
+                    return None
+                parent[s] = t
+            elif s_free:
+                if not bind(s, t):
+                    return None
+            elif t_free:
+                if not bind(t, s):
+                    return None
+            elif s.tag == Successor.tag and t.tag == Successor.tag:
+                k = min(s.offset, t.offset)
+                stack.append((s.with_offset(s.offset - k), t.with_offset(t.offset - k)))
+            elif s.tag != t.tag or s.tag in _VARIABLE_TAGS or s._node_arity == 0:
+                # Distinct constructors, distinct rigid variables, or distinct leaves
+                return None
+            else:
+                for pair in reversed(tuple(zip(s._children(), t._children()))):
+                    stack.append(pair)
+
+        # Build the idempotent substitution: each variable maps to its class's
+        # term with every bound variable inside replaced in turn.
+        solved: Dict[Variable, Node] = {}
+
+        def solve(root: Variable) -> Node:
+            if root in solved:
+                return solved[root]
+            term = value.get(root, root)
+            inner = {}
+            for u in variables_of(term):
+                if u.name in rigid:
+                    continue
+                r = find(u)
+                if r is not u or r in value:
+                    inner[u.name] = solve(r)
+            solved[root] = result = substitute(term, inner)
+            return result
+
+        unifier = {}
+        for v in set(parent) | set(value):
+            term = solve(find(v))
+            if term is not v:
+                unifier[v.name] = term
+        if bindings:
+            # Compose: earlier bindings see the new ones
+            unifier = {**{name: substitute(term, unifier) for name, term in bindings.items()}, **unifier}
+        return unifier
@@ -0,0 +1,54 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agenda import Agenda
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from prover import AutoProver
+
+def test_agenda():
+    agenda = Agenda()
+    for goal, priority in [("c", 3), ("a", 1), ("b", 2), ("a2", 1)]:
+        agenda.push(goal, priority, depth=priority)
+    assert len(agenda) == 4 and "b" in agenda
+    # Lowest priority first, ties in push order
+    assert agenda.best(2) == ["a", "a2"]
+    assert agenda.pop() == ("a", 1)
+    # A better priority replaces the queued one, a worse one is ignored
+    agenda.push("c", 0, depth=5)
+    agenda.push("b", 9)
+    assert agenda.pop() == ("c", 5)
+    # Discarded goals are skipped lazily
+    agenda.discard("a2")
+    agenda.discard("missing")
+    assert "a2" not in agenda
+    assert agenda.pop() == ("b", 2)
+    assert agenda.pop() is None and len(agenda) == 0
+    # Dead entries do not pile up
+    for i in range(100):
+        agenda.push(i, i)
+        agenda.discard(i)
+    assert len(agenda._heap) <= 1
+    print("test_agenda passed")
+
+def test_best_first_prover():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    for text in ["x=y->y=x", "x=y->S(x)=S(y)", "0=S(0)"]:
+        storage.mark_proven(parser.parse(text), Provenance("Test Axiom"))
+    goal = parser.parse("S(S(S(0)))=S(S(S(S(0))))")
+    expanded = []
+    prover = AutoProver(storage, heuristic=lambda g: expanded.append(g) or 0)
+    assert prover.prove(str(goal), max_rounds=2, enable_forward=False)
+    # Subgoals are pushed as they are guessed, and prioritized as pushed
+    assert parser.parse("S(0)=S(S(0))") in expanded
+    # Once the goal is proven, its open subgoals are no longer needed
+    graph = prover.graph
+    assert all(graph.get(g).proven or not graph.needed(g) for g in graph.nodes)
+    print("test_best_first_prover passed")
+
+if __name__ == "__main__":
+    test_agenda()
+    test_best_first_prover()
@@ -0,0 +1,106 @@
+import sys
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from syntax import NumericVariable, Zero, Successor, Equals, Implies
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from prover import AutoProver
+from async_prover import AsyncProver
+
+def make_storage():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    for text in ["x=x", "x=y->y=x", "x=y->S(x)=S(y)"]:
+        storage.mark_proven(parser.parse(text), Provenance("Axiom"))
+    return storage, parser
+
+# Unprovable, and forward chaining never runs out of successors to derive
+ENDLESS = "S(0)=0"
+
+async def race(prover, storage):
+    endless = asyncio.create_task(prover.prove(ENDLESS, max_rounds=10**6))
+    await asyncio.sleep(0)
+    # Small goals finish while the endless search is still going
+    assert await asyncio.gather(prover.prove("S(S(0))=S(S(0))"), prover.prove("S(0)=S(0)")) == [True, True]
+    assert not endless.done()
+    endless.cancel()
+    try:
+        await endless
+        assert False, "the cancelled proof returned"
+    except asyncio.CancelledError:
+        pass
+    # Its watches went with it, and every prover is back in the pool
+    assert not storage._watches
+    idle = len(prover._idle)
+    assert idle >= 2
+    try:
+        await asyncio.wait_for(prover.prove(ENDLESS, max_rounds=10**6), 0.2)
+        assert False, "the endless proof returned"
+    except asyncio.TimeoutError:
+        pass
+    assert not storage._watches and len(prover._idle) == idle
+    # The prover's own timeout ends the search without an exception
+    assert await prover.prove(ENDLESS, max_rounds=10**6, timeout=0.1) is False
+
+def test_concurrent_goals():
+    storage, parser = make_storage()
+    prover = AsyncProver(storage)
+    asyncio.run(race(prover, storage))
+    assert storage.is_proven(parser.parse("S(S(0))=S(S(0))"))
+    print("test_concurrent_goals passed")
+
+def test_executor():
+    storage, parser = make_storage()
+    with ThreadPoolExecutor(2) as executor:
+        prover = AsyncProver(storage, executor)
+        asyncio.run(race(prover, storage))
+    print("test_executor passed")
+
+class LongRounds(AutoProver):
+    GIVEN_PER_ROUND = 10**6
+
+def long_round_storage():
+    # One forward round joins 150 implications x=y->S^k(x)=y with 150 equations, and derives more
+    storage = SentenceStorage()
+    x, y = NumericVariable.make("x"), NumericVariable.make("y")
+    for k in range(1, 151):
+        storage.mark_proven(Implies.make(Equals.make(x, y), Equals.make(Successor.make(x, k), y)), Provenance("Hypothesis"))
+        storage.mark_proven(Equals.make(Successor.make(Zero.make(), k), Zero.make()), Provenance("Hypothesis"))
+    return storage
+
+async def cancel_mid_round(storage, forward_strategy):
+    prover = AsyncProver(storage)
+    prover._idle.append(LongRounds(storage))
+    task = asyncio.create_task(prover.prove("0=S(0)", max_rounds=1, forward_strategy=forward_strategy))
+    began = time.perf_counter()
+    await asyncio.sleep(0.3)
+    # Slices are short, so the loop got back to this task on time
+    assert time.perf_counter() - began < 1.0
+    assert not task.done()
+    began = time.perf_counter()
+    task.cancel()
+    try:
+        await task
+        assert False, "the cancelled proof returned"
+    except asyncio.CancelledError:
+        pass
+    assert time.perf_counter() - began < 0.2
+    assert not storage._watches
+
+def test_cancel_long_round():
+    for forward_strategy in ["naive", "saturation"]:
+        storage = long_round_storage()
+        asyncio.run(cancel_mid_round(storage, forward_strategy))
+        # Stopped partway through the round
+        assert 300 < len(storage.proven) < 20000
+    print("test_cancel_long_round passed")
+
+if __name__ == "__main__":
+    test_concurrent_goals()
+    test_executor()
+    test_cancel_long_round()
@@ -0,0 +1,48 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from prover import AutoProver
+from cache import LRUCache, MISSING
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", None)
+    # None is a cached value, distinct from a miss
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # Evicts b, the least recently used
+    assert cache.get("b") is MISSING
+    assert len(cache) == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+    assert abs(stats["hit_rate"] - 2 / 3) < 1e-9
+    print("test_lru_cache passed")
+
+def test_prover_caches():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    for text in ["x=x", "x+0=x", "x=y->y=x"]:
+        storage.mark_proven(parser.parse(text), Provenance("Peano Axiom"))
+    prover = AutoProver(storage)
+    prover.match_cache = LRUCache(16)
+    # A false goal: x=x and x+0=x are candidates every round but never match
+    assert prover.prove("S(0)+0=0", max_rounds=3, timeout=5) is False
+    stats = prover.cache_stats()
+    assert set(stats) == {"match", "instance", "compiled"}
+    # Rounds re-match the goal against the same facts, and the bound holds
+    assert stats["match"]["hits"] > 0
+    assert stats["match"]["size"] <= 16 and stats["match"]["evictions"] > 0
+    # Cached results are the matcher's own
+    pattern, target = parser.parse("x+0=x"), parser.parse("S(0)+0=S(0)")
+    assert prover._match(pattern, target) == prover.matcher.match(pattern, target)
+    assert prover._match(pattern, target) is prover._match(pattern, target)
+    print("test_prover_caches passed")
+
+if __name__ == "__main__":
+    test_lru_cache()
+    test_prover_caches()
@@ -0,0 +1,75 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from goal_graph import GoalGraph
+from prover import AutoProver
+
+def test_tabling():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    goal, left, right, shared = (parser.parse(t) for t in ["C", "A->C", "B->C", "A"])
+    graph = GoalGraph(goal)
+    # Two implications need the same subgoal: one tabled node serves both
+    graph.add_alternative(graph.root, parser.parse("(A->B)->C"), [parser.parse("A->B")])
+    graph.add_alternative(graph.root, parser.parse("A->(B->C)"), [shared, parser.parse("B")])
+    graph.add_alternative(graph.get(parser.parse("A->B")), parser.parse("B->(A->B)"), [parser.parse("B")])
+    assert len(graph) == 4
+    assert graph.add_alternative(graph.root, parser.parse("A->(B->C)"), [shared, parser.parse("B")]) is None
+    assert graph.get(parser.parse("B")).depth == 1
+    # AND: one premise is not enough
+    assert graph.close(shared) == [] and not graph.root.proven
+    # Proving B completes both alternatives waiting on it, premises first
+    closed = graph.close(parser.parse("B"))
+    assert {str(a.goal.formula) for a in closed} == {"(A→B)", "C"}
+    assert graph.root.proven and not graph.needed(shared)
+    print("test_tabling passed")
+
+def test_failure_memo():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    goal, a, b = (parser.parse(t) for t in ["C", "A", "B"])
+    graph = GoalGraph(goal)
+    graph.add_alternative(graph.root, parser.parse("A->C"), [a])
+    graph.add_alternative(graph.root, parser.parse("B->C"), [b])
+    # A cycle: A needs C back
+    graph.add_alternative(graph.get(a), parser.parse("C->A"), [goal])
+    graph.expanded(goal, 2)
+    # Expanded without a direct proof: it fails with no steps left
+    assert graph.is_failed(goal, 0) and not graph.is_failed(goal, 1)
+    graph.expanded(b, 0)
+    assert graph.is_failed(b, 0) and not graph.is_failed(b, 1)
+    # A only needs C back, which fails with no steps, so A fails with one
+    graph.expanded(a, 1)
+    assert graph.is_failed(a, 1) and not graph.is_failed(a, 2)
+    # Every alternative of C now fails, but only within the budgets tried
+    assert graph.is_failed(goal, 1) and not graph.is_failed(goal, 2)
+    # Deeper failures of B propagate, up to the budget C itself was tried with
+    graph.expanded(b, 3)
+    assert graph.get(b).failed_budget == 3 and graph.root.failed_budget == 2
+    print("test_failure_memo passed")
+
+def test_iterative_deepening():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    for text in ["x=y->y=x", "x=y->S(x)=S(y)"]:
+        storage.mark_proven(parser.parse(text), Provenance("Test Axiom"))
+    prover = AutoProver(storage)
+    # Unprovable: each round only re-expands what failed within a smaller depth
+    assert prover.prove("0=S(0)", max_rounds=4, enable_forward=False) is False
+    root = prover.graph.root
+    assert root.failed_budget == prover.INITIAL_DEPTH + 3
+    # Curried axioms give AND nodes with both premises as subgoals
+    storage.mark_proven(parser.parse("x=y->(y=z->x=z)"), Provenance("Test Axiom"))
+    storage.mark_proven(parser.parse("S(0)=0"), Provenance("Test Axiom"))
+    assert prover.prove("S(0)=S(S(0))", max_rounds=3, enable_forward=False)
+    assert any(len(alt.premises) == 2 for node in prover.graph.nodes.values() for alt in node.alternatives)
+    print("test_iterative_deepening passed")
+
+if __name__ == "__main__":
+    test_tabling()
+    test_failure_memo()
+    test_iterative_deepening()
@@ -0,0 +1,145 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from syntax import Zero, Successor, Equals, Implies, Add
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from matcher import Matcher
+from unifier import Unifier
+from indexing import DiscriminationTree, FeatureIndex, FEATURE_SYMBOLS
+
+def test_discrimination_tree():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    facts = [parser.parse(text) for text in [
+        "x=x", "x+0=x", "x+S(y)=S(x+y)", "S(S(x))=y", "P", "P->(Q->P)",
+        "~0=S(x)", "!x(x*0=0)", "0=0", "2+x=1",
+    ]]
+    tree = DiscriminationTree()
+    for fact in facts:
+        tree.insert(fact, fact)
+
+    def candidates(text):
+        return [str(f) for f in tree.candidates(parser.parse(text))]
+
+    # Variables are wildcards of their sort; P matches any sentence
+    assert candidates("0=0") == ["x=x", "P", "0=0"]
+    assert candidates("S(0)+0=S(0)") == ["x=x", "(x+0)=x", "P"]
+    # S(S(x)) is reachable from any numeral of at least 2, never from 1
+    assert candidates("3=0") == ["x=x", "S(S(x))=y", "P"]
+    assert candidates("1=0") == ["x=x", "P"]
+    # A variable in the goal is only reached by pattern variables
+    assert candidates("2+y=1") == ["x=x", "P", "(S(S(0))+x)=S(0)"]
+    # Foralls are indexed through their de Bruijn body, so names do not matter
+    assert candidates("!y(y*0=0)") == ["P", "∀x((x*0)=0)"]
+    assert candidates("P->(P->P)") == ["P", "(P→(Q→P))"]
+    # A flexible goal variable may stand for any pattern subterm, as in unification
+    assert [str(f) for f in tree.candidates(parser.parse("R->Q"), frozenset(["Q"]))] == ["P", "(P→(Q→P))"]
+    assert [str(f) for f in tree.candidates(parser.parse("z+0=z"), frozenset(["z"]))] == [
+        "x=x", "(x+0)=x", "P", "(S(S(0))+x)=S(0)"
+    ]
+    print("test_discrimination_tree passed")
+
+def test_candidates_cover_matches():
+    # Every fact the matcher accepts must be a candidate, even past max_depth
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    texts = [
+        "x=x", "x+y=y+x", "(x+y)+z=x+(y+z)", "x*S(y)=x*y+x", "S(x)=S(y)->x=y",
+        "((x+0)+0)+0=x", "(((x*x)*x)*x)*x=y", "!x(!y(x+y=y+x))", "A->B", "~A", "0=S(0)",
+    ]
+    facts = [parser.parse(t) for t in texts]
+    goals = [parser.parse(t) for t in texts + [
+        "S(0)+1=1+S(0)", "((2+0)+0)+0=2", "(((0*0)*0)*0)*0=0", "!a(!b(a+b=b+a))",
+        "(1+2)+3=1+(2+3)", "S(0)=S(1)->0=1", "~0=0", "0=S(0)", "0=0->0=0",
+    ]]
+    tree = DiscriminationTree(max_depth=4)
+    for fact in facts:
+        tree.insert(fact, fact)
+    matcher = Matcher()
+    for goal in goals:
+        found = tree.candidates(goal)
+        expected = [f for f in facts if matcher.match(f, goal) is not None]
+        assert all(f in found for f in expected), f"{goal}: missing {[str(f) for f in expected if f not in found]}"
+    print("test_candidates_cover_matches passed")
+
+def test_candidates_cover_unifiers():
+    # With flexible goal variables, every fact the unifier accepts must be a candidate,
+    # including Successor runs longer than the goal's: S(y) unifies with S(S(S(x)))
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    facts = [parser.parse(t) for t in [
+        "S(S(S(x)))=0", "S(x)=S(S(0))", "0=S(S(x))", "S(S(0))=x+0", "x=x", "S(x)=0", "S(S(x+0))=x",
+    ]]
+    goals = ["S(y)=0", "S(S(y))=S(z)", "y=S(S(S(0)))", "S(0)=y", "S(y)=S(y)", "0=S(y)", "S(y+z)=z", "S(0)=0"]
+    tree = DiscriminationTree()
+    for fact in facts:
+        tree.insert(fact, fact)
+    unifier = Unifier()
+    for text in goals:
+        goal = parser.parse(text)
+        for flexible in [frozenset(["y", "z"]), frozenset(["y"]), frozenset()]:
+            rigid = frozenset(["y", "z"]) - flexible
+            found = tree.candidates(goal, flexible)
+            expected = [f for f in facts if unifier.unify(f, goal, rigid) is not None]
+            assert all(f in found for f in expected), \
+                f"{goal} {set(flexible)}: missing {[str(f) for f in expected if f not in found]}"
+    assert storage.unifiable_facts(parser.parse("S(y)=0"), frozenset(["y"])) == []
+    storage.mark_proven(facts[0], Provenance("Axiom"))
+    assert storage.unifiable_facts(parser.parse("S(y)=0"), frozenset(["y"])) == [facts[0]]
+    print("test_candidates_cover_unifiers passed")
+
+def test_storage_retrieval():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    for text in ["x+0=x", "x=x", "x=y->y=x", "A->(B->A)", "0=0"]:
+        storage.mark_proven(parser.parse(text), Provenance("Test Axiom"))
+    goal = parser.parse("S(0)+0=S(0)")
+    assert [str(f) for f in storage.generalizations(goal)] == ["(x+0)=x", "x=x"]
+    # Indexes stay current as facts are added
+    storage.mark_proven(parser.parse("S(x)+0=S(x)"), Provenance("Test Axiom"))
+    assert len(storage.generalizations(goal)) == 3
+    # Nested consequents count too: A in A→(B→A) concludes anything
+    assert [str(i) for i in storage.implications_concluding(parser.parse("0=S(0)"))] == ["(x=y→y=x)", "(A→(B→A))"]
+    assert [str(i) for i in storage.implications_concluding(parser.parse("P->P"))] == ["(A→(B→A))"]
+    print("test_storage_retrieval passed")
+
+def test_feature_index():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    index = FeatureIndex()
+    # Columns follow FEATURE_SYMBOLS, Successor counts its steps, and depth comes last
+    vector = dict(zip(FEATURE_SYMBOLS, index.features(parser.parse("S(S(x))+0=2"))))
+    assert vector[Successor] == 4 and vector[Add] == 1 and vector[Zero] == 2 and vector[Equals] == 1
+    assert vector[Implies] == 0
+
+    texts = [
+        "0=0", "S(0)+0=S(0)", "1+2=2+1", "x+0=x", "~0=S(0)", "0=0->0=0",
+        "!x(x*0=0)", "(0*0)*0=0", "S(x)=S(y)->x=y", "3=3", "P",
+    ]
+    facts = [parser.parse(t) for t in texts]
+    for fact in facts:
+        index.add(fact)
+    matcher = Matcher()
+    for pattern in [parser.parse(t) for t in ["x=x", "x+0=x", "x+y=y+x", "S(x)=S(x)", "A->A", "~A", "!x(x*0=0)", "x*0=0", "P"]]:
+        found = index.instances(pattern)
+        expected = [f for f in facts if matcher.match(pattern, f) is not None]
+        assert all(f in found for f in expected), f"{pattern}: missing {[str(f) for f in expected if f not in found]}"
+    # The filter is not vacuous: patterns with more structure than a fact skip it
+    assert [str(f) for f in index.instances(parser.parse("x+0=x"))] == [
+        "(S(0)+0)=S(0)", "(S(0)+S(S(0)))=(S(S(0))+S(0))", "(x+0)=x"
+    ]
+    assert index.dominates(parser.parse("0=0"), parser.parse("x=x"))
+    assert not index.dominates(parser.parse("0=0"), parser.parse("S(x)=x"))
+    # limit restricts the scan to the first rows
+    assert index.instances(parser.parse("x=x"), limit=2) == facts[:2]
+    print("test_feature_index passed")
+
+if __name__ == "__main__":
+    test_discrimination_tree()
+    test_candidates_cover_matches()
+    test_candidates_cover_unifiers()
+    test_storage_retrieval()
+    test_feature_index()
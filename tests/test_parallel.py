@@ -0,0 +1,79 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from parallel import ParallelForwardChainer
+from prover import AutoProver
+
+def make_storage(texts):
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    for text in texts:
+        storage.mark_proven(parser.parse(text), Provenance("Test Axiom"))
+    return storage, parser
+
+def test_parallel_matches():
+    storage, parser = make_storage(["x=x", "x=y->y=x", "0=S(0)", "S(0)=0", "x+0=x->x=x+0", "A->(B->A)", "0+0=0"])
+    prover = AutoProver(storage)
+    stop = len(storage.proven)
+    for start in [0, 3]:
+        # The serial semi-naive join, less matches whose consequent is already proven
+        serial = set()
+        for imp, fact in prover._forward_pairs(start, stop):
+            bindings = prover._match(imp.left, fact)
+            if bindings is not None and not storage.is_proven(prover._instantiate(imp.right, bindings)):
+                serial.add((imp, fact))
+        for workers in [1, 2]:
+            chainer = ParallelForwardChainer(storage, workers)
+            try:
+                found = list(chainer.matches(start, stop))
+            finally:
+                chainer.close()
+            # Bindings come back interned in this storage
+            assert all(prover._instantiate(imp.left, bindings) is fact for imp, fact, bindings in found)
+            # Chunks drop consequents they repeat, so each consequent is produced at least once
+            consequents = {prover._instantiate(imp.right, bindings) for imp, fact, bindings in found}
+            assert {(imp, fact) for imp, fact, _ in found} <= serial
+            assert consequents == {prover._instantiate(imp.right, prover._match(imp.left, fact)) for imp, fact in serial}
+    print("test_parallel_matches passed")
+
+def test_incremental_rounds():
+    # The snapshot is written once; later rounds only ship their new facts
+    storage, parser = make_storage(["x=y->y=x", "0=S(0)"])
+    prover = AutoProver(storage)
+    chainer = ParallelForwardChainer(storage, 2)
+    try:
+        start = 0
+        for texts in [[], ["S(0)=S(S(0))", "x+0=x->x=x+0"], ["0+0=0", "!x(x=x)"]]:
+            for text in texts:
+                storage.mark_proven(parser.parse(text), Provenance("Test Axiom"))
+            stop = len(storage.proven)
+            found = {(imp, fact) for imp, fact, _ in chainer.matches(start, stop)}
+            serial = {(imp, fact) for imp, fact in prover._forward_pairs(start, stop)
+                      if prover._match(imp.left, fact) is not None}
+            assert found == serial
+            start = stop
+        assert sorted(os.listdir(chainer._directory)) == ["delta.pickle", "facts.snap"]
+    finally:
+        chainer.close()
+    print("test_incremental_rounds passed")
+
+def test_parallel_strategy():
+    storage, parser = make_storage(["0=S(0)"])
+    storage.mark_proven(parser.parse("x=y->S(x)=S(y)"), Provenance("Hypothesis"))
+    prover = AutoProver(storage)
+    prover.PARALLEL_WORKERS = 2
+    try:
+        assert prover.prove("S(S(S(0)))=S(S(S(S(0))))", max_rounds=5, forward_strategy="parallel")
+    finally:
+        prover.parallel.close()
+    assert storage.get_provenance(parser.parse("S(S(S(0)))=S(S(S(S(0))))")).method == "Modus Ponens"
+    print("test_parallel_strategy passed")
+
+if __name__ == "__main__":
+    test_parallel_matches()
+    test_incremental_rounds()
+    test_parallel_strategy()
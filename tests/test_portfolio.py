@@ -0,0 +1,55 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from portfolio import Portfolio, Strategy, proof_cone
+
+def make_storage(texts, method="Axiom"):
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    for text in texts:
+        storage.mark_proven(parser.parse(text), Provenance(method))
+    return storage, parser
+
+def test_proof_cone():
+    storage, parser = make_storage(["A", "A->B", "B->C", "A->D"])
+    a, b, c, d = (parser.parse(x) for x in "ABCD")
+    storage.mark_proven(b, Provenance("Modus Ponens", [a, parser.parse("A->B")]))
+    storage.mark_proven(d, Provenance("Modus Ponens", [a, parser.parse("A->D")]))
+    storage.mark_proven(c, Provenance("Modus Ponens", [b, parser.parse("B->C")]))
+    known = set(storage.facts_since(0, 4))
+    # D is proven but not on the way to C; B comes before what depends on it
+    assert [node for node, _ in proof_cone(storage, c, known)] == [b, c]
+    assert proof_cone(storage, a, known) == []
+    print("test_proof_cone passed")
+
+def test_portfolio():
+    storage, parser = make_storage(["A", "A->B", "B->C", "A->D", "D->E"])
+    before = len(storage.proven)
+    # A strategy that expands nothing cannot win
+    idle = Strategy("idle", enable_forward=False, overrides={"EXPANSIONS_PER_ROUND": 0})
+    portfolio = Portfolio(storage, [idle, Strategy("forward", seed=1)])
+    assert portfolio.prove("C", max_rounds=5, timeout=5.0)
+    assert portfolio.winner == "forward"
+    # The proof of C is merged, dependencies first and interned here; E is not on it
+    assert storage.is_proven(parser.parse("C"))
+    merged = storage.facts_since(before)
+    assert len(merged) == portfolio.merged > 0 and merged[-1] is parser.parse("C")
+    for k, fact in enumerate(merged):
+        for dependency in storage.get_provenance(fact).dependencies:
+            assert dependency is storage.intern(dependency)
+            assert dependency in storage.facts_since(0, before) or dependency in merged[:k]
+    assert not storage.is_proven(parser.parse("E"))
+    losing = Portfolio(storage, [idle])
+    assert not losing.prove("E", max_rounds=2, timeout=2.0)
+    assert losing.winner is None and losing.merged == 0
+    assert portfolio.prove("C") and portfolio.merged == 0
+    assert portfolio.winner is not None
+    print("test_portfolio passed")
+
+if __name__ == "__main__":
+    test_proof_cone()
+    test_portfolio()
@@ -0,0 +1,111 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from syntax import Implies
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from prover import AutoProver
+
+def test_semi_naive_pairs():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    prover = AutoProver(storage)
+    batches = [
+        ["x=x", "x=y->y=x", "0=S(0)"],
+        ["S(0)=0", "x+0=x->x=x+0", "A->(B->A)"],
+        ["0+0=0", "~0=0"],
+    ]
+    seen = []
+    mark = 0
+    for batch in batches:
+        for text in batch:
+            storage.mark_proven(parser.parse(text), Provenance("Test Axiom"))
+        stop = len(storage.proven)
+        seen.extend(prover._forward_pairs(mark, stop))
+        mark = stop
+    # The deltas cover the naive join over every fact exactly once
+    naive = [(imp, fact) for imp in storage.facts_by_head(Implies) for fact in storage.instances_of(imp.left)]
+    assert len(seen) == len(set(seen))
+    assert set(seen) == set(naive)
+    # Nothing new, nothing to join
+    assert list(prover._forward_pairs(mark, mark)) == []
+    print("test_semi_naive_pairs passed")
+
+def test_forward_rounds():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    for text in ["x=y->y=x", "S(0)=0"]:
+        storage.mark_proven(parser.parse(text), Provenance("Test Axiom"))
+    prover = AutoProver(storage)
+    # Symmetry fires in the first round, and the rounds after it only see the delta
+    assert prover.prove("0=0", max_rounds=4, enable_forward=True) is False
+    assert storage.is_proven(parser.parse("0=S(0)"))
+    # Saturated: the last round joined every fact and derived nothing
+    assert prover._forward_mark == len(storage.proven)
+    assert list(prover._forward_pairs(prover._forward_mark, len(storage.proven))) == []
+    print("test_forward_rounds passed")
+
+def test_watched_goals():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    for text in ["x=y->S(x)=S(y)", "x=y->y=x"]:
+        storage.mark_proven(parser.parse(text), Provenance("Test Axiom"))
+    subgoal = parser.parse("0=S(0)")
+    def heuristic(goal):
+        # Another prover proves the subgoal as it is guessed
+        if goal is subgoal:
+            storage.mark_proven(subgoal, Provenance("Test Axiom"))
+        return 0
+    prover = AutoProver(storage, heuristic=heuristic)
+    # Its watch closes the goal in the same round, before the subgoal is popped
+    assert prover.prove("S(0)=S(S(0))", max_rounds=1, enable_forward=False)
+    assert storage.get_provenance(parser.parse("S(0)=S(S(0))")).method == "Modus Ponens"
+    # The finished proof stops watching
+    assert not storage._watches
+    print("test_watched_goals passed")
+
+def test_bidirectional():
+    for bidirectional in [False, True]:
+        storage = SentenceStorage()
+        parser = Parser(storage)
+        storage.mark_proven(parser.parse("x=y->S(x)=S(y)"), Provenance("Test Axiom"))
+        subgoal = parser.parse("0=S(0)+0")
+        def heuristic(goal):
+            # Forward search derives a general fact just as backward search guesses the subgoal
+            if goal is subgoal:
+                storage.mark_proven(parser.parse("x=S(0)+x"), Provenance("Test Axiom"))
+            return 0
+        prover = AutoProver(storage, heuristic=heuristic)
+        # The subgoal is not expanded this round, so backward search alone misses the fact
+        prover.EXPANSIONS_PER_ROUND = 1
+        proven = prover.prove("S(0)=S((S(0)+0))", max_rounds=1, enable_forward=False, bidirectional=bidirectional)
+        # Only the frontier index sees that the fact generalizes the subgoal
+        assert proven == bidirectional
+        assert prover.meetings == (1 if bidirectional else 0)
+    assert storage.get_provenance(subgoal).dependencies == (parser.parse("x=S(0)+x"),)
+    assert not storage._subscribers
+    print("test_bidirectional passed")
+
+def test_meet_deeper_numeral():
+    # Forward chaining derives S(z)=0, which generalizes the subgoal S(S(0))=0:
+    # the frontier lookup has to reach a goal Successor run longer than the fact's
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    storage.mark_proven(parser.parse("S(S(0))=0->Q"), Provenance("Axiom"))
+    storage.mark_proven(parser.parse("z+0=0"), Provenance("Hypothesis"))
+    storage.mark_proven(parser.parse("x+0=y->S(x)=y"), Provenance("Hypothesis"))
+    prover = AutoProver(storage)
+    prover.EXPANSIONS_PER_ROUND = 1
+    assert prover.prove("Q", max_rounds=1, bidirectional=True)
+    assert prover.meetings == 1
+    assert storage.get_provenance(parser.parse("S(S(0))=0")).dependencies == (parser.parse("S(z)=0"),)
+    print("test_meet_deeper_numeral passed")
+
+if __name__ == "__main__":
+    test_semi_naive_pairs()
+    test_forward_rounds()
+    test_watched_goals()
+    test_bidirectional()
+    test_meet_deeper_numeral()
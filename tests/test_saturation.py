@@ -0,0 +1,60 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from saturation import GivenClauseSaturation
+from prover import AutoProver
+
+def make_storage(texts):
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    for text in texts:
+        storage.mark_proven(parser.parse(text), Provenance("Test Axiom"))
+    return storage, parser
+
+def test_given_clause_loop():
+    storage, parser = make_storage(["x=y->y=x", "S(0)=0", "x=x", "0=0"])
+    engine = GivenClauseSaturation(storage)
+    goal = parser.parse("0=S(0)")
+    assert engine.run(goal)
+    assert storage.get_provenance(goal).method == "Modus Ponens"
+    stats = engine.stats()
+    # 0=0 is an instance of x=x, so forward subsumption never queues it
+    assert stats["subsumed"] >= 1 and parser.parse("0=0") not in engine.active
+    assert stats["retained"] == 1 and stats["generated"] >= stats["retained"]
+    # Saturates: symmetry only leads back to known facts
+    assert not engine.run()
+    assert engine.stats()["passive"] == 0
+    assert engine.stats()["duplicates"] >= 1
+    print("test_given_clause_loop passed")
+
+def test_selection_order():
+    storage, parser = make_storage(["(0+0)+0=0", "1=1", "0=1", "(1+1)+1=1"])
+    engine = GivenClauseSaturation(storage, pick_given_ratio=1)
+    engine.sync()
+    # Lightest first, then the oldest not yet selected, alternately
+    order = []
+    for _ in range(4):
+        given = engine._select()
+        engine._activate(given)
+        order.append(str(given))
+    assert order == ["0=S(0)", "((0+0)+0)=0", "S(0)=S(0)", "((S(0)+S(0))+S(0))=S(0)"], order
+    assert engine._select() is None
+    print("test_selection_order passed")
+
+def test_saturation_strategy():
+    # Backward guesses only instantiate axioms, so the loop does the work
+    storage, parser = make_storage(["0=S(0)"])
+    storage.mark_proven(parser.parse("x=y->S(x)=S(y)"), Provenance("Hypothesis"))
+    prover = AutoProver(storage)
+    assert prover.prove("S(S(S(0)))=S(S(S(S(0))))", max_rounds=5, forward_strategy="saturation")
+    assert prover.saturation.stats()["retained"] == 3
+    print("test_saturation_strategy passed")
+
+if __name__ == "__main__":
+    test_given_clause_loop()
+    test_selection_order()
+    test_saturation_strategy()
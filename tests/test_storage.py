@@ -0,0 +1,243 @@
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from syntax import (
+    NumericVariable, LogicVariable, Zero, Successor,
+    Equals, Not, Implies, Add, Forall
+)
+from storage import (
+    SentenceStorage, SqliteSentenceStorage, SnapshotStorage, Provenance, Bindings,
+    write_snapshot, head_key
+)
+
+def test_provenance_records():
+    storage = SentenceStorage()
+    P = LogicVariable.make("P")
+    x = NumericVariable.make("x")
+    
+    # Records without dependencies or bindings are shared
+    axiom = Provenance("Peano Axiom")
+    assert Provenance("Peano Axiom") is axiom
+    instance = Provenance.instance_of(axiom, [P])
+    assert instance.method == "Instance of Peano Axiom" and instance.dependencies == (P,)
+    assert Provenance.instance_of(axiom, [P]).code == instance.code
+    
+    # Bindings keep nodes but render like the dict of strings they replace
+    substitution = Provenance("Substitution", dependencies=[P], metadata={"bindings": Bindings({"x": Zero.make()}), "var": x})
+    assert str(substitution) == "Substitution(P, bindings={'x': '0'}, var=x)", f"Got {substitution}"
+    assert substitution.metadata["var"] is x
+    
+    # Records survive a save/load round trip
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.mark_proven(P, substitution)
+        storage.save(os.path.join(tmp, "kb.db"))
+        loaded = SentenceStorage.load(os.path.join(tmp, "kb.db"))
+        assert str(loaded.get_provenance(LogicVariable.make("P"))) == str(substitution)
+    print("test_provenance_records passed")
+
+def test_proven_indexes():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SentenceStorage()
+        P = LogicVariable.make("P")
+        Q = LogicVariable.make("Q")
+        x = NumericVariable.make("x")
+        axiom = Provenance("Logic Axiom")
+        facts = [
+            Implies.make(P, Q), Implies.make(Q, Q), Implies.make(P, Not.make(P)),
+            Forall.make(x, Equals.make(x, x)), Equals.make(Zero.make(), Zero.make()),
+        ]
+        for fact in facts:
+            storage.mark_proven(fact, axiom)
+        write_snapshot(os.path.join(tmp, "kb.snap"), storage)
+        sqlite = SqliteSentenceStorage(os.path.join(tmp, "kb.sqlite"))
+        sqlite.update(storage)
+        snapshot = SnapshotStorage(os.path.join(tmp, "kb.snap"))
+        
+        # Every backend answers from its indexes, in proof order
+        for store in (storage, sqlite, snapshot):
+            assert store.implications_by_consequent(Q) == facts[:2]
+            assert store.implications_by_antecedent(P) == [facts[0], facts[2]]
+            assert store.implications_by_antecedent(Q) == [facts[1]]
+            assert store.facts_by_head(Equals) == [facts[4]]
+            assert store.facts_by_head(head_key(facts[3])) == [facts[3]]
+            assert store.facts_by_head((Forall, 2, Equals)) == []
+        
+        # Facts added to an open snapshot are indexed after the stored ones
+        added = Implies.make(Not.make(P), Q)
+        snapshot.mark_proven(added, axiom)
+        assert snapshot.implications_by_consequent(Q) == facts[:2] + [added]
+        assert snapshot.facts_by_head(Implies) == facts[:3] + [added]
+        sqlite.connection.close()
+        snapshot.close()
+    print("test_proven_indexes passed")
+
+def test_sqlite_storage():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Migrate a pickled knowledge base into SQLite
+        legacy = SentenceStorage()
+        x = NumericVariable.make("x")
+        P = LogicVariable.make("P")
+        axiom = Forall.make(x, Equals.make(Add.make(x, Zero.make()), x))
+        legacy.mark_proven(axiom, Provenance("Peano Axiom"))
+        pickled = os.path.join(tmp, "kb.db")
+        legacy.save(pickled)
+        
+        path = os.path.join(tmp, "kb.sqlite")
+        store = SqliteSentenceStorage(path)
+        store.update(SentenceStorage.load(pickled))
+        instance = Equals.make(Add.make(Successor.make(Zero.make()), Zero.make()), Successor.make(Zero.make()))
+        store.mark_proven(instance, Provenance("Substitution", dependencies=[axiom], metadata={"x": Successor.make(Zero.make())}))
+        store.connection.close()
+        
+        # load() recognizes the database; facts are read back on demand
+        store = SentenceStorage.load(path)
+        assert isinstance(store, SqliteSentenceStorage)
+        assert len(store.proven) == 2
+        assert [str(n) for n in store.proven] == ["∀x((x+0)=x)", "(S(0)+0)=S(0)"]
+        y = NumericVariable.make("y")
+        assert store.is_proven(Forall.make(y, Equals.make(Add.make(y, Zero.make()), y)))
+        assert not store.is_proven(Equals.make(x, x))
+        provenance = store.get_provenance(Equals.make(Add.make(Successor.make(Zero.make()), Zero.make()), Successor.make(Zero.make())))
+        assert provenance.dependencies == (axiom,)
+        assert provenance.metadata["x"] is Successor.make(Zero.make())
+        store.connection.close()
+    print("test_sqlite_storage passed")
+
+def test_snapshot_storage():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SentenceStorage()
+        x = NumericVariable.make("x")
+        axiom = Forall.make(x, Equals.make(Add.make(x, Zero.make()), x))
+        one = Successor.make(Zero.make())
+        instance = Equals.make(Add.make(one, Zero.make()), one)
+        storage.mark_proven(axiom, Provenance("Peano Axiom"))
+        storage.mark_proven(instance, Provenance("Substitution", dependencies=[axiom], metadata={"x": one}))
+        path = os.path.join(tmp, "kb.snap")
+        write_snapshot(path, storage)
+        
+        # Opening maps the file; only the touched ids become nodes
+        snap = SentenceStorage.load(path)
+        assert isinstance(snap, SnapshotStorage)
+        assert len(snap.nodes) == 0
+        y = NumericVariable.make("y")
+        assert snap.is_proven(Forall.make(y, Equals.make(Add.make(y, Zero.make()), y)))
+        assert not snap.is_proven(Equals.make(y, y))
+        provenance = snap.get_provenance(Equals.make(Add.make(Successor.make(Zero.make()), Zero.make()), Successor.make(Zero.make())))
+        assert str(provenance) == "Substitution(∀y((y+0)=y), x=S(0))", f"Got {provenance}"
+        
+        # New facts are kept in memory and appended on save
+        snap.mark_proven(Equals.make(y, y), Provenance("Peano Axiom"))
+        snap.save(path)
+        assert snap.counts['proven'] == 3 and snap.is_proven(Equals.make(y, y))
+        assert [str(n) for n in snap.proven][2] == "y=y"
+        snap.close()
+    print("test_snapshot_storage passed")
+
+def test_transient_nodes():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SentenceStorage()
+        P, Q = LogicVariable.make("P"), LogicVariable.make("Q")
+        storage.mark_proven(Implies.make(P, P), Provenance("Test Axiom"))
+        # Nodes nothing refers to any more leave the table
+        transient = Implies.make(Q, Not.make(Q))
+        assert transient in storage.nodes and len(storage.nodes) == 5
+        del transient
+        assert len(storage.nodes) == 3  # P, Q and P→P
+        # A fact is saved with what its provenance refers to, and nothing else
+        storage.mark_proven(Implies.make(P, Implies.make(P, P)), Provenance(
+            "Test Rule", dependencies=[Implies.make(P, P)], metadata={"A": Not.make(P)}))
+        Implies.make(Q, Q)
+        path = os.path.join(tmp, "kb.db")
+        storage.save(path)
+        loaded = SentenceStorage.load(path)
+        assert sorted(str(n) for n in loaded.nodes) == ["(P→(P→P))", "(P→P)", "P", "¬P"]
+    print("test_transient_nodes passed")
+
+def test_proven_events():
+    for storage in [SentenceStorage(), SqliteSentenceStorage()]:
+        P, Q, R = (LogicVariable.make(name) for name in "PQR")
+        storage.mark_proven(P, Provenance("Test Axiom"))
+        seen, woken = [], []
+        unsubscribe = storage.subscribe(seen.append)
+        # Already proven: the watch fires at once
+        storage.watch(P, woken.append)
+        # A watch fires once, however often it was registered
+        storage.watch(Q, woken.append)
+        storage.watch(Q, woken.append)
+        # Listeners may prove more; those events follow in order, not nested
+        storage.watch(Q, lambda q: storage.mark_proven(Implies.make(Q, R), Provenance("Test Axiom")))
+        storage.watch(R, woken.append)
+        storage.unwatch(R, woken.append)
+        storage.mark_proven(Q, Provenance("Test Axiom"))
+        storage.mark_proven(Q, Provenance("Test Axiom"))
+        assert woken == [P, Q]
+        assert seen == [Q, Implies.make(Q, R)]
+        unsubscribe()
+        storage.mark_proven(R, Provenance("Test Axiom"))
+        assert seen == [Q, Implies.make(Q, R)] and woken == [P, Q]
+    print("test_proven_events passed")
+
+def test_raising_listener():
+    storage = SentenceStorage()
+    P, Q = LogicVariable.make("P"), LogicVariable.make("Q")
+    seen, woken = [], []
+    def fail(fact):
+        if fact is P:
+            # Queues Q behind P before failing
+            storage.mark_proven(Q, Provenance("Test Axiom"))
+        raise RuntimeError(f"listener failed on {fact}")
+    storage.subscribe(fail)
+    storage.subscribe(seen.append)
+    storage.watch(Q, woken.append)
+    # Events queued behind the failure, and later listeners, are still delivered
+    try:
+        storage.mark_proven(P, Provenance("Test Axiom"))
+        assert False, "the listener's error was swallowed"
+    except RuntimeError as e:
+        assert str(e) == "listener failed on P"
+    assert seen == [P, Q] and woken == [Q]
+    assert storage._events is None and not storage._watches
+    print("test_raising_listener passed")
+
+def test_sqlite_rollback():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kb.sqlite")
+        store = SqliteSentenceStorage(path)
+        x = NumericVariable.make("x")
+        zero = Zero.make()
+        reflexivity = Equals.make(x, x)
+        def fail(fact):
+            if fact is reflexivity:
+                raise RuntimeError("listener failed")
+        store.subscribe(fail)
+        # The listener's error rolls the fact back, rows and in-memory state alike
+        try:
+            store.mark_proven(reflexivity, Provenance("Test Axiom"))
+            assert False, "the listener's error was swallowed"
+        except RuntimeError:
+            pass
+        assert not store.is_proven(reflexivity)
+        assert store.generalizations(Equals.make(zero, zero)) == []
+        # The rolled back row ids are reused without reviving the old nodes
+        store.mark_proven(Equals.make(zero, zero), Provenance("Test Axiom"))
+        assert store.is_proven(Equals.make(zero, zero)) and not store.is_proven(reflexivity)
+        store.connection.close()
+        
+        store = SentenceStorage.load(path)
+        assert [str(n) for n in store.proven] == ["0=0"]
+        assert not store.is_proven(reflexivity)
+        store.connection.close()
+    print("test_sqlite_rollback passed")
+
+if __name__ == "__main__":
+    test_provenance_records()
+    test_proven_indexes()
+    test_sqlite_storage()
+    test_sqlite_rollback()
+    test_snapshot_storage()
+    test_transient_nodes()
+    test_proven_events()
+    test_raising_listener()
@@ -5,8 +5,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from syntax import (
     NumericVariable, Zero, Successor, 
-    Equals, Not, Implies, Add, Multiply, Forall
+    Equals, Not, Implies, Add, Multiply, Forall, BoundVariable
 )
+from matcher import Matcher
 
 def test_free_variables():
     x = NumericVariable("x")
@@ -22,6 +23,24 @@ def test_free_variables():
     
     print("test_free_variables passed")
 
+def test_cached_metadata():
+    x = NumericVariable("x")
+    y = NumericVariable("y")
+    
+    # S(x) + 0 = y
+    expr = Equals(Add(Successor(x), Zero()), y)
+    assert expr.size == 6, f"Got {expr.size}"
+    assert expr.depth == 4, f"Got {expr.depth}"
+    assert not expr.is_ground
+    assert isinstance(expr.free_variables, frozenset)
+    
+    # forall x forall y (x=y) is closed
+    closed = Forall(x, Forall(y, Equals(x, y)))
+    assert closed.is_ground
+    assert Equals(Zero(), Successor(Zero())).is_ground
+    
+    print("test_cached_metadata passed")
+
 def test_substitution():
     x = NumericVariable("x")
     y = NumericVariable("y")
@@ -43,6 +62,58 @@ def test_substitution():
     
     print("test_substitution passed")
 
+def test_simultaneous_substitution():
+    x = NumericVariable("x")
+    y = NumericVariable("y")
+    z = Zero()
+    
+    # Bindings apply at once: swapping x and y is not x->y then y->x
+    swapped = Add(x, y).substitute_all({"x": y, "y": x})
+    assert str(swapped) == "(y+x)", f"Got {swapped}"
+    
+    # Untouched interned subtrees are returned as the same object
+    expr = Equals.make(Add.make(z, z), x)
+    subbed = expr.substitute_all({"x": Successor(z)})
+    assert subbed.left is expr.left
+    assert str(subbed) == "(0+0)=S(0)", f"Got {subbed}"
+    
+    # Capture avoidance: forall y (x=y) with x/y renames the bound y
+    f = Forall(y, Equals(x, y))
+    subbed_f = f.substitute_all({"x": y})
+    assert str(subbed_f) == "∀y1(y=y1)", f"Got {subbed_f}"
+    
+    print("test_simultaneous_substitution passed")
+
+def test_alpha_equivalence():
+    x = NumericVariable.make("x")
+    y = NumericVariable.make("y")
+    
+    # forall x (x=x) and forall y (y=y) are one node, printed with the first name
+    fx = Forall.make(x, Equals.make(x, x))
+    fy = Forall.make(y, Equals.make(y, y))
+    assert fx is fy
+    assert fx == Forall(y, Equals(y, y))
+    assert str(fy) == "∀x(x=x)", f"Got {fy}"
+    assert fx.body is Equals.make(BoundVariable.make(0), BoundVariable.make(0))
+    assert fx.sentence is Equals.make(x, x)
+    
+    # Nested binders: forall x forall y (x=y) vs forall y forall x (y=x)
+    nested = Forall.make(x, Forall.make(y, Equals.make(x, y)))
+    assert nested is Forall.make(y, Forall.make(x, Equals.make(y, x)))
+    assert nested is not Forall.make(x, Forall.make(y, Equals.make(y, x)))
+    
+    # The matcher compares bodies instead of binding the quantified variable
+    pattern = Forall.make(x, Equals.make(x, NumericVariable.make("z")))
+    bindings = Matcher().match(pattern, Forall.make(y, Equals.make(y, Zero.make())))
+    assert set(bindings) == {"z"} and bindings["z"] is Zero.make()
+    # ...and never binds a pattern variable to the target's quantified variable
+    assert Matcher().match(pattern, fy) is None
+    
+    print("test_alpha_equivalence passed")
+
 if __name__ == "__main__":
     test_free_variables()
+    test_cached_metadata()
     test_substitution()
+    test_simultaneous_substitution()
+    test_alpha_equivalence()
@@ -9,6 +9,9 @@ from syntax import (
     Equals, Not, Implies, Forall,
     Successor, Add, Multiply
 )
+from storage import SentenceStorage
+from parser import Parser
+from matcher import Matcher
 
 def test_user_example():
     # User example: ∀x1(¬∀x2(¬x1=x2))
@@ -41,9 +44,123 @@ def test_user_example():
     assert str(final_sentence) == expected, f"Expected {expected}, got {final_sentence}"
     print("Test Passed!")
 
+def test_hash_consing():
+    storage = SentenceStorage()
+    P = LogicVariable.make("P")
+    Q = LogicVariable.make("Q")
+    
+    # Same structure built twice is the same object
+    a = Implies.make(P, Not.make(Q))
+    b = Implies.make(LogicVariable.make("P"), Not.make(LogicVariable.make("Q")))
+    assert a is b
+    assert a == b and hash(a) == hash(b)
+    
+    # Plain constructors still compare structurally and intern to the canonical node
+    c = Implies(LogicVariable("P"), Not(LogicVariable("Q")))
+    assert c == a and hash(c) == hash(a)
+    assert storage.intern(c) is a
+    
+    # Interned nodes that differ are unequal
+    assert Implies.make(P, Q) != Implies.make(Q, P)
+    assert NumericVariable.make("P") != P
+    print("test_hash_consing passed")
+
+def test_deep_terms():
+    # Deeper than the recursion limit: every walk must be iterative
+    depth = sys.getrecursionlimit() * 5
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    
+    # A numeral is one Successor node however long, so the deep numeric term is a sum
+    deep = parser.parse("x" + "+0" * depth + "=x")
+    assert deep.depth > depth
+    plain = NumericVariable("x")
+    for _ in range(depth):
+        plain = Add(plain, Zero())
+    assert storage.intern(Equals(plain, NumericVariable("x"))) is deep
+    
+    ground = deep.substitute("x", Zero.make())
+    assert Matcher().match(deep, ground) == {"x": Zero.make()}
+    assert str(ground) == "(" * depth + "0" + "+0)" * depth + "=0"
+    
+    chain = parser.parse("->".join(["P"] * depth))
+    assert chain.depth == depth
+    print("test_deep_terms passed")
+
+def test_numerals():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    zero = Zero.make()
+    
+    # S(S(S(0))), nested makes and the literal 3 are one compact node
+    three = parser.parse("S(S(S(0)))=3")
+    assert three.left is three.right
+    assert three.left is Successor.make(Successor.make(Successor.make(zero)))
+    assert three.left.offset == 3 and three.left.base is zero
+    assert three.left.operand is parser.parse("2=0").left
+    assert str(three.left) == "S(S(S(0)))"
+    
+    # S(x) against 1000 binds x to 999 without walking the numeral
+    x = NumericVariable.make("x")
+    bindings = Matcher().match(Successor.make(x), parser.parse("1000=0").left)
+    assert bindings["x"] is Successor.make(zero, 999)
+    assert Matcher().match(Successor.make(x, 2), Successor.make(zero)) is None
+    
+    # Substitution re-normalizes: S(x)[x/S(0)] is S(S(0))
+    assert Successor.make(x).substitute("x", Successor.make(zero)) is Successor.make(zero, 2)
+    print("test_numerals passed")
+
+def test_nested_successor_arguments():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    x, y = NumericVariable.make("x"), NumericVariable.make("y")
+    zero = Zero.make()
+    # A nested S( whose argument goes on past its inner run is its own level
+    assert parser.parse("S(S(x)+y)=0").left is Successor.make(Add.make(Successor.make(x), y))
+    assert parser.parse("S(S(0)*x)=0").left is Successor.make(Multiply.make(Successor.make(zero), x))
+    assert parser.parse("S(S(S(0)+0))=0").left is Successor.make(Add.make(Successor.make(zero), zero), 2)
+    assert parser.parse("S(S(x))=0").left is Successor.make(x, 2)
+    print("test_nested_successor_arguments passed")
+
+def test_compiled_matcher():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    patterns = [parser.parse(t) for t in [
+        "x=x", "x+0=x", "x+y=y+x", "S(S(x))=y", "A->(B->A)", "~A", "!x(x*y=0)",
+        "0=0", "(x+y)*z=x*z+y*z", "A->A",
+    ]]
+    targets = [parser.parse(t) for t in [
+        "0=0", "3=3", "S(0)+0=S(0)", "1+2=2+1", "1+2=1+2", "5=0", "1=0", "P->(Q->P)",
+        "~0=0", "~P", "!y(y*0=0)", "!y(y*y=0)", "(1+2)*3=1*3+2*3", "P->P", "(P->Q)->(P->Q)",
+        "x+0=y", "!x(x+0=x)",
+    ]]
+    matcher = Matcher()
+    for pattern in patterns:
+        for target in targets:
+            interpreted = {}
+            if not matcher._match_into(pattern, target, interpreted):
+                interpreted = None
+            assert matcher.match(pattern, target) == interpreted, f"{pattern} against {target}"
+    # Compiled matchers are cached per pattern
+    assert matcher._compiled.get(patterns[0]) is matcher._compiled.get(parser.parse("x=x"))
+    # Variables keep their sorts, and a repeated variable must bind consistently
+    assert matcher.match(parser.parse("x=y"), parser.parse("P")) is None
+    assert matcher.match(parser.parse("A->A"), parser.parse("P->Q")) is None
+    # Patterns deeper than MAX_COMPILED_DEPTH fall back to the interpreter
+    deep = Zero.make()
+    for _ in range(Matcher.MAX_COMPILED_DEPTH + 10):
+        deep = Add.make(deep, NumericVariable.make("x"))
+    assert matcher.match(Equals.make(deep, deep), Equals.make(deep, deep)) == {"x": NumericVariable.make("x")}
+    print("test_compiled_matcher passed")
+
 if __name__ == "__main__":
     try:
         test_user_example()
+        test_hash_consing()
+        test_deep_terms()
+        test_numerals()
+        test_nested_successor_arguments()
+        test_compiled_matcher()
     except Exception as e:
         print(f"Test Failed: {e}")
         exit(1)
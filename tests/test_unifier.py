@@ -0,0 +1,67 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from syntax import NumericVariable
+from storage import SentenceStorage, Provenance
+from parser import Parser
+from unifier import Unifier, rename_apart
+from prover import AutoProver
+
+def test_unify():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    unifier = Unifier()
+
+    def unify(a, b, rigid=()):
+        bindings = unifier.unify(parser.parse(a), parser.parse(b), frozenset(rigid))
+        return None if bindings is None else {name: str(t) for name, t in bindings.items()}
+
+    # Both sides bind, and the result is idempotent
+    assert unify("(A->B)->(A->C)", "P->P") == {"P": "(A→B)", "C": "B"}
+    assert unify("A->B", "B->C") == {"A": "C", "B": "C"}
+    assert unify("x+S(y)=z", "0+3=S(w)") == {"x": "0", "y": "S(S(0))", "z": "S(w)"}
+    # Rigid variables are constants
+    assert unify("(A->B)->(A->C)", "P->P", ["P"]) is None
+    assert unify("A->(B->A)", "P->X", ["P"]) == {"A": "P", "X": "(B→P)"}
+    # Occurs check, sorts, and quantified variables
+    assert unify("x=y", "y=S(x)") is None
+    assert unify("A->A", "B->(B->B)") is None
+    assert unify("x=y", "A") == {"A": "x=y"}
+    assert unifier.unify(NumericVariable.make("x"), parser.parse("P")) is None
+    assert unify("!x(x=y)", "!z(z=z)") is None
+    assert unify("!x(x=y)", "!z(z=0)") == {"y": "0"}
+
+    # Earlier bindings are extended, not replaced
+    first = unifier.unify(parser.parse("A->B"), parser.parse("P->C"), frozenset(["P"]))
+    both = unifier.unify(parser.parse("C"), parser.parse("P->P"), frozenset(["P"]), first)
+    assert {name: str(t) for name, t in both.items()} == {"A": "P", "B": "(P→P)", "C": "(P→P)"}
+    print("test_unify passed")
+
+def test_rename_apart():
+    storage = SentenceStorage()
+    parser = Parser(storage)
+    l1 = parser.parse("A->(B->A)")
+    assert rename_apart(l1, {"P"}) is l1
+    renamed = rename_apart(l1, {"A", "A1"})
+    assert str(renamed) == "(A2→(B→A2))"
+    print("test_rename_apart passed")
+
+def test_backward_chaining():
+    # P->P needs L2 with a premise variable that only a second L1 instance fixes
+    # A goal variable that clashes with the axioms' variables changes nothing
+    for goal in ["P->P", "A->A"]:
+        storage = SentenceStorage()
+        parser = Parser(storage)
+        for text in ["A->(B->A)", "(A->(B->C))->((A->B)->(A->C))", "(~A->~B)->(B->A)"]:
+            storage.mark_proven(parser.parse(text), Provenance("Logic Axiom"))
+        prover = AutoProver(storage)
+        assert prover.prove(goal, max_rounds=2, enable_forward=False)
+        assert storage.get_provenance(parser.parse(goal)).method == "Modus Ponens"
+    print("test_backward_chaining passed")
+
+if __name__ == "__main__":
+    test_unify()
+    test_rename_apart()
+    test_backward_chaining()